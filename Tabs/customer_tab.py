@@ -1,9 +1,12 @@
 import customtkinter as ctk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import pandas as pd
 import os
 import json
 import datetime  
+from customer_store import get_cid_allocator, get_customer_repository
+from virtual_table import VirtualTable
+from search_index import LiveSearch, SearchIndex, record_keys
 
 
 class CustomerTab(ctk.CTkFrame):
@@ -24,6 +27,15 @@ class CustomerTab(ctk.CTkFrame):
         self.deleted_file = str(app_config.deleted_file)
         self.cluster_file = str(app_config.cluster_file)
 
+        # Shared in-memory customer master (same instance in every tab)
+        self.repo = get_customer_repository()
+        self.cid_allocator = get_cid_allocator()
+
+        # Rows of the active customers and a search index over them (S.No, CID, Name, Phone, Address)
+        self.customer_rows = []
+        self.customer_keys = []
+        self.search_index = SearchIndex(fields=lambda row: row[1:5])
+
         self.cluster_bg_colors = [
             "#6ee7b7",
             "#facc15",
@@ -42,7 +54,6 @@ class CustomerTab(ctk.CTkFrame):
 
         self.load_clusters()
         self.initialize_excel()
-        self.initialize_deleted_excel()
         self.pack_forget()
         self.create_ui()
         self.load_data()
@@ -82,34 +93,8 @@ class CustomerTab(ctk.CTkFrame):
             json.dump(self.clusters, f)
 
     def initialize_excel(self):
-        if not os.path.exists(self.excel_file):
-            df = pd.DataFrame(columns=["S.No", "CID", "Name", "Phone", "Address", "Cluster"])
-            df.to_excel(self.excel_file, index=False, engine="openpyxl")
-        else:
-            try:
-                df = pd.read_excel(self.excel_file, engine="openpyxl")
-                columns = df.columns.tolist()
-                if df.empty or columns != ["S.No", "CID", "Name", "Phone", "Address", "Cluster"]:
-                    df = pd.DataFrame(columns=["S.No", "CID", "Name", "Phone", "Address", "Cluster"])
-                    df.to_excel(self.excel_file, index=False, engine="openpyxl")
-            except:
-                df = pd.DataFrame(columns=["S.No", "CID", "Name", "Phone", "Address", "Cluster"])
-                df.to_excel(self.excel_file, index=False, engine="openpyxl")
-
-    def initialize_deleted_excel(self):
-        if not os.path.exists(self.deleted_file):
-            df = pd.DataFrame(columns=["S.No", "CID", "Name", "Phone", "Address", "Cluster"])
-            df.to_excel(self.deleted_file, index=False, engine="openpyxl")
-        else:
-            try:
-                df = pd.read_excel(self.deleted_file, engine="openpyxl")
-                columns = df.columns.tolist()
-                if df.empty or columns != ["S.No", "CID", "Name", "Phone", "Address", "Cluster"]:
-                    df = pd.DataFrame(columns=["S.No", "CID", "Name", "Phone", "Address", "Cluster"])
-                    df.to_excel(self.deleted_file, index=False, engine="openpyxl")
-            except:
-                df = pd.DataFrame(columns=["S.No", "CID", "Name", "Phone", "Address", "Cluster"])
-                df.to_excel(self.deleted_file, index=False, engine="openpyxl")
+        """Create customers.xlsx / deleted file with the right header if needed"""
+        self.repo.ensure_files()
 
     def create_ui(self):
         header = ctk.CTkFrame(self, fg_color=self.colors["primary"], height=80)
@@ -254,6 +239,8 @@ class CustomerTab(ctk.CTkFrame):
             text_color="#000000",
         )
         self.ent_search.pack(side="left", padx=(0, 10))
+        # Filters as you type; the Search button and Enter still work
+        self.live_search = LiveSearch(self.ent_search, self.search_index, self._on_search, min_chars=2)
 
         btn_search = ctk.CTkButton(
             frm_actions,
@@ -339,16 +326,14 @@ class CustomerTab(ctk.CTkFrame):
         )
 
         self.columns = ("S.No", "CID", "Name", "Phone", "Address")
-        self.tree = ttk.Treeview(
+        # Only the visible rows exist as tree items; arrow keys are handled by the table
+        self.tree = VirtualTable(
         table_container,
         columns=self.columns,
         show="headings",
         selectmode="browse",   # IMPORTANT for keyboard navigation
         style="Custom.Treeview",
         )
-        self.tree.bind("<Up>", self._on_arrow_up)
-        self.tree.bind("<Down>", self._on_arrow_down)
-
 
         self.tree.pack(fill="both", expand=True)
 
@@ -365,8 +350,6 @@ class CustomerTab(ctk.CTkFrame):
         self.tree.tag_configure("oddrow", background="#e0f2fe")
         self.tree.tag_configure("evenrow", background="#ffffff")
 
-        self.tree.bind("<Button-1>", self.on_tree_click)
-
         btn_undo = ctk.CTkButton(
             frm_actions,
             text="↶ Undo",
@@ -379,52 +362,23 @@ class CustomerTab(ctk.CTkFrame):
             command=self.undo_last_action,
         )
         btn_undo.pack(side="left", padx=(10, 0))
-    
-    def _on_arrow_up(self, event):
-        self.tree.focus_set()
-        items = self.tree.get_children()
-        if not items:
-            return "break"
-
-        current = self.tree.focus() or items[0]
-        index = items.index(current)
-
-        if index > 0:
-            item = items[index - 1]
-            self.tree.focus(item)
-            self.tree.selection_set(item)
-            self.tree.see(item)
-
-        return "break"
-
-
-    def _on_arrow_down(self, event):
-        self.tree.focus_set()
-        items = self.tree.get_children()
-        if not items:
-            return "break"
-
-        current = self.tree.focus() or items[0]
-        index = items.index(current)
-
-        if index < len(items) - 1:
-            item = items[index + 1]
-            self.tree.focus(item)
-            self.tree.selection_set(item)
-            self.tree.see(item)
-
-        return "break"
-
 
+        btn_export = ctk.CTkButton(
+            frm_actions,
+            text="📥 Export",
+            font=ctk.CTkFont(size=18, weight="bold"),
+            width=80,
+            height=45,
+            corner_radius=15,
+            fg_color="#10b981",
+            hover_color="#059669",
+            command=self.export_customers,
+        )
+        btn_export.pack(side="left", padx=(10, 0))
     
     def _focus_first_row(self):
         try:
-            items = self.tree.get_children()
-            if items:
-                self.tree.focus_set()
-                self.tree.focus(items[0])
-                self.tree.selection_set(items[0])
-                self.tree.see(items[0])
+            self.tree.focus_first()
         except:
             pass
 
@@ -433,34 +387,8 @@ class CustomerTab(ctk.CTkFrame):
     def get_next_cid(self):
         """Get next CID - NEVER reuse deleted CIDs"""
         try:
-            all_cids = []
-            
-            # Get CIDs from active customers
-            df_active = pd.read_excel(self.excel_file, engine="openpyxl")
-            if not df_active.empty and "CID" in df_active.columns:
-                for cid in df_active["CID"]:
-                    if str(cid).startswith("C_"):
-                        try:
-                            all_cids.append(int(str(cid).split("_")[1]))
-                        except:
-                            continue
-            
-            # IMPORTANT: Also check deleted customers to avoid reusing CIDs
-            try:
-                df_deleted = pd.read_excel(self.deleted_file, engine="openpyxl")
-                if not df_deleted.empty and "CID" in df_deleted.columns:
-                    for cid in df_deleted["CID"]:
-                        if str(cid).startswith("C_"):
-                            try:
-                                all_cids.append(int(str(cid).split("_")[1]))
-                            except:
-                                continue
-            except:
-                pass
-            
-            # Get maximum CID number ever used
-            max_num = max(all_cids) if all_cids else 0
-            return f"C_{max_num + 1}"
+            # Persistent high-water mark, so deleted CIDs are never reused
+            return self.cid_allocator.peek()
             
         except Exception as e:
             print(f"Error getting next CID: {e}")
@@ -496,23 +424,9 @@ class CustomerTab(ctk.CTkFrame):
             data = last_state['data']
             
             if action == 'delete':
-                # Restore deleted customers
-                df_active = pd.read_excel(self.excel_file, engine="openpyxl")
-                df_deleted = pd.read_excel(self.deleted_file, engine="openpyxl")
-                
-                # Remove from deleted
+                # Restore deleted customers (back to active, out of deleted)
                 cids_to_restore = data['CID'].tolist()
-                df_deleted = df_deleted[~df_deleted['CID'].isin(cids_to_restore)]
-                
-                # Add back to active
-                df_active = pd.concat([df_active, data], ignore_index=True)
-                df_active = df_active.sort_values('CID')
-                df_active['S.No'] = range(1, len(df_active) + 1)
-                
-                # Save
-                df_active.to_excel(self.excel_file, index=False, engine="openpyxl")
-                df_deleted['S.No'] = range(1, len(df_deleted) + 1)
-                df_deleted.to_excel(self.deleted_file, index=False, engine="openpyxl")
+                self.repo.restore(data)
                 
                 self.load_data()
                 messagebox.showinfo("Undo", f"Restored {len(cids_to_restore)} customer(s)", parent=self)
@@ -522,12 +436,13 @@ class CustomerTab(ctk.CTkFrame):
                     
             elif action == 'edit':
                 # Restore previous values
-                df = pd.read_excel(self.excel_file, engine="openpyxl")
                 cid = data['CID']
-                df.loc[df['CID'] == cid, 'Name'] = data['old_name']
-                df.loc[df['CID'] == cid, 'Phone'] = data['old_phone']
-                df.loc[df['CID'] == cid, 'Address'] = data['old_address']
-                df.to_excel(self.excel_file, index=False, engine="openpyxl")
+                self.repo.update(
+                    cid,
+                    Name=data['old_name'],
+                    Phone=data['old_phone'],
+                    Address=data['old_address'],
+                )
                 
                 self.load_data()
                 messagebox.showinfo("Undo", f"Restored previous values for {cid}", parent=self)
@@ -538,29 +453,39 @@ class CustomerTab(ctk.CTkFrame):
         except Exception as e:
             messagebox.showerror("Undo Error", f"Failed to undo: {e}", parent=self)
 
-    def on_tree_click(self, event):
-        item = self.tree.identify_row(event.y)
-        if item:
-            self.tree.focus(item)
-            self.tree.selection_set(item)
-
-
+    def export_customers(self):
+        """Write the customer master out as an Excel sheet"""
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx")],
+            initialfile=os.path.basename(self.excel_file),
+            initialdir=os.path.dirname(self.excel_file),
+            parent=self
+        )
+        if not file_path:
+            return
+        try:
+            saved = self.repo.export_excel(file_path)
+            messagebox.showinfo("Export", f"Customers exported to:\n{saved}", parent=self)
+        except Exception as e:
+            messagebox.showerror("Export Error", f"Failed to export customers: {e}", parent=self)
 
+    def _show_rows(self, rows):
+        self.tree.set_rows(rows, [("oddrow" if idx % 2 else "evenrow",) for idx in range(len(rows))])
 
     def load_data(self):
-        self.tree.delete(*self.tree.get_children())
+        self.tree.set_rows([])
         try:
-            df = pd.read_excel(self.excel_file, engine="openpyxl")
+            df = self.repo.active()
+            self.customer_rows = [(row._1, row.CID, row.Name, row.Phone, row.Address) for row in df.itertuples()]
+            self.customer_keys = record_keys(self.customer_rows, self.search_index.fields)
+            # Only customers added, edited or deleted since the last load are re-indexed
+            self.search_index.sync(zip(self.customer_keys, self.customer_rows))
             if df.empty:
                 return
 
-            for idx, row in enumerate(df.itertuples(), start=0):
-                tag = "oddrow" if idx % 2 else "evenrow"
-                self.tree.insert(
-                    "", "end",
-                    values=(row._1, row.CID, row.Name, row.Phone, row.Address),
-                    tags=(tag,)
-                )
+            # Keep the current search applied
+            self._show_rows(self.live_search.matching(self.customer_keys, self.customer_rows))
 
             self._focus_first_row()   # ← REQUIRED
 
@@ -582,26 +507,13 @@ class CustomerTab(ctk.CTkFrame):
         if not address:
             messagebox.showerror("Validation Error", "Please enter address", parent=self)
             return
-        try:
-            df = pd.read_excel(self.excel_file, engine="openpyxl")
-            if phone in df["Phone"].astype(str).values:
-                messagebox.showerror("Duplicate Entry", "Phone number already exists", parent=self)
-                return
-        except:
-            df = pd.DataFrame(columns=["S.No", "CID", "Name", "Phone", "Address", "Cluster"])
+        if self.repo.phone_exists(phone):
+            messagebox.showerror("Duplicate Entry", "Phone number already exists", parent=self)
+            return
 
-        cid = self.get_next_cid()
-        new_row = pd.DataFrame(
-            [[None, cid, name, phone, address, cluster_name]],
-            columns=["S.No", "CID", "Name", "Phone", "Address", "Cluster"],
-        )
         try:
-            df = pd.read_excel(self.excel_file, engine="openpyxl")
-            df = pd.concat([df, new_row], ignore_index=True)
-
-            df["S.No"] = range(1, len(df) + 1)
-
-            df.to_excel(self.excel_file, index=False, engine="openpyxl")
+            cid = self.cid_allocator.allocate()
+            self.repo.add(cid, name, phone, address, cluster_name)
             self.ent_name.delete(0, "end")
             self.ent_phone.delete(0, "end")
             self.ent_address.delete(0, "end")
@@ -619,48 +531,30 @@ class CustomerTab(ctk.CTkFrame):
             messagebox.showwarning("Search", "Enter at least 2 characters", parent=self)
             return
 
-        try:
-            df = pd.read_excel(self.excel_file, engine="openpyxl")
-            df = df.astype(str)
-
-            mask = (
-                df["CID"].str.lower().str.contains(term)
-                | df["Name"].str.lower().str.contains(term)
-                | df["Phone"].str.contains(term)
-                | df["Address"].str.lower().str.contains(term)
-            )
-
-            filtered = df[mask]
-            self.tree.delete(*self.tree.get_children())
-
-            for idx, row in enumerate(filtered.itertuples(), start=0):
-                tag = "oddrow" if idx % 2 else "evenrow"
-                self.tree.insert(
-                    "", "end",
-                    values=(row._1, row.CID, row.Name, row.Phone, row.Address),
-                    tags=(tag,)
-                )
+        self.live_search.run(explicit=True)
 
-            self._focus_first_row()   # ← REQUIRED
+    def _on_search(self, query, keys, explicit):
+        if keys is None:
+            rows = self.customer_rows
+        else:
+            rows = [row for key, row in zip(self.customer_keys, self.customer_rows) if key in keys]
+        self._show_rows(rows)
 
-        except Exception as e:
-            messagebox.showerror("Search Error", f"Search failed: {e}", parent=self)
-            self.load_data()
+        if explicit:
+            self._focus_first_row()   # ← REQUIRED
+        elif rows:
+            # Typing: keep focus in the search box
+            self.tree.set_current(0)
 
 
     def edit_customer(self):
         """Edit selected customer - FIXED BUTTON VISIBILITY"""
-        selected_items = self.tree.selection()
-        if not selected_items:
+        index = self.tree.current()
+        if index is None:
             messagebox.showwarning("Edit", "Select a customer to edit", parent=self)
             return
 
-        if len(selected_items) > 1:
-            messagebox.showwarning("Edit", "Select only one customer at a time", parent=self)
-            return
-
-        item = selected_items[0]
-        values = self.tree.item(item)["values"]
+        values = self.tree.row(index)
         cid = str(values[1])
         old_name = str(values[2])
         old_phone = str(values[3])
@@ -729,15 +623,7 @@ class CustomerTab(ctk.CTkFrame):
                 return
 
             try:
-                df = pd.read_excel(self.excel_file, engine="openpyxl")
-                df["CID"] = df["CID"].astype(str)
-                df["Phone"] = df["Phone"].astype(str)
-
-                mask = df["CID"] == cid
-                df.loc[mask, "Name"] = new_name
-                df.loc[mask, "Phone"] = new_phone
-                df.loc[mask, "Address"] = new_address
-                df.to_excel(self.excel_file, index=False, engine="openpyxl")
+                self.repo.update(cid, Name=new_name, Phone=new_phone, Address=new_address)
 
                 self.load_data()
                 if self.on_customer_change:
@@ -782,16 +668,13 @@ class CustomerTab(ctk.CTkFrame):
 
 
     def delete_customers(self):
-        selected_items = self.tree.selection()
-        if not selected_items:
+        index = self.tree.current()
+        if index is None:
             messagebox.showwarning("Delete", "Select at least one customer", parent=self)
             return
         
-        cids = [
-            self.tree.item(i)["values"][1]
-            for i in selected_items
-            if self.tree.item(i)["values"][1].startswith("C_")
-        ]
+        cid = str(self.tree.row(index)[1])
+        cids = [cid] if cid.startswith("C_") else []
         
         if not cids:
             messagebox.showwarning("Delete", "Select valid customer rows", parent=self)
@@ -804,21 +687,10 @@ class CustomerTab(ctk.CTkFrame):
             return
         
         try:
-            df = pd.read_excel(self.excel_file, engine="openpyxl")
-            deleted_df = pd.read_excel(self.deleted_file, engine="openpyxl")
-
-            to_delete = df[df["CID"].isin(cids)]
+            to_delete = self.repo.delete(cids)
             
-            # SAVE UNDO STATE BEFORE DELETING
+            # SAVE UNDO STATE (rows as they were before deleting)
             self.save_undo_state('delete', to_delete)
-            
-            deleted_df = pd.concat([deleted_df, to_delete], ignore_index=True)
-            deleted_df["S.No"] = range(1, len(deleted_df) + 1)
-            deleted_df.to_excel(self.deleted_file, index=False, engine="openpyxl")
-
-            df = df[~df["CID"].isin(cids)]
-            df["S.No"] = range(1, len(df) + 1)
-            df.to_excel(self.excel_file, index=False, engine="openpyxl")
 
             self.load_data()
             self.lbl_cid.configure(text=self.get_next_cid())
@@ -1,72 +1,19 @@
 import os
 import datetime
-import pandas as pd
 import customtkinter as ctk
 from tkinter import messagebox
 import subprocess
-from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, Alignment
-from openpyxl.utils import get_column_letter
-import calendar
-
-
-def create_monthly_excel_template(customers_df, year, month, path, month_rate=0):
-    days_in_month = calendar.monthrange(year, month)[1]
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = f"{year}_{month:02d}"
-
-    ws['A1'] = 'S.No'
-    ws['B1'] = 'CID'
-    ws['C1'] = 'Name'
-    ws['D1'] = 'Phone'
-    ws['E1'] = month_rate
-    ws['E1'].font = Font(bold=True)
-
-    col_start = 6
-    col_end = col_start + days_in_month - 1
-
-    for col in range(col_start, col_end + 1):
-        day_label = datetime.date(year, month, col - col_start + 1).strftime('%d/%m/%y')
-        cell = ws.cell(row=1, column=col, value=day_label)
-        cell.font = Font(bold=True)
-        cell.alignment = Alignment(horizontal='center')
-        ws.column_dimensions[get_column_letter(col)].width = 8
-
-    total_ltr_col = col_end + 1
-    total_rt_col = total_ltr_col + 1
-
-    ws.cell(row=1, column=total_ltr_col, value='Total_LTR').font = Font(bold=True)
-    ws.cell(row=1, column=total_rt_col, value='Total_RT').font = Font(bold=True)
-    ws.column_dimensions[get_column_letter(total_ltr_col)].width = 15
-    ws.column_dimensions[get_column_letter(total_rt_col)].width = 15
-
-    max_customers = max(500, len(customers_df))
-    start_row = 2
-
-    for i in range(max_customers):
-        row_num = start_row + i
-        if i < len(customers_df):
-            cust = customers_df.iloc[i]
-            ws.cell(row=row_num, column=1, value=i + 1)
-            ws.cell(row=row_num, column=2, value=cust['CID'])
-            ws.cell(row=row_num, column=3, value=cust['Name'])
-            ws.cell(row=row_num, column=4, value=cust.get('Phone', None))
-        else:
-            ws.cell(row=row_num, column=1, value=i + 1)
-
-        for col in range(col_start, col_end + 1):
-            ws.cell(row=row_num, column=col, value=None)
-
-        first_col_letter = get_column_letter(col_start)
-        last_col_letter = get_column_letter(col_end)
-        total_ltr_col_letter = get_column_letter(total_ltr_col)
-
-        ws.cell(row=row_num, column=total_ltr_col).value = f"=SUM({first_col_letter}{row_num}:{last_col_letter}{row_num})"
-        ws.cell(row=row_num, column=total_rt_col).value = f"=IF(ISNUMBER({total_ltr_col_letter}{row_num}), {total_ltr_col_letter}{row_num}*$E$1, 0)"
-
-    wb.save(path)
+from openpyxl import load_workbook
+from customer_store import get_customer_repository
+from month_sheets import (CID_COL, NAME_COL, PHONE_COL, SPARE_ROWS, SheetReader, is_month_closed, month_cache,
+                          month_layout, reopen_month, total_formulas, write_month_template)
+
+
+def create_monthly_excel_template(customers_df, year, month, path, month_rate=0, spare_rows=SPARE_ROWS):
+    phones = customers_df['Phone'] if 'Phone' in customers_df else [None] * len(customers_df)
+    customers = zip(customers_df['CID'], customers_df['Name'], phones)
+    write_month_template(path, year, month, customers, month_rate, spare_rows)
+    month_cache.invalidate(path)
 
 def reload_customers(self):
     self.load_customers()
@@ -83,101 +30,153 @@ def _end_page_build(self):
 
 
 
-def sync_customers_to_monthly(customers_path, monthly_path, year, month, month_rate=0):
-    """Sync customers - NEVER add new customers to old sheets"""
-    
-    main_customers = pd.read_excel(customers_path)[['CID', 'Name', 'Phone']]
+def _cell_text(value):
+    """Cell or master value as comparable text ('' for blanks/NaN, 98.0 -> '98')"""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if value != value:
+            return ""
+        if value.is_integer():
+            value = int(value)
+    return str(value).strip()
 
-    if not os.path.exists(monthly_path):
-        create_monthly_excel_template(main_customers, year, month, monthly_path, month_rate)
-        return
 
-    try:
-        wb = load_workbook(monthly_path)
-        ws = wb.active
-    except Exception as e:
-        messagebox.showerror("Load Error", f"Could not load file: {str(e)}")
-        return
+def _is_formula(value):
+    return isinstance(value, str) and value.startswith('=')
 
-    days_in_month = calendar.monthrange(year, month)[1]
-    col_start = 6
-    col_end = col_start + days_in_month - 1
-    total_ltr_col = col_end + 1
-    total_rt_col = total_ltr_col + 1
 
-    existing_cids = {}
-    for row in range(2, ws.max_row + 1):
-        cid_cell = ws.cell(row=row, column=2).value
-        if cid_cell:
-            existing_cids[cid_cell] = row
+def sync_summary(report):
+    """One-line description of a sync_customers_to_monthly report"""
+    if report is None:
+        return "sync failed"
+    if report["created"]:
+        return "new sheet created"
+    parts = []
+    if report["new"]:
+        parts.append(f"{len(report['new'])} new customer(s) added")
+    if report["renamed"]:
+        parts.append(f"{len(report['renamed'])} renamed")
+    if report["phones"]:
+        parts.append(f"{len(report['phones'])} phone(s) updated")
+    if report["formulas"]:
+        parts.append(f"{len(report['formulas'])} total formula(s) repaired")
+    if report["renumbered"]:
+        parts.append(f"{report['renumbered']} S.No fixed")
+    return ", ".join(parts) if parts else "already in sync"
 
-    # ✅ CHECK IF THIS IS AN OLD SHEET
-    today = datetime.date.today()
-    sheet_date = datetime.date(year, month, 1)
-    is_old_sheet = sheet_date < datetime.date(today.year, today.month, 1)
 
-    # ✅ ONLY ADD NEW CUSTOMERS TO CURRENT/FUTURE SHEETS
-    if not is_old_sheet:
-        new_customers = main_customers[~main_customers['CID'].isin(existing_cids.keys())]
+def sync_customers_to_monthly(customers_df, monthly_path, year, month, month_rate=0, spare_rows=SPARE_ROWS):
+    """Sync customers - NEVER add new customers to old sheets
 
-        if not new_customers.empty:
-            last_filled_row = max(existing_cids.values()) if existing_cids else 1
+    The sheet is read once (streaming, formulas as text) to work out which
+    cells differ from the customer master. Only those cells are written and
+    the workbook is not opened for writing or saved when nothing differs.
 
-            for idx, (_, row_data) in enumerate(new_customers.iterrows()):
-                new_row = last_filled_row + idx + 1
+    Returns a report dict (see sync_summary), or None if the sheet could
+    not be read or saved.
+    """
+    main_customers = customers_df[['CID', 'Name', 'Phone']]
+    report = {"created": False, "new": [], "renamed": [], "phones": [], "formulas": [],
+              "renumbered": 0, "saved": False}
 
-                ws.cell(row=new_row, column=1, value=new_row - 1)
-                ws.cell(row=new_row, column=2, value=row_data['CID'])
-                ws.cell(row=new_row, column=3, value=row_data['Name'])
-                ws.cell(row=new_row, column=4, value=row_data.get('Phone', None))
+    if not os.path.exists(monthly_path):
+        create_monthly_excel_template(main_customers, year, month, monthly_path, month_rate, spare_rows)
+        report["created"] = report["saved"] = True
+        return report
 
-                for col in range(col_start, col_end + 1):
-                    ws.cell(row=new_row, column=col, value=None)
+    master = {}
+    for cid, name, phone in zip(main_customers['CID'], main_customers['Name'], main_customers['Phone']):
+        master.setdefault(str(cid).strip(), (cid, name, phone))
 
-                first_col_letter = get_column_letter(col_start)
-                last_col_letter = get_column_letter(col_end)
-                total_ltr_col_letter = get_column_letter(total_ltr_col)
+    layout = month_layout(year, month)
+    ltr_col = layout["total_ltr_col"]
+    rt_col = layout["total_rt_col"]
 
-                ws.cell(row=new_row, column=total_ltr_col).value = f"=SUM({first_col_letter}{new_row}:{last_col_letter}{new_row})"
-                ws.cell(row=new_row, column=total_rt_col).value = f"=IF(ISNUMBER({total_ltr_col_letter}{new_row}), {total_ltr_col_letter}{new_row}*$E$1, 0)"
+    # (row, column) -> new value
+    writes = {}
+    seen_cids = set()
+    last_filled_row = 1
 
-    # ALWAYS update name/phone for existing customers (even in old sheets)
-    cid_to_name = pd.Series(main_customers['Name'].values, index=main_customers['CID']).to_dict()
-    cid_to_phone = pd.Series(main_customers['Phone'].values, index=main_customers['CID']).to_dict()
+    try:
+        with SheetReader(monthly_path, data_only=False) as reader:
+            columns = [1, CID_COL, NAME_COL, PHONE_COL, ltr_col, rt_col]
+            for row, (sno, cid, name, phone, ltr_formula, rt_formula) in reader.rows(columns):
+                if cid is None:
+                    continue
+                cid_str = str(cid).strip()
+                if not cid_str:
+                    continue
+                seen_cids.add(cid_str)
+                last_filled_row = max(last_filled_row, row)
+
+                if sno != row - 1:
+                    writes[(row, 1)] = row - 1
+                    report["renumbered"] += 1
+
+                # Update name/phone for existing customers (even in old sheets)
+                if cid_str in master:
+                    _, new_name, new_phone = master[cid_str]
+                    if _cell_text(new_name) and _cell_text(name) != _cell_text(new_name):
+                        writes[(row, NAME_COL)] = new_name
+                        report["renamed"].append((cid_str, name, new_name))
+                    if _cell_text(new_phone) and _cell_text(phone) != _cell_text(new_phone):
+                        writes[(row, PHONE_COL)] = new_phone
+                        report["phones"].append(cid_str)
+
+                if not (_is_formula(ltr_formula) and _is_formula(rt_formula)):
+                    expected = total_formulas(year, month, row)
+                    if not _is_formula(ltr_formula):
+                        writes[(row, ltr_col)] = expected[0]
+                    if not _is_formula(rt_formula):
+                        writes[(row, rt_col)] = expected[1]
+                    report["formulas"].append(cid_str)
+    except Exception as e:
+        messagebox.showerror("Load Error", f"Could not load file: {str(e)}")
+        return None
 
-    for row in range(2, ws.max_row + 1):
-        cid_cell = ws.cell(row=row, column=2).value
-        if cid_cell:
-            ws.cell(row=row, column=1, value=row - 1)
-            
-            name_value = cid_to_name.get(cid_cell, None)
-            if name_value:
-                ws.cell(row=row, column=3, value=name_value)
-            
-            phone_value = cid_to_phone.get(cid_cell, None)
-            ws.cell(row=row, column=4, value=phone_value)
+    # ✅ CHECK IF THIS IS AN OLD SHEET
+    today = datetime.date.today()
+    sheet_date = datetime.date(year, month, 1)
+    is_old_sheet = sheet_date < datetime.date(today.year, today.month, 1)
 
-    # Ensure formulas
-    for row in range(2, ws.max_row + 1):
-        cid_cell = ws.cell(row=row, column=2).value
-        if cid_cell:
-            first_col_letter = get_column_letter(col_start)
-            last_col_letter = get_column_letter(col_end)
-            total_ltr_col_letter = get_column_letter(total_ltr_col)
+    # ✅ ONLY ADD NEW CUSTOMERS TO CURRENT/FUTURE SHEETS
+    if not is_old_sheet:
+        new_row = last_filled_row
+        for cid_str, (cid, name, phone) in master.items():
+            if cid_str in seen_cids:
+                continue
+            new_row += 1
+            ltr_formula, rt_formula = total_formulas(year, month, new_row)
+            writes[(new_row, 1)] = new_row - 1
+            writes[(new_row, CID_COL)] = cid
+            writes[(new_row, NAME_COL)] = name
+            writes[(new_row, PHONE_COL)] = phone
+            writes[(new_row, ltr_col)] = ltr_formula
+            writes[(new_row, rt_col)] = rt_formula
+            report["new"].append(cid_str)
+
+    if not writes:
+        return report
 
-            current_formula = ws.cell(row=row, column=total_ltr_col).value
-            if not current_formula or not str(current_formula).startswith('='):
-                ws.cell(row=row, column=total_ltr_col).value = f"=SUM({first_col_letter}{row}:{last_col_letter}{row})"
+    try:
+        wb = load_workbook(monthly_path)
+        ws = wb.active
+    except Exception as e:
+        messagebox.showerror("Load Error", f"Could not load file: {str(e)}")
+        return None
 
-            current_rt_formula = ws.cell(row=row, column=total_rt_col).value
-            if not current_rt_formula or not str(current_rt_formula).startswith('='):
-                ws.cell(row=row, column=total_rt_col).value = f"=IF(ISNUMBER({total_ltr_col_letter}{row}), {total_ltr_col_letter}{row}*$E$1, 0)"
+    for (row, col), value in writes.items():
+        ws.cell(row=row, column=col, value=value)
 
     try:
         wb.save(monthly_path)
     except PermissionError:
         messagebox.showerror("Save Error", f"Close the file {monthly_path} before syncing.")
-        return
+        return None
+
+    report["saved"] = True
+    return report
 
 
 class EntryTab(ctk.CTkFrame):
@@ -194,6 +193,9 @@ class EntryTab(ctk.CTkFrame):
         self.app_config = app_config
         
         self.monthly_sheets_path = str(app_config.monthly_sheets_path)
+        self.repo = get_customer_repository()
+        # Empty rows left under the customers in new month sheets
+        self.spare_rows = SPARE_ROWS
         
         # Ensure monthly sheets directory exists
         app_config.monthly_sheets_path.mkdir(parents=True, exist_ok=True)
@@ -347,20 +349,19 @@ class EntryTab(ctk.CTkFrame):
             if not create_new:
                 return
             
-            customers_path = self.customer_tab.excel_file
-            
-            # Check if customers file exists
-            if not os.path.exists(customers_path):
+            # The repository, not customers.xlsx: the database backend only writes that on export
+            active = self.repo.active()
+            if active.empty:
                 messagebox.showerror(
                     "Error",
-                    f"Customers file not found at:\n{customers_path}\n\nPlease add customers first.",
+                    "No customers found.\n\nPlease add customers first.",
                     parent=self
                 )
                 return
             
             try:
-                main_customers = pd.read_excel(customers_path)[['CID', 'Name', 'Phone']]
-                create_monthly_excel_template(main_customers, year, month, monthly_path)
+                main_customers = active[['CID', 'Name', 'Phone']]
+                create_monthly_excel_template(main_customers, year, month, monthly_path, spare_rows=self.spare_rows)
             except Exception as e:
                 messagebox.showerror(
                     "Error",
@@ -368,10 +369,21 @@ class EntryTab(ctk.CTkFrame):
                     parent=self
                 )
                 return
-        else:
-            customers_path = self.customer_tab.excel_file
+        elif is_month_closed(monthly_path):
+            reopen = messagebox.askyesno(
+                "Month Closed",
+                f"{self.month_names[month-1]} {year} is closed for billing.\n\n"
+                "Reopen it for editing? Reports will read the Excel sheet again.",
+                parent=self
+            )
+            if not reopen:
+                return
+            reopen_month(monthly_path)
 
-        sync_customers_to_monthly(customers_path, monthly_path, year, month)
+        report = sync_customers_to_monthly(self.repo.active(), monthly_path, year, month,
+                                           spare_rows=self.spare_rows)
+        if report is not None:
+            print(f"{os.path.basename(monthly_path)}: {sync_summary(report)}")
 
         try:
             if os.name == 'nt':
@@ -5,13 +5,19 @@ import customtkinter as ctk
 from tkinter import ttk, messagebox
 import time
 import calendar
-from openpyxl import load_workbook
 import threading
 from pathlib import Path
 import socket
 import random
-import pyperclip  # preserves newlines reliably when pasting into WhatsApp
-# selenium imports are lazy (inside functions) to avoid failing import if not installed
+from month_sheets import bill_month, month_cache
+from customer_store import get_customer_repository
+from sheet_watcher import get_sheet_watcher
+from virtual_table import VirtualTable
+from search_index import LiveSearch, SearchIndex, record_keys
+from view_manager import ViewManager
+from message_transport import (ESTIMATED_SECONDS_PER_MESSAGE, MAX_SESSIONS, AdaptivePacer, WhatsAppWebTransport,
+                               chrome_driver, combined_latencies, send_parallel)
+# selenium imports are lazy (inside message_transport) to avoid failing import if not installed
 
 class MessageTab(ctk.CTkFrame):
     def __init__(self, parent, colors, back_callback, customer_tab):
@@ -26,6 +32,8 @@ class MessageTab(ctk.CTkFrame):
         self.app_config = app_config
         
         self.monthly_sheets_path = str(app_config.monthly_sheets_path)
+        self.repo = get_customer_repository()
+        get_sheet_watcher().subscribe(self.on_sheet_change)
         self.status_folder = str(app_config.status_folder)
         
         # Ensure directories exist
@@ -42,27 +50,34 @@ class MessageTab(ctk.CTkFrame):
         self.selected_month = None
         self.selected_year = None
         self.customer_data = []
-        self.checkboxes = {}
-        self.tree_iid_to_key = {}
+        self.customer_keys = []
+        self.search_index = SearchIndex()
+        self.row_data = {}
+        self.row_keys = []
         self.failed_list = []
         self.sent_list = []
         self.search_mode = False
+        # The selection: ticked customer keys, kept across searches and reloads
         self.previously_selected = set()
+        self.shown_selected = 0
         self.viewing_unsent_data = []
         self.viewing_sent_data = []
+        # The open month's sheet changed while its table was not on screen
+        self._month_dirty = False
 
         # UPDATED: Get business info from config
         self.business_name = app_config.get_business_name()
         self.contact_number = app_config.get_contact_number()
         self.payment_info = app_config.get_payment_info()
 
-        # Selenium placeholders
-        self.driver = None
-        self.By = None
-        self.WebDriverWait = None
-        self.EC = None
-        self.Keys = None
-        self.working_send_strategy = None
+        # Message delivery: one message_transport.MessageTransport per sending
+        # session (a Chrome window with WhatsApp Web), opened on first send
+        self.transports = []
+        # Each session's pause adapts to how its sending goes; kept across batches
+        self.pacers = []
+        self.session_count = 1
+        # Per session; sessions send side by side
+        self.seconds_per_message = ESTIMATED_SECONDS_PER_MESSAGE
 
         # Sending flags
         self.is_sending = False
@@ -74,7 +89,8 @@ class MessageTab(ctk.CTkFrame):
         self._rand_button_color = self._generate_random_color()
         self._rand_button_text_color = "#ffffff"
 
-        # Build UI
+        # Build UI: every screen is built once and re-shown with fresh data
+        self.views = ViewManager(self)
         self.pack_forget()
         self.init_month_selection_ui()
 
@@ -129,6 +145,16 @@ class MessageTab(ctk.CTkFrame):
         except:
             return ""
 
+    def estimated_minutes(self, count):
+        """Sending time for count messages at the pace of the last batch"""
+        return max(1, round(count * self.seconds_per_message / self.session_count / 60))
+
+    def on_session_count(self, value):
+        self.session_count = int(value)
+        self.update_selected_count()
+        if hasattr(self, 'unsent_checkboxes'):
+            self.update_unsent_selected_count()
+
     def format_phone_number(self, phone):
         phone = str(phone).strip()
         phone = ''.join(filter(str.isdigit, phone))
@@ -145,10 +171,10 @@ class MessageTab(ctk.CTkFrame):
     # UI Initialization
     # ---------------------------
     def init_month_selection_ui(self):
-        for widget in self.winfo_children():
-            widget.destroy()
+        self.views.show("month_selection", self._build_month_selection_page)
 
-        header = ctk.CTkFrame(self, fg_color=self.colors["primary"], height=80)
+    def _build_month_selection_page(self, view):
+        header = ctk.CTkFrame(view, fg_color=self.colors["primary"], height=80)
         header.pack(fill="x")
         header.pack_propagate(False)
 
@@ -167,7 +193,7 @@ class MessageTab(ctk.CTkFrame):
         )
         lbl_title.pack(side="left", padx=20)
 
-        content_frame = ctk.CTkFrame(self, fg_color="transparent")
+        content_frame = ctk.CTkFrame(view, fg_color="transparent")
         content_frame.pack(fill="both", expand=True, padx=40, pady=20)
 
         # ----------------------------
@@ -277,83 +303,12 @@ class MessageTab(ctk.CTkFrame):
             return
 
         try:
-            # FIRST: Load current customer data from main customers file
-            customers_dict = {}
-            try:
-                df_customers = pd.read_excel(self.customer_tab.excel_file, engine="openpyxl")
-                for _, row in df_customers.iterrows():
-                    cid = str(row.get('CID', '')).strip()
-                    if cid:
-                        customers_dict[cid] = {
-                            'Name': row.get('Name', ''),
-                            'Phone': row.get('Phone', ''),
-                            'Address': row.get('Address', '')
-                        }
-            except Exception as e:
-                print(f"Error loading main customers: {e}")
-            
-            # THEN: Load monthly sheet data
-            wb = load_workbook(monthly_path, data_only=False)
-            ws = wb.active
-
-            days_in_month = calendar.monthrange(self.selected_year, self.selected_month)[1]
-            col_start = 6
-            col_end = col_start + days_in_month - 1
-
-            self.customer_data = []
-
-            for row in range(2, ws.max_row + 1):
-                cid = ws.cell(row=row, column=2).value
-                name_sheet = ws.cell(row=row, column=3).value
-                phone_sheet = ws.cell(row=row, column=4).value
-
-                if not cid or not name_sheet:
-                    continue
-                
-                cid_str = str(cid).strip()
-
-                # Get LATEST data from main customers file
-                if cid_str in customers_dict:
-                    name = customers_dict[cid_str]['Name']
-                    phone = customers_dict[cid_str]['Phone']
-                    address = customers_dict[cid_str]['Address']
-                else:
-                    # Fallback to sheet data if customer deleted
-                    name = name_sheet
-                    phone = phone_sheet
-                    address = ""
-
-                # Manual total computation
-                total_ltr = 0
-                for col in range(col_start, col_end + 1):
-                    val = ws.cell(row=row, column=col).value
-                    try:
-                        total_ltr += float(val) if val else 0
-                    except:
-                        pass
-
-                # Fetch rate
-                try:
-                    rate = float(ws["E1"].value)
-                except:
-                    rate = 0
-
-                total_amt = total_ltr * rate
-
-                self.customer_data.append({
-                    "sno": row-1,
-                    "CID": cid,
-                    "Name": name,
-                    "Phone": phone,
-                    "address": address,
-                    "Total_Ltr": total_ltr,
-                    "Total_Amt": total_amt
-                })
-
-            wb.close()
+            self.customer_data = self._read_customer_data(monthly_path)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load data:\n{e}")
             return
+        self._index_customers()
+        self._month_dirty = False
 
         # Load persisted sent_list
         self.load_sent_list()
@@ -361,17 +316,83 @@ class MessageTab(ctk.CTkFrame):
         # Show customer table
         self.show_customer_table()
 
+    def _read_customer_data(self, monthly_path):
+        """Rows for one month with totals from the daily columns and latest contact details"""
+        # FIRST: Load current customer data from main customers file
+        try:
+            customers_dict = self.repo.contact_details()
+        except Exception as e:
+            print(f"Error loading main customers: {e}")
+            customers_dict = {}
+
+        # THEN: Load monthly sheet data (parsed once, shared with other tabs)
+        sheet = month_cache.get(monthly_path, self.selected_year, self.selected_month,
+                                parts=("ids", "days"))
+        row_liters, row_amounts = bill_month(sheet)
+
+        customer_data = []
+
+        for i, cid_str in enumerate(sheet.cids):
+            name_sheet = sheet.names[i]
+            phone_sheet = sheet.phones[i]
+
+            if not name_sheet:
+                continue
+
+            # Get LATEST data from main customers file
+            if cid_str in customers_dict:
+                name = customers_dict[cid_str]['Name']
+                phone = customers_dict[cid_str]['Phone']
+                address = customers_dict[cid_str]['Address']
+            else:
+                # Fallback to sheet data if customer deleted
+                name = name_sheet
+                phone = phone_sheet
+                address = ""
+
+            total_ltr = float(row_liters[i])
+            total_amt = float(row_amounts[i])
+
+            customer_data.append({
+                "sno": sheet.rows[i] - 1,
+                "CID": cid_str,
+                "Name": name,
+                "Phone": phone,
+                "address": address,
+                "Total_Ltr": total_ltr,
+                "Total_Amt": total_amt
+            })
+
+        return customer_data
+
     # message_tab.py  — Part 2/3 (Updated)
 
     # ---------------------------
     # Table UI
     # ---------------------------
     def show_customer_table(self):
-        """Build the table UI with arrow key navigation support."""
-        for widget in self.winfo_children():
-            widget.destroy()
+        """Show the customer table of the selected month (built on first use)."""
+        self.views.show("customers", self._build_customer_page)
+        self.lbl_table_title.configure(
+            text=f"📱 {self.month_names[self.selected_month-1]} {self.selected_year} - Messages"
+        )
 
-        header = ctk.CTkFrame(self, fg_color=self.colors["primary"], height=80)
+        # A re-shown page still holds the last visit's search and Select All
+        self.ent_search.delete(0, "end")
+        self.live_search.reset()
+        self.search_mode = False
+        self.select_all_var.set(False)
+        if self._month_dirty:
+            # Saved in Excel while another page was shown: bills use the new totals
+            self._reload_month_data()
+        self.populate_table()
+
+        # Set focus to tree for arrow key navigation
+        self.tree.focus_set()
+
+    def _build_customer_page(self, view):
+        """Build the table UI with arrow key navigation support."""
+        header = ctk.CTkFrame(view, fg_color=self.colors["primary"], height=80)
         header.pack(fill="x")
         header.pack_propagate(False)
 
@@ -383,14 +404,14 @@ class MessageTab(ctk.CTkFrame):
         )
         btn_back.pack(side="left", padx=30, pady=12)
 
-        lbl_title = ctk.CTkLabel(
-            header, text=f"📱 {self.month_names[self.selected_month-1]} {self.selected_year} - Messages",
+        self.lbl_table_title = ctk.CTkLabel(
+            header, text="",
             font=ctk.CTkFont(size=32, weight="bold"),
             text_color=self.colors["text_light"]
         )
-        lbl_title.pack(side="left", padx=20)
+        self.lbl_table_title.pack(side="left", padx=20)
 
-        toolbar = ctk.CTkFrame(self, fg_color=self.colors["secondary"], height=70)
+        toolbar = ctk.CTkFrame(view, fg_color=self.colors["secondary"], height=70)
         toolbar.pack(fill="x", padx=20, pady=(10, 5))
         toolbar.pack_propagate(False)
 
@@ -437,6 +458,8 @@ class MessageTab(ctk.CTkFrame):
             border_width=2, border_color=self.colors["info"], fg_color="#ffffff", text_color="#000000"
         )
         self.ent_search.pack(side="left", padx=10)
+        # Filters as you type; the Search button and Enter still work
+        self.live_search = LiveSearch(self.ent_search, self.search_index, self._on_search)
         btn_search = ctk.CTkButton(
             toolbar, text="Search", font=ctk.CTkFont(size=18, weight="bold"),
             width=80, height=45, corner_radius=15, fg_color=self.colors["info"],
@@ -452,13 +475,13 @@ class MessageTab(ctk.CTkFrame):
         btn_clear_search.pack(side="left", padx=5)
 
         self.lbl_selected = ctk.CTkLabel(
-            toolbar, text=f"Selected: 0/{len(self.customer_data)} customers",
+            toolbar, text="Selected: 0/0 customers",
             font=ctk.CTkFont(size=12, weight="bold"), text_color=self.colors["text_dark"]
         )
         self.lbl_selected.pack(side="right", padx=20)
 
         # customer list area
-        frame_list = ctk.CTkFrame(self, fg_color=self.colors["text_light"])
+        frame_list = ctk.CTkFrame(view, fg_color=self.colors["text_light"])
         frame_list.pack(fill="both", expand=True, padx=25, pady=(0, 10))
 
         table_container = ctk.CTkFrame(frame_list, fg_color="transparent")
@@ -482,8 +505,10 @@ class MessageTab(ctk.CTkFrame):
                 foreground=[("selected", self.colors["text_light"])])
 
         self.columns = ("chk", "sno", "cid", "name", "phone", "address", "ltr", "amt")
-        self.tree = ttk.Treeview(table_container, columns=self.columns, show="headings", 
-                                selectmode="browse", style="Custom.Treeview")
+        # Only the visible rows exist as tree items; the current row gets the highlight tag
+        self.tree = VirtualTable(table_container, columns=self.columns, show="headings",
+                                 selectmode="browse", style="Custom.Treeview", current_tag="highlight",
+                                 formatter=self._format_row)
         self.tree.pack(fill="both", expand=True)
 
         widths = [80, 80, 100, 200, 150, 350, 120, 120]
@@ -502,24 +527,12 @@ class MessageTab(ctk.CTkFrame):
         self.tree.tag_configure("evenrow", background="#ffffff")
         self.tree.tag_configure("highlight", background="#fbbf24", foreground="#000000")
 
-        # init internal maps
-        self.checkboxes = {}
-        self.tree_iid_to_key = {}
-        self.populate_table()
-
-        # bindings - UPDATED WITH ARROW KEYS
+        # bindings - arrow keys and wheel scrolling are handled by VirtualTable
         self.tree.bind("<Button-1>", self.on_tree_click)
-        self.tree.bind("<MouseWheel>", self.on_mouse_wheel)
-        self.tree.bind("<Button-4>", self.on_mouse_wheel)
-        self.tree.bind("<Button-5>", self.on_mouse_wheel)
-        
-        # Arrow key navigation
-        self.tree.bind("<Up>", self.on_arrow_up)
-        self.tree.bind("<Down>", self.on_arrow_down)
         self.tree.bind("<space>", self.on_space_toggle)  # Space to toggle checkbox
         self.tree.bind("<Return>", self.on_space_toggle)  # Enter to toggle checkbox
 
-        bottom_frame = ctk.CTkFrame(self, fg_color="transparent", height=80)
+        bottom_frame = ctk.CTkFrame(view, fg_color="transparent", height=80)
         bottom_frame.pack(fill="x", padx=20, pady=(5, 15))
         bottom_frame.pack_propagate(False)
 
@@ -539,180 +552,88 @@ class MessageTab(ctk.CTkFrame):
                                     command=self.send_messages)
         self.btn_send.pack(side="right", padx=10)
 
-        # Set focus to tree for arrow key navigation
-        self.tree.focus_set()
+        # Several Chrome windows (linked devices of the same phone) send side by side
+        self.opt_sessions = ctk.CTkOptionMenu(
+            bottom_frame, values=[str(n) for n in range(1, MAX_SESSIONS + 1)],
+            font=ctk.CTkFont(size=16, weight="bold"), width=70, height=50, corner_radius=12,
+            command=self.on_session_count
+        )
+        self.opt_sessions.set(str(self.session_count))
+        self.opt_sessions.pack(side="right", padx=(0, 10))
+        ctk.CTkLabel(bottom_frame, text="Chrome windows:", font=ctk.CTkFont(size=16),
+                     text_color=self.colors["text_dark"]).pack(side="right", padx=(10, 5))
 
     # ---------------------------
     # Table population & mapping
     # ---------------------------
     def populate_table(self, filtered_data=None):
-        """Populate tree and maintain stable mapping between iid and customer key."""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        self.checkboxes.clear()
-        self.tree_iid_to_key.clear()
+        """Fill the table and keep row_keys[i] = customer key of row i.
+
+        Ticks are not stored per row: the checkbox column is drawn from
+        previously_selected, so (de)selecting never rewrites rows.
+        """
+        self.row_data = {}
+        self.row_keys = []
 
         data_to_show = filtered_data if filtered_data is not None else (self.customer_data or [])
 
+        rows = []
         for idx, customer in enumerate(data_to_show):
             # stable key: prefer CID else fallback unique
             cid_val = customer.get('CID') or customer.get('cid') or ""
             cid_key = str(cid_val).strip() if cid_val else f"idx_{idx}_{int(time.time()*1000) % 100000}"
 
-            var = ctk.BooleanVar(value=(cid_key in self.previously_selected))
-            self.checkboxes[cid_key] = {'var': var, 'data': customer}
+            self.row_data[cid_key] = customer
+            rows.append(self._row_values(idx, customer))
+            self.row_keys.append(cid_key)
 
-            tag = "oddrow" if idx % 2 else "evenrow"
-
-            # safe numeric parsing
-            total_ltr = customer.get('Total_Ltr', customer.get('total_ltr', 0) or 0)
-            total_amt = customer.get('Total_Amt', customer.get('total_amt', 0) or 0)
-            try:
-                total_ltr_f = float(total_ltr)
-            except:
-                total_ltr_f = 0.0
-            try:
-                total_amt_f = float(total_amt)
-            except:
-                total_amt_f = 0.0
-
-            values = (
-                "☑" if var.get() else "☐",
-                customer.get('sno', idx+1),
-                cid_val,
-                customer.get('Name', customer.get('name', '')),
-                customer.get('Phone', customer.get('phone', '')),
-                customer.get('address', ''),
-                f"{total_ltr_f:.2f}",
-                f"₹{total_amt_f:.2f}"
-            )
-            iid = self.tree.insert("", "end", values=values, tags=(tag,))
-            self.tree_iid_to_key[iid] = cid_key
+        self.shown_selected = len(self.previously_selected.intersection(self.row_data))
+        self.tree.set_rows(rows, [("oddrow" if idx % 2 else "evenrow",) for idx in range(len(rows))])
 
         self.update_selected_count()
-        self.update_checkbox_display()
-    
-    def on_arrow_up(self, event):
-        """Handle Up arrow key - move to previous row"""
-        try:
-            current_item = self.tree.focus()
-            if not current_item:
-                # Select first item if nothing selected
-                items = self.tree.get_children()
-                if items:
-                    self.tree.focus(items[0])
-                    self.tree.selection_set(items[0])
-                    self.highlight_current_row()
-                return "break"
-            
-            # Get previous item
-            prev_item = self.tree.prev(current_item)
-            if prev_item:
-                self.tree.focus(prev_item)
-                self.tree.selection_set(prev_item)
-                self.tree.see(prev_item)
-                self.highlight_current_row()
-            
-            return "break"  # Prevent default behavior
-        except:
-            return "break"
 
-    def on_arrow_down(self, event):
-        """Handle Down arrow key - move to next row"""
-        try:
-            current_item = self.tree.focus()
-            if not current_item:
-                # Select first item if nothing selected
-                items = self.tree.get_children()
-                if items:
-                    self.tree.focus(items[0])
-                    self.tree.selection_set(items[0])
-                    self.highlight_current_row()
-                return "break"
-            
-            # Get next item
-            next_item = self.tree.next(current_item)
-            if next_item:
-                self.tree.focus(next_item)
-                self.tree.selection_set(next_item)
-                self.tree.see(next_item)
-                self.highlight_current_row()
-            
-            return "break"  # Prevent default behavior
-        except:
-            return "break"
+    def _format_row(self, index, values):
+        checked = self.row_keys[index] in self.previously_selected
+        return ("☑" if checked else "☐",) + tuple(values[1:])
+
+    def _toggle_row(self, index):
+        """Flip the checkbox of table row index"""
+        cid_key = self.row_keys[index] if index is not None and index < len(self.row_keys) else None
+        if not cid_key:
+            return
+        if cid_key in self.previously_selected:
+            self.previously_selected.discard(cid_key)
+            self.shown_selected -= 1
+        else:
+            self.previously_selected.add(cid_key)
+            self.shown_selected += 1
+        self.tree.refresh_row(index)
+        self.update_selected_count()
 
     def on_space_toggle(self, event):
         """Handle Space/Enter key - toggle checkbox for current row"""
         try:
-            current_item = self.tree.focus()
-            if not current_item:
-                return "break"
-            
-            # Get CID from tree_iid_to_key mapping
-            cid_key = self.tree_iid_to_key.get(current_item)
-            if not cid_key:
-                # Fallback to values
-                vals = self.tree.item(current_item).get('values', [])
-                cid_key = str(vals[2]) if len(vals) >= 3 else None
-            
-            if cid_key and cid_key in self.checkboxes:
-                # Toggle checkbox
-                current = self.checkboxes[cid_key]['var'].get()
-                self.checkboxes[cid_key]['var'].set(not current)
-                if not current:
-                    self.previously_selected.add(cid_key)
-                else:
-                    self.previously_selected.discard(cid_key)
-                self.update_checkbox_display()
-                self.update_selected_count()
-            
+            self._toggle_row(self.tree.current())
             return "break"
         except:
             return "break"
 
-    def highlight_current_row(self):
-        """Apply highlight to currently focused row"""
-        try:
-            # Remove highlight from all rows
-            for item in self.tree.get_children():
-                current_tags = list(self.tree.item(item, 'tags'))
-                # Remove highlight tag if present
-                if 'highlight' in current_tags:
-                    current_tags.remove('highlight')
-                self.tree.item(item, tags=current_tags)
-            
-            # Add highlight to focused row
-            current_item = self.tree.focus()
-            if current_item:
-                current_tags = list(self.tree.item(current_item, 'tags'))
-                if 'highlight' not in current_tags:
-                    current_tags.append('highlight')
-                self.tree.item(current_item, tags=tuple(current_tags))
-        except:
-            pass
-
     def update_checkbox_display(self):
-        """Refresh first-column checkbox icons based on internal boolean vars."""
-        for iid, cid_key in self.tree_iid_to_key.items():
-            cb = self.checkboxes.get(cid_key)
-            if not cb:
-                continue
-            current_icon = "☑" if cb['var'].get() else "☐"
-            vals = list(self.tree.item(iid, 'values'))
-            if not vals:
-                continue
-            vals[0] = current_icon
-            self.tree.item(iid, values=vals)
+        """Redraw the checkbox icons; only the rows on screen are touched."""
+        self.tree.refresh()
+
+    def selected_customers(self):
+        """Ticked customers among the rows shown, in table order"""
+        return [self.row_data[k] for k in self.row_data if k in self.previously_selected]
 
     def update_selected_count(self):
-        selected = sum(1 for cb in self.checkboxes.values() if cb['var'].get())
-        total = len(self.checkboxes)
+        selected = self.shown_selected
+        total = len(self.row_data)
         try:
             self.lbl_selected.configure(text=f"Selected: {selected}/{total} customers")
         except:
             pass
-        est_minutes = max(1, (selected * 9) // 60)
+        est_minutes = self.estimated_minutes(selected)
         try:
             self.lbl_estimate.configure(text=f"Estimated Time: ~{est_minutes} minutes")
         except:
@@ -723,23 +644,10 @@ class MessageTab(ctk.CTkFrame):
         region = self.tree.identify_region(event.x, event.y)
         if region != "cell":
             return
-        item = self.tree.identify_row(event.y)
+        index = self.tree.index_at(event.y)
         col = self.tree.identify_column(event.x)
-        if item and col == "#1":
-            cid_key = self.tree_iid_to_key.get(item)
-            # fallback to CID cell if mapping missing
-            if not cid_key:
-                vals = self.tree.item(item).get('values', [])
-                cid_key = str(vals[2]) if len(vals) >= 3 else None
-            if cid_key and cid_key in self.checkboxes:
-                current = self.checkboxes[cid_key]['var'].get()
-                self.checkboxes[cid_key]['var'].set(not current)
-                if not current:
-                    self.previously_selected.add(cid_key)
-                else:
-                    self.previously_selected.discard(cid_key)
-                self.update_checkbox_display()
-                self.update_selected_count()
+        if index is not None and col == "#1":
+            self._toggle_row(index)
 
     def on_mouse_wheel(self, event):
         """Handle touchpad and mouse wheel scroll events safely."""
@@ -761,50 +669,127 @@ class MessageTab(ctk.CTkFrame):
             return
 
     def toggle_select_all(self):
-        select_state = self.select_all_var.get()
-        for cid_key, obj in self.checkboxes.items():
-            try:
-                obj['var'].set(select_state)
-                if select_state:
-                    self.previously_selected.add(cid_key)
-                else:
-                    self.previously_selected.discard(cid_key)
-            except:
-                continue
+        if self.select_all_var.get():
+            self.previously_selected.update(self.row_data)
+            self.shown_selected = len(self.row_data)
+        else:
+            self.previously_selected.difference_update(self.row_data)
+            self.shown_selected = 0
         self.update_checkbox_display()
         self.update_selected_count()
 
     # ---------------------------
     # Search & clear
     # ---------------------------
-    def search_customers(self):
-        search_term = self.ent_search.get().strip().lower()
+    def _row_values(self, idx, customer):
+        # safe numeric parsing
+        total_ltr = customer.get('Total_Ltr', customer.get('total_ltr', 0) or 0)
+        total_amt = customer.get('Total_Amt', customer.get('total_amt', 0) or 0)
+        try:
+            total_ltr_f = float(total_ltr)
+        except:
+            total_ltr_f = 0.0
+        try:
+            total_amt_f = float(total_amt)
+        except:
+            total_amt_f = 0.0
+
+        return (
+            "",  # checkbox, drawn by _format_row
+            customer.get('sno', idx+1),
+            customer.get('CID') or customer.get('cid') or "",
+            customer.get('Name', customer.get('name', '')),
+            customer.get('Phone', customer.get('phone', '')),
+            customer.get('address', ''),
+            f"{total_ltr_f:.2f}",
+            f"₹{total_amt_f:.2f}"
+        )
 
-        if not search_term:
-            self.search_mode = False
+    def on_sheet_change(self, event):
+        """Update totals/contacts of the open month in place, keeping the selection"""
+        if not self.selected_month:
+            return
+        if event.kind != "customers" and (event.year, event.month) != (self.selected_year, self.selected_month):
+            return
+        self._month_dirty = True
+        if self.is_sending or self.views.current != "customers" or not self.winfo_ismapped():
+            # Re-read when the table is next shown (apply_missed_changes, show_customer_table)
+            return
+        self._refresh_month_in_place()
+
+    def apply_missed_changes(self):
+        """Catch up with sheet changes that came while the table was hidden or a batch was sending"""
+        try:
+            if (self._month_dirty and self.selected_month and not self.is_sending
+                    and self.views.current == "customers"):
+                self._refresh_month_in_place()
+        except Exception as e:
+            print(f"Auto refresh failed: {e}")
+
+    def _reload_month_data(self):
+        """Re-read the open month into customer_data; False if it could not be read"""
+        monthly_path = os.path.join(self.monthly_sheets_path, f"{self.selected_year}_{self.selected_month:02d}.xlsx")
+        if not os.path.exists(monthly_path):
+            return False
+        try:
+            self.customer_data = self._read_customer_data(monthly_path)
+        except Exception as e:
+            print(f"Auto refresh failed: {e}")
+            return False
+        self._index_customers()
+        self._month_dirty = False
+        return True
+
+    def _refresh_month_in_place(self):
+        if not self._reload_month_data():
+            return
+
+        by_key = {str(c.get('CID', '')).strip(): c for c in self.customer_data}
+        if not self.search_mode and set(by_key) != set(self.row_data):
+            # Customers added or removed: rebuild, previously_selected keeps ticks
             self.populate_table()
-            self._focus_first_row()
             return
 
-        filtered = [
-            c for c in self.customer_data
-            if search_term in str(c.get('CID', c.get('cid', ''))).lower()
-            or search_term in str(c.get('Name', c.get('name', ''))).lower()
-            or search_term in str(c.get('Phone', c.get('phone', ''))).lower()
-            or search_term in str(c.get('address', '')).lower()
-        ]
+        rows = self.tree.rows
+        for idx, cid_key in enumerate(self.row_keys):
+            customer = by_key.get(cid_key)
+            if customer is None or cid_key not in self.row_data:
+                continue
+            self.row_data[cid_key] = customer
+            rows[idx] = self._row_values(idx, customer)
+        # Keeps scroll position and current row; only the rows on screen are redrawn
+        self.tree.refresh()
+
+    def _index_customers(self):
+        """Bring the search index up to date with customer_data"""
+        self.customer_keys = record_keys(self.customer_data)
+        # Only rows whose CID/name/phone/address changed are re-indexed
+        self.search_index.sync(zip(self.customer_keys, self.customer_data))
 
-        if filtered:
+    def search_customers(self):
+        self.live_search.run(explicit=True)
+
+    def _on_search(self, query, keys, explicit):
+        if keys is None:
+            self.search_mode = False
+            self.populate_table()
+        elif keys or not explicit:
             self.search_mode = True
-            self.populate_table(filtered)
-            self._focus_first_row()
+            self.populate_table([c for k, c in zip(self.customer_keys, self.customer_data) if k in keys])
         else:
             messagebox.showinfo(
                 "No Results",
-                f"No customers found matching '{search_term}'",
+                f"No customers found matching '{query}'",
                 parent=self
             )
             self.search_mode = False
+            return
+
+        if explicit:
+            self._focus_first_row()
+        elif self.tree.row_count():
+            # Typing: keep focus in the search box
+            self.tree.set_current(0)
 
 
     def clear_search(self):
@@ -813,6 +798,7 @@ class MessageTab(ctk.CTkFrame):
         except:
             pass
 
+        self.live_search.reset()
         self.search_mode = False
         self.populate_table()
         self._focus_first_row()
@@ -820,13 +806,7 @@ class MessageTab(ctk.CTkFrame):
 
     def _focus_first_row(self):
         try:
-            self.tree.focus_set()
-            items = self.tree.get_children()
-            if items:
-                self.tree.focus(items[0])
-                self.tree.selection_set(items[0])
-                self.tree.see(items[0])
-                self.highlight_current_row()
+            self.tree.focus_first()
         except:
             pass
 
@@ -863,10 +843,31 @@ class MessageTab(ctk.CTkFrame):
                       hover_color="#d97706", command=show_unsent).pack(pady=10)
 
     def show_sent_messages(self):
-        for widget in self.winfo_children():
-            widget.destroy()
+        self.views.show("sent", self._build_sent_page)
+        self.lbl_sent_total.configure(text=f"Total Sent: {len(self.sent_list)}")
 
-        header = ctk.CTkFrame(self, fg_color=self.colors["success"], height=80)
+        if not self.sent_list:
+            self.sent_table.pack_forget()
+            self.lbl_no_sent.pack(pady=50)
+            return
+        self.lbl_no_sent.pack_forget()
+        self.sent_table.pack(fill="both", expand=True)
+
+        tree = self.sent_tree
+        tree.delete(*tree.get_children())
+        for idx, cust in enumerate(self.sent_list):
+            tag = "oddrow" if idx % 2 else "evenrow"
+            vals = (
+                cust.get('CID', cust.get('cid', '')),
+                cust.get('Name', cust.get('name', '')),
+                cust.get('Phone', cust.get('phone', '')),
+                f"{float(cust.get('Total_Ltr', 0)):.2f}",
+                f"₹{float(cust.get('Total_Amt', 0)):.2f}"
+            )
+            tree.insert("", "end", values=vals, tags=(tag,))
+
+    def _build_sent_page(self, view):
+        header = ctk.CTkFrame(view, fg_color=self.colors["success"], height=80)
         header.pack(fill="x")
         header.pack_propagate(False)
 
@@ -878,19 +879,18 @@ class MessageTab(ctk.CTkFrame):
         ctk.CTkLabel(header, text="✅ Successfully Sent Messages", font=ctk.CTkFont(size=32, weight="bold"),
                      text_color=self.colors["text_light"]).pack(side="left", padx=20)
 
-        content = ctk.CTkFrame(self, fg_color="transparent")
+        content = ctk.CTkFrame(view, fg_color="transparent")
         content.pack(fill="both", expand=True, padx=40, pady=20)
 
-        ctk.CTkLabel(content, text=f"Total Sent: {len(self.sent_list)}", font=ctk.CTkFont(size=24, weight="bold"),
-                     text_color=self.colors["success"]).pack(pady=20)
+        self.lbl_sent_total = ctk.CTkLabel(content, text="", font=ctk.CTkFont(size=24, weight="bold"),
+                                           text_color=self.colors["success"])
+        self.lbl_sent_total.pack(pady=20)
 
-        if not self.sent_list:
-            ctk.CTkLabel(content, text="No sent messages yet.", font=ctk.CTkFont(size=18),
-                         text_color="#6b7280").pack(pady=50)
-            return
+        # Packed by show_sent_messages(): either the empty note or the table
+        self.lbl_no_sent = ctk.CTkLabel(content, text="No sent messages yet.", font=ctk.CTkFont(size=18),
+                                        text_color="#6b7280")
 
-        table_container = ctk.CTkFrame(content, fg_color="transparent")
-        table_container.pack(fill="both", expand=True)
+        self.sent_table = table_container = ctk.CTkFrame(content, fg_color="transparent")
 
         style = ttk.Style()
         try:
@@ -919,17 +919,7 @@ class MessageTab(ctk.CTkFrame):
 
         tree.tag_configure("oddrow", background="#e0f2fe")
         tree.tag_configure("evenrow", background="#ffffff")
-
-        for idx, cust in enumerate(self.sent_list):
-            tag = "oddrow" if idx % 2 else "evenrow"
-            vals = (
-                cust.get('CID', cust.get('cid', '')),
-                cust.get('Name', cust.get('name', '')),
-                cust.get('Phone', cust.get('phone', '')),
-                f"{float(cust.get('Total_Ltr', 0)):.2f}",
-                f"₹{float(cust.get('Total_Amt', 0)):.2f}"
-            )
-            tree.insert("", "end", values=vals, tags=(tag,))
+        self.sent_tree = tree
 
     # ---------------------------
     # Unsent view + retry
@@ -951,10 +941,36 @@ class MessageTab(ctk.CTkFrame):
             self.show_customer_table()
             return
 
-        for widget in self.winfo_children():
-            widget.destroy()
+        self.views.show("unsent", self._build_unsent_page)
+        self.unsent_select_all_var.set(False)
+
+        # populate unsent_map to track selection
+        self.unsent_tree.delete(*self.unsent_tree.get_children())
+        self.unsent_checkboxes = {}
+        for idx, rec in enumerate(self.viewing_unsent_data):
+            cid_key = rec.get('CID', rec.get('cid', f"u_{idx}"))
+            var = ctk.BooleanVar(value=False)
+            self.unsent_checkboxes[cid_key] = {'var': var, 'data': rec}
+            tag = "oddrow" if idx % 2 else "evenrow"
+            reason = rec.get('Reason', '').strip()
 
-        header = ctk.CTkFrame(self, fg_color=self.colors["warning"], height=80)
+            if not reason:
+                reason_display = "Not selected"
+            elif "invalid" in reason.lower():
+                reason_display = "Invalid number"
+            elif "failed" in reason.lower():
+                reason_display = "Failed - retry"
+            else:
+                reason_display = reason
+
+            vals = ("☐", rec.get('CID', ''), rec.get('Name', ''), rec.get('Phone', ''), f"{float(rec.get('Total_Ltr', 0)):.2f}",
+                    f"₹{float(rec.get('Total_Amt', 0)):.2f}", reason_display)
+            self.unsent_tree.insert("", "end", values=vals, tags=(tag,))
+
+        self.update_unsent_selected_count()
+
+    def _build_unsent_page(self, view):
+        header = ctk.CTkFrame(view, fg_color=self.colors["warning"], height=80)
         header.pack(fill="x")
         header.pack_propagate(False)
 
@@ -967,7 +983,7 @@ class MessageTab(ctk.CTkFrame):
                      text_color=self.colors["text_light"]).pack(side="left", padx=20)
 
         # toolbar
-        toolbar = ctk.CTkFrame(self, fg_color=self.colors["secondary"], height=70)
+        toolbar = ctk.CTkFrame(view, fg_color=self.colors["secondary"], height=70)
         toolbar.pack(fill="x", padx=20, pady=(10, 5))
         toolbar.pack_propagate(False)
 
@@ -977,11 +993,11 @@ class MessageTab(ctk.CTkFrame):
                                   checkbox_width=25, checkbox_height=25)
         chk_all.pack(side="left", padx=20, pady=15)
 
-        self.unsent_lbl_selected = ctk.CTkLabel(toolbar, text=f"Selected: 0/{len(self.viewing_unsent_data)} customers",
+        self.unsent_lbl_selected = ctk.CTkLabel(toolbar, text="Selected: 0/0 customers",
                                                 font=ctk.CTkFont(size=16, weight="bold"), text_color=self.colors["text_dark"])
         self.unsent_lbl_selected.pack(side="right", padx=20)
 
-        frame_list = ctk.CTkFrame(self, fg_color=self.colors["text_light"])
+        frame_list = ctk.CTkFrame(view, fg_color=self.colors["text_light"])
         frame_list.pack(fill="both", expand=True, padx=25, pady=(0, 10))
 
         table_container = ctk.CTkFrame(frame_list, fg_color="transparent")
@@ -1016,34 +1032,12 @@ class MessageTab(ctk.CTkFrame):
         self.unsent_tree.tag_configure("oddrow", background="#e0f2fe")
         self.unsent_tree.tag_configure("evenrow", background="#ffffff")
 
-        # populate unsent_map to track selection
-        self.unsent_checkboxes = {}
-        for idx, rec in enumerate(self.viewing_unsent_data):
-            cid_key = rec.get('CID', rec.get('cid', f"u_{idx}"))
-            var = ctk.BooleanVar(value=False)
-            self.unsent_checkboxes[cid_key] = {'var': var, 'data': rec}
-            tag = "oddrow" if idx % 2 else "evenrow"
-            reason = rec.get('Reason', '').strip()
-
-            if not reason:
-                reason_display = "Not selected"
-            elif "invalid" in reason.lower():
-                reason_display = "Invalid number"
-            elif "failed" in reason.lower():
-                reason_display = "Failed - retry"
-            else:
-                reason_display = reason
-
-            vals = ("☐", rec.get('CID', ''), rec.get('Name', ''), rec.get('Phone', ''), f"{float(rec.get('Total_Ltr', 0)):.2f}",
-                    f"₹{float(rec.get('Total_Amt', 0)):.2f}", reason_display)
-            self.unsent_tree.insert("", "end", values=vals, tags=(tag,))
-
         self.unsent_tree.bind("<Button-1>", self.on_unsent_tree_click)
         self.unsent_tree.bind("<MouseWheel>", self.on_mouse_wheel)
         self.unsent_tree.bind("<Button-4>", self.on_mouse_wheel)
         self.unsent_tree.bind("<Button-5>", self.on_mouse_wheel)
 
-        bottom_frame = ctk.CTkFrame(self, fg_color="transparent", height=80)
+        bottom_frame = ctk.CTkFrame(view, fg_color="transparent", height=80)
         bottom_frame.pack(fill="x", padx=20, pady=(5, 15))
         bottom_frame.pack_propagate(False)
 
@@ -1092,7 +1086,7 @@ class MessageTab(ctk.CTkFrame):
         total = len(self.unsent_checkboxes)
         try:
             self.unsent_lbl_selected.configure(text=f"Selected: {selected}/{total} customers")
-            est_minutes = max(1, (selected * 9) // 60)
+            est_minutes = self.estimated_minutes(selected)
             self.unsent_lbl_estimate.configure(text=f"Estimated Time: ~{est_minutes} minutes")
         except:
             pass
@@ -1223,94 +1217,60 @@ class MessageTab(ctk.CTkFrame):
         except Exception as e:
             print(f"Error saving sent list: {e}")
 
-    def init_selenium(self):
-        """Initialize Selenium with auto-updating Chrome driver"""
-        try:
-            import undetected_chromedriver as uc
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-            from selenium.webdriver.common.keys import Keys
-
-            self.By = By
-            self.WebDriverWait = WebDriverWait
-            self.EC = EC
-            self.Keys = Keys
-
-            # Check if driver already exists and is working
-            if hasattr(self, "driver") and self.driver:
-                try:
-                    _ = self.driver.current_url
-                    return True
-                except:
-                    try: 
-                        self.driver.quit()
-                    except: 
-                        pass
-                    self.driver = None
-
-            # Chrome options for stability
-            options = uc.ChromeOptions()
-            options.add_argument("--start-maximized")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--no-sandbox")
-            
-            # Create driver with auto-update (undetected-chromedriver handles version matching)
-            try:
-                self.driver = uc.Chrome(options=options, version_main=None)  # Auto-detect Chrome version
-            except Exception as e:
-                # Fallback: Force update
-                messagebox.showwarning(
+    def session_profile(self, session):
+        """Chrome profile folder of a sending session; keeps its WhatsApp login"""
+        profile = Path(self.status_folder) / "WhatsApp Sessions" / f"Session {session + 1}"
+        profile.mkdir(parents=True, exist_ok=True)
+        return profile
+
+    def _make_transport(self, session):
+        link_hint = (
+            "\n\nLink it as another device of the same phone:\n"
+            "WhatsApp → Linked devices → Link a device." if session else ""
+        )
+        return WhatsAppWebTransport(
+            # Switch chats inside the loaded app; reload per number only when that fails
+            mode="in-page",
+            make_driver=lambda: chrome_driver(
+                profile_dir=self.session_profile(session),
+                on_retry=lambda: messagebox.showwarning(
                     "Chrome Driver Update",
                     "Updating Chrome driver to match your Chrome version...\nThis may take a moment.",
                     parent=self
-                )
-                self.driver = uc.Chrome(options=options, version_main=None, driver_executable_path=None)
-            
-            self.driver.maximize_window()
-            self.driver.get("https://web.whatsapp.com")
-            
+                )),
             # Wait for user login
-            messagebox.showinfo(
-                "WhatsApp Login Required", 
-                "Please scan the QR code in Chrome to login.\n\n"
+            on_login=lambda: messagebox.showinfo(
+                "WhatsApp Login Required",
+                f"Please scan the QR code in Chrome window {session + 1} to login.{link_hint}\n\n"
                 "Click OK ONLY after chats are loaded.",
                 parent=self
-            )
-            
-            wait = self.WebDriverWait(self.driver, 120)
-            
-            # Multiple selectors for chat panel (future-proof)
-            chat_panel_selectors = [
-                "//div[@id='pane-side']",
-                "//div[@id='side']",
-                "//div[@role='grid']",
-                "//div[contains(@class, 'chat-list')]"
-            ]
-            
-            login_success = False
-            for selector in chat_panel_selectors:
-                try:
-                    wait.until(self.EC.presence_of_element_located((self.By.XPATH, selector)))
-                    login_success = True
-                    break
-                except:
-                    continue
-            
-            if not login_success:
-                raise Exception("Could not detect WhatsApp login")
-            
-            time.sleep(2)
-            
-            messagebox.showinfo(
-                "Login Successful", 
-                "WhatsApp is ready! Messages will now be sent.",
-                parent=self
-            )
-            return True
-            
-        except Exception as e:
+            ),
+        )
+
+    def init_transports(self, count):
+        """Open count sending sessions (Chrome + WhatsApp Web login by default).
+
+        Returns the indexes of the sessions that are ready; sending goes on
+        with those if some fail to log in.
+        """
+        ready = []
+        logged_in = False
+        for session in range(count):
+            try:
+                if session == len(self.transports):
+                    self.transports.append(self._make_transport(session))
+                    self.pacers.append(AdaptivePacer())
+                transport = self.transports[session]
+
+                # Transport already open and working
+                if not transport.is_open():
+                    transport.open()
+                    logged_in = True
+                ready.append(session)
+            except Exception as e:
+                print(f"Transport init failed (session {session + 1}): {e}")
+
+        if not ready:
             self._ui_safe(lambda: messagebox.showerror(
             "WhatsApp Login Failed",
             "Could not detect WhatsApp Web login.\n\n"
@@ -1321,17 +1281,24 @@ class MessageTab(ctk.CTkFrame):
             "Then try again.",
             parent=self
             ))
-            return False
-
+            return ready
+
+        # This runs on the send thread; dialogs belong to the Tk thread
+        if len(ready) < count:
+            self._ui_safe(lambda: messagebox.showwarning(
+                "Some Windows Not Ready",
+                f"Only {len(ready)} of {count} Chrome windows logged in to WhatsApp.\n"
+                f"Sending with {len(ready)}.",
+                parent=self
+            ))
+        elif logged_in:
+            self._ui_safe(lambda: messagebox.showinfo(
+                "Login Successful",
+                "WhatsApp is ready! Messages will now be sent.",
+                parent=self
+            ))
+        return ready
 
-            try:
-                if self.driver:
-                    self.driver.quit()
-            except:
-                pass
-            self.driver = None
-            return False
-    
     def _ui_safe(self, func):
         """Safely execute UI code from worker threads"""
         try:
@@ -1360,14 +1327,14 @@ class MessageTab(ctk.CTkFrame):
             messagebox.showerror("No Internet", "Check your Internet", parent=self)
             return
 
-        selected_customers = [cb['data'] for cb in self.checkboxes.values() if cb['var'].get()]
+        selected_customers = self.selected_customers()
         if not selected_customers:
             messagebox.showwarning("No Selection", "Please select at least one customer.", parent=self)
             return
 
         confirm = messagebox.askyesno("Confirm Send",
                                     f"📱 Send WhatsApp messages to {len(selected_customers)} customers?\n\n"
-                                    f"⏱️ Estimated time: {max(1, (len(selected_customers) * 9) // 60)} minutes\n\n"
+                                    f"⏱️ Estimated time: {self.estimated_minutes(len(selected_customers))} minutes\n\n"
                                     "⚠️ Do NOT close the Chrome window during sending", parent=self)
         if not confirm:
             return
@@ -1399,9 +1366,12 @@ class MessageTab(ctk.CTkFrame):
         self.pause_requested = True
 
     def send_messages_thread(self, selected_customers, is_retry=False):
+        # Track successful sends in this session
+        session = {"sent": 0, "failed": 0}
         try:
-            # Initialize Selenium and wait for user to login
-            if not self.init_selenium():
+            # Open the sessions and wait for user to login
+            sessions = self.init_transports(self.session_count)
+            if not sessions:
                 self.after(0, lambda: messagebox.showerror(
                     "Initialization Failed",
                     "Could not initialize WhatsApp. Sending cancelled.",
@@ -1419,63 +1389,61 @@ class MessageTab(ctk.CTkFrame):
             self.after(0, lambda: self.create_progress_window(total))
             time.sleep(0.5)
 
-            # Load existing sent list and track starting count
+            # Load existing sent list
             self.load_sent_list()
-            sent_count_before = len(self.sent_list)
-
-            # Track successful sends in this session
-            session_sent_count = 0
-            session_failed_count = 0
-
-            for idx, cust in enumerate(selected_customers):
 
-                if not self.is_sending or self.pause_requested:
-                    break
+            transports = [self.transports[i] for i in sessions]
 
-                while getattr(self, "is_paused", False):
-                    time.sleep(0.25)
-
-                self.after(
-                    0,
-                    lambda i=idx+1, t=total, c=cust:
-                        self.update_progress_safe(i, t, c.get("Name",""))
-                )
-
-                phone = self.format_phone_number(cust.get("Phone"))
-                if not phone:
-                    self.failed_list.append({**cust, "Reason": "Invalid number"})
-                    session_failed_count += 1
-                    continue
+            # send_parallel never runs these at the same time, so the lists need no lock
+            def on_progress(position, total, cust, worker):
+                self.after(0, lambda: self.update_progress_safe(position, total, cust.get("Name", "")))
 
+            def on_sent(cust, worker):
+                # Successfully sent - add to sent_list
+                self.append_to_sent_list(cust)
+                session["sent"] += 1
+                self.after(0, lambda: self.update_latency_safe(transports, worker, sessions[worker] + 1))
 
-                msg = self.create_message(cust)
-                pyperclip.copy(msg)
-                time.sleep(0.3)
+            def on_failed(cust, reason, worker):
+                self.failed_list.append({**cust, "Reason": reason})
+                session["failed"] += 1
 
-                try:
-                    self.send_whatsapp_message(phone, msg)
-                    # Successfully sent - add to sent_list
-                    self.append_to_sent_list(cust)
-                    session_sent_count += 1
-                    time.sleep(5)  # Delay only after successful send
-                except Exception as e:
-                    error_msg = str(e)
-                    self.failed_list.append({**cust, "Reason": error_msg})
-                    session_failed_count += 1
-
-                    # Quick skip for invalid numbers (no long delay)
-                    if "invalid" in error_msg.lower() or "not load" in error_msg.lower():
-                        time.sleep(0.5)  # Minimal delay for invalid numbers
-                    else:
-                        time.sleep(1)  # Short delay for other errors
-                    continue
+            jobs = [
+                (cust, self.format_phone_number(cust.get("Phone")), self.create_message(cust))
+                for cust in selected_customers
+            ]
+            started = time.perf_counter()
+            _, _, per_session = send_parallel(
+                transports, jobs,
+                on_progress=on_progress,
+                on_sent=on_sent,
+                on_failed=on_failed,
+                # Pause holds every session; only stopping ends the batch
+                should_stop=lambda: not self.is_sending,
+                is_paused=lambda: getattr(self, "is_paused", False),
+                pacers=[self.pacers[i] for i in sessions],
+            )
+            processed = session["sent"] + session["failed"]
+            if processed >= 5:
+                # Estimates in the UI follow the measured pace
+                self.seconds_per_message = (time.perf_counter() - started) * len(transports) / processed
+
+            lost = [f"{i + 1}" for i, counts in zip(sessions, per_session) if counts["left"]]
+            if lost:
+                print(f"Sending sessions stopped early: {[c['left'] for c in per_session if c['left']]}")
+                self._ui_safe(lambda: messagebox.showwarning(
+                    "Chrome Window Closed",
+                    f"Chrome window {', '.join(lost)} stopped working during sending.\n"
+                    "Its customers were handed to the other windows.",
+                    parent=self
+                ))
 
             # Save both lists
             self.save_sent_list()
             self.save_unsent_list()
             
             # Pass session counts to finalize (not cumulative totals)
-            self.after(0, lambda: self.finalize_sending(session_sent_count, session_failed_count))
+            self.after(0, lambda: self.finalize_sending(session["sent"], session["failed"]))
 
         except Exception as e:
             self._ui_safe(lambda e=str(e): messagebox.showerror(
@@ -1485,123 +1453,12 @@ class MessageTab(ctk.CTkFrame):
             ))
 
             # Still show what was processed before error
-            if hasattr(self, 'failed_list'):
-                session_failed = len(self.failed_list)
-            else:
-                session_failed = 0
-            self.after(0, lambda: self.finalize_sending(session_sent_count if 'session_sent_count' in locals() else 0, session_failed))
+            self.after(0, lambda: self.finalize_sending(session["sent"], session["failed"]))
         finally:
             self.is_sending = False
             self.send_thread = None
             self._ui_safe(lambda: self.reset_send_button(is_retry))
 
-
-
-    def send_whatsapp_message(self, phone, message):
-        
-        if not self.driver:
-            raise Exception("Driver not initialized")
-
-        try:
-            # ========== STEP 1: NAVIGATE ==========
-            self.driver.get(f"https://web.whatsapp.com/send?phone={phone}")
-            time.sleep(2)  # Reduced from 4
-            
-            # ========== STEP 2: QUICK INVALID CHECK (3 seconds max) ==========
-            check_start = time.time()
-            while time.time() - check_start < 3:
-                try:
-                    page_text = self.driver.find_element(self.By.TAG_NAME, "body").text.lower()
-                    if "invalid" in page_text or "not on whatsapp" in page_text:
-                        raise Exception("Invalid phone number")
-                    
-                    # If footer exists, break immediately
-                    if self.driver.find_elements(self.By.XPATH, "//footer"):
-                        break
-                        
-                    time.sleep(0.2)
-                except:
-                    break  # Don't waste time on errors
-            
-            # ========== STEP 3: FIND INPUT BOX (10 seconds max) ==========
-            input_box = None
-            wait_start = time.time()
-            
-            while time.time() - wait_start < 10:
-                try:
-                    # Try multiple selectors quickly
-                    for selector in [
-                        "//div[@contenteditable='true'][@data-tab='10']",
-                        "//footer//div[@contenteditable='true']",
-                        "//div[@role='textbox']"
-                    ]:
-                        elements = self.driver.find_elements(self.By.XPATH, selector)
-                        if elements and elements[0].is_displayed():
-                            input_box = elements[0]
-                            break
-                    
-                    if input_box:
-                        break
-                    
-                    time.sleep(0.3)
-                except:
-                    time.sleep(0.3)
-            
-            if not input_box:
-                raise Exception("Input not found")
-            
-            # ========== STEP 4: PASTE & SEND (Fast) ==========
-            input_box.click()
-            time.sleep(0.5)
-            
-            # Paste
-            pyperclip.copy(message)
-            time.sleep(0.2)
-            input_box.send_keys(self.Keys.CONTROL, "v")
-            time.sleep(0.8)
-            
-            # Send immediately
-            try:
-                # Try send button first
-                send_btn = self.driver.find_element(self.By.XPATH, "//button[@aria-label='Send']")
-                send_btn.click()
-            except:
-                # Fallback: Enter key
-                input_box.send_keys(self.Keys.ENTER)
-            
-            time.sleep(1)
-            
-            # ========== STEP 5: QUICK VERIFICATION (5 seconds max) ==========
-            verify_start = time.time()
-            
-            while time.time() - verify_start < 5:
-                try:
-                    # Just check if ANY tick exists
-                    ticks = self.driver.find_elements(self.By.XPATH, "//span[@data-icon='msg-check']")
-                    if ticks:
-                        return True  # Success!
-                    
-                    # Or check if input cleared
-                    if len(input_box.text) < 10:
-                        return True  # Likely sent
-                    
-                    time.sleep(0.3)
-                except:
-                    break
-            
-            # If 5 seconds passed without error, assume success
-            return True
-                
-        except Exception as e:
-            error_msg = str(e).lower()
-            
-            # Invalid number - fail fast
-            if "invalid" in error_msg or "not on whatsapp" in error_msg:
-                raise Exception("Invalid phone number")
-            
-            # Other errors
-            raise Exception(f"Failed: {e}")
-    
     def show_range_selector(self):
         """Show range selection dialog with visible buttons"""
         dialog = ctk.CTkToplevel(self)
@@ -1699,19 +1556,15 @@ class MessageTab(ctk.CTkFrame):
                     return
                 
                 # Clear all selections
-                for cb in self.checkboxes.values():
-                    cb['var'].set(False)
                 self.previously_selected.clear()
                 
                 # Select range (S.No is 1-indexed)
-                for iid, cid_key in self.tree_iid_to_key.items():
-                    vals = self.tree.item(iid).get('values', [])
+                for vals, cid_key in zip(self.tree.rows, self.row_keys):
                     if vals:
                         sno = int(vals[1])  # S.No column
                         if from_val <= sno <= to_val:
-                            if cid_key in self.checkboxes:
-                                self.checkboxes[cid_key]['var'].set(True)
-                                self.previously_selected.add(cid_key)
+                            self.previously_selected.add(cid_key)
+                self.shown_selected = len(self.previously_selected)
                 
                 self.update_checkbox_display()
                 self.update_selected_count()
@@ -1775,7 +1628,7 @@ class MessageTab(ctk.CTkFrame):
 
         self.progress_window = ctk.CTkToplevel(self)
         self.progress_window.title("Sending Messages")
-        self.progress_window.geometry("600x300")
+        self.progress_window.geometry("600x340")
         self.progress_window.transient(self)
         self.progress_window.grab_set()
 
@@ -1800,6 +1653,9 @@ class MessageTab(ctk.CTkFrame):
         self.progress_label = ctk.CTkLabel(self.progress_window, text="Preparing...", font=("Arial", 14))
         self.progress_label.pack(pady=5)
 
+        self.latency_label = ctk.CTkLabel(self.progress_window, text="", font=("Arial", 12), text_color="#6b7280")
+        self.latency_label.pack(pady=2)
+
         self.progress_bar = ctk.CTkProgressBar(self.progress_window, width=500)
         self.progress_bar.pack(pady=10)
         self.progress_bar.set(0)
@@ -1819,6 +1675,24 @@ class MessageTab(ctk.CTkFrame):
             except:
                 pass
 
+    def update_latency_safe(self, transports, worker, window):
+        """Show how long the last message took and the average of each send mode"""
+        names = {"in-page": "in-page switch", "url": "page reload"}
+        last = getattr(transports[worker], "last_latency", None)
+        if not last or not (hasattr(self, 'progress_window') and self.progress_window.winfo_exists()):
+            return
+        mode, seconds = last
+        averages = " · ".join(
+            f"{names.get(m, m)}: {avg:.1f}s × {count}" for m, (count, avg) in combined_latencies(transports).items()
+        )
+        window = f", window {window}" if len(transports) > 1 else ""
+        try:
+            self.latency_label.configure(
+                text=f"Last message: {seconds:.1f}s ({names.get(mode, mode)}{window})\n{averages}"
+            )
+        except:
+            pass
+
     def toggle_pause_resume(self):
         """Pause or resume sending."""
         if not hasattr(self, "is_paused"):
@@ -1902,6 +1776,8 @@ class MessageTab(ctk.CTkFrame):
         self.is_sending = False
         self.is_paused = False
         self.pause_requested = False
+        # Sheets saved during the batch
+        self.apply_missed_changes()
         try:
             if is_retry and hasattr(self, 'unsent_btn_send'):
                 if self.unsent_btn_send.winfo_exists():
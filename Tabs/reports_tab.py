@@ -2,11 +2,21 @@ import os
 import datetime
 import pandas as pd
 import customtkinter as ctk
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, messagebox, filedialog, TclError
 import calendar
-from openpyxl import load_workbook
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 import urllib.parse
+from customer_store import get_customer_repository
+from history_index import get_history_index
+from sheet_watcher import get_sheet_watcher
+from background_jobs import run_job
+from virtual_table import VirtualTable
+from search_index import LiveSearch, SearchIndex, record_keys
+from view_manager import ViewManager
+from month_sheets import (
+    bill_month, close_month, is_month_closed, load_month_summaries, month_cache, parse_month_filename,
+    reopen_month
+)
 
 
 class ReportTab(ctk.CTkFrame):
@@ -23,6 +33,11 @@ class ReportTab(ctk.CTkFrame):
         
         self.monthly_sheets_path = str(app_config.monthly_sheets_path)
         self.customers_file = str(app_config.customers_file)
+        self.repo = get_customer_repository()
+        self.history_index = get_history_index()
+        get_sheet_watcher().subscribe(self.on_sheet_change)
+        # Changes that came while the tab was hidden, applied when it is shown again
+        self._missed_changes = {}
         
         self.current_year = datetime.date.today().year
         self.month_names = [
@@ -32,9 +47,18 @@ class ReportTab(ctk.CTkFrame):
         
         self.all_customers = []
         self.report_data = []
+        self.report_keys = []
+        self.search_index = SearchIndex()
         self.selected_month = None
         self.selected_year = None
         self.view_mode = "menu"
+        self._job = None
+        self._loading_active = False
+        # Each screen is built once and re-shown; these widgets belong to the screen that set them
+        self.views = ViewManager(self, attrs=(
+            "tree", "ent_search", "live_search", "lbl_status", "lbl_view_title", "lbl_totals_title",
+            "lbl_period_liters", "lbl_period_amount", "btn_close_month", "year_var",
+        ))
         
         # UPDATED: Get business info from config
         self.business_name = app_config.get_business_name()
@@ -55,13 +79,13 @@ class ReportTab(ctk.CTkFrame):
     def init_menu_ui(self):
         """Show main menu with options"""
 
-        for widget in self.winfo_children():
-            widget.destroy()
-
+        self._cancel_job()
         self.view_mode = "menu"
+        self.views.show("menu", self._build_menu_page)
 
+    def _build_menu_page(self, view):
         # ================= HEADER =================
-        header = ctk.CTkFrame(self, fg_color=self.colors["primary"], height=80)
+        header = ctk.CTkFrame(view, fg_color=self.colors["primary"], height=80)
         header.pack(fill="x")
         header.pack_propagate(False)
 
@@ -86,7 +110,7 @@ class ReportTab(ctk.CTkFrame):
         ).pack(side="left", padx=20)
 
         # ================= CONTENT =================
-        content = ctk.CTkFrame(self, fg_color="transparent")
+        content = ctk.CTkFrame(view, fg_color="transparent")
         content.pack(fill="both", expand=True, padx=40, pady=40)
 
         ctk.CTkLabel(
@@ -196,41 +220,28 @@ class ReportTab(ctk.CTkFrame):
    
     def _focus_first_row(self):
         try:
-            self.tree.focus_set()
-            items = self.tree.get_children()
-            if items:
-                self.tree.focus(items[0])
-                self.tree.selection_set(items[0])
-                self.tree.see(items[0])
+            self.tree.focus_first()
         except:
             pass
     
     def load_customers(self):
         try:
-            self.tree.delete(*self.tree.get_children())
+            self.tree.set_rows([])
 
-            df = pd.read_excel(self.excel_file, engine="openpyxl")
+            df = self.repo.active()
             if df.empty:
                 return
 
             df = df.astype(str)
 
-            for idx, row in enumerate(df.itertuples(index=False), start=1):
-                tag = "oddrow" if idx % 2 else "evenrow"
-                self.tree.insert(
-                    "",
-                    "end",
-                    values=(idx, row.CID, row.Name, row.Phone, row.Address),
-                    tags=(tag,)
-                )
+            self.tree.set_rows(
+                [(idx, row.CID, row.Name, row.Phone, row.Address)
+                 for idx, row in enumerate(df.itertuples(index=False), start=1)],
+                self._row_tags(len(df)),
+            )
 
             # Focus first row for keyboard navigation
-            items = self.tree.get_children()
-            if items:
-                self.tree.focus_set()
-                self.tree.focus(items[0])
-                self.tree.selection_set(items[0])
-                self.tree.see(items[0])
+            self.tree.focus_first()
 
         except Exception as e:
             messagebox.showerror("Load Error", str(e), parent=self)
@@ -240,11 +251,13 @@ class ReportTab(ctk.CTkFrame):
 
     def show_month_selection(self):
         """Show month selection screen"""
-        for widget in self.winfo_children():
-            widget.destroy()
-        
+        self._cancel_job()
+        self.view_mode = "month_selection"
+        self.views.show("month_selection", self._build_month_selection_page)
+
+    def _build_month_selection_page(self, view):
         # Header
-        header = ctk.CTkFrame(self, fg_color=self.colors["primary"], height=80)
+        header = ctk.CTkFrame(view, fg_color=self.colors["primary"], height=80)
         header.pack(fill="x")
         header.pack_propagate(False)
         
@@ -271,7 +284,7 @@ class ReportTab(ctk.CTkFrame):
         lbl_title.pack(side="left", padx=20)
         
         # Content
-        content = ctk.CTkFrame(self, fg_color="transparent")
+        content = ctk.CTkFrame(view, fg_color="transparent")
         content.pack(fill="both", expand=True, padx=40, pady=20)
         
         # Year selector
@@ -347,84 +360,158 @@ class ReportTab(ctk.CTkFrame):
             )
 
 
-    def get_all_customers_from_history(self):
-        """Get ALL customers including deleted ones by scanning monthly sheets
+    # ---------------------------
+    # Background loading
+    # ---------------------------
+    def _cancel_job(self):
+        """Drop the load in progress, if any; its results will never be shown"""
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+        self._hide_loading()
+
+    def _start_load(self, text, work, on_done, on_error, on_back):
+        """Show a progress page and run work(progress) off the Tk thread.
+
+        on_done(result)/on_error(exc) run on the Tk thread, unless the user
+        navigated away (any page change cancels the job) or pressed Cancel,
+        which goes to on_back.
+        """
+        self._cancel_job()
+        self.view_mode = "loading"
+        self._show_loading(text, on_back)
+
+        def done(result):
+            self._job = None
+            self._hide_loading()
+            on_done(result)
+
+        def failed(e):
+            self._job = None
+            self._hide_loading()
+            on_error(e)
+
+        self._job = run_job(self, work, done, failed, self._update_loading)
+
+    def _show_loading(self, text, on_back):
+        self.views.show("loading", self._build_loading_page)
+        self._loading_text = text
+        self._loading_label.configure(text=text)
+        self._loading_cancel.configure(command=on_back)
+        self._loading_bar.configure(mode="indeterminate")
+        self._loading_bar.start()
+        self._loading_active = True
+
+    def _build_loading_page(self, view):
+        frame = ctk.CTkFrame(view, fg_color="transparent")
+        frame.pack(expand=True)
+        self._loading_label = ctk.CTkLabel(frame, text="", font=ctk.CTkFont(size=18, weight="bold"),
+                                           text_color=self.colors["text_dark"])
+        self._loading_label.pack(pady=(0, 10))
+        self._loading_bar = ctk.CTkProgressBar(frame, width=400, mode="indeterminate")
+        self._loading_bar.pack()
+        self._loading_cancel = ctk.CTkButton(
+            frame,
+            text="Cancel",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            width=120,
+            height=40,
+            corner_radius=12,
+            fg_color="#6b7280",
+            hover_color="#4b5563",
+        )
+        self._loading_cancel.pack(pady=20)
+
+    def _update_loading(self, done, total):
+        if not self._loading_active or not total:
+            return
+        if self._loading_bar.cget("mode") != "determinate":
+            self._loading_bar.stop()
+            self._loading_bar.configure(mode="determinate")
+        self._loading_bar.set(done / total)
+        self._loading_label.configure(text=f"{self._loading_text} {done}/{total} months")
+
+    def _hide_loading(self):
+        if self._loading_active:
+            self._loading_bar.stop()
+            self._loading_active = False
+
+    def get_all_customers_from_history(self, progress=None):
+        """Get ALL customers including deleted ones that appear on monthly sheets
         UPDATED: Always get latest name/phone/address from main customers file"""
         all_unique_customers = {}
         
         # First, add current customers from main sheet
         try:
-            df_customers = pd.read_excel(self.customers_file, engine="openpyxl")
-            for _, row in df_customers.iterrows():
-                cid = str(row.get('CID', '')).strip()
-                if cid:
-                    all_unique_customers[cid] = {
-                        'CID': cid,
-                        'Name': row.get('Name', ''),
-                        'Phone': row.get('Phone', ''),
-                        'Address': row.get('Address', ''),
-                        'Status': 'Active'
-                    }
+            for cid, details in self.repo.contact_details().items():
+                all_unique_customers[cid] = {
+                    'CID': cid,
+                    'Name': details['Name'],
+                    'Phone': details['Phone'],
+                    'Address': details['Address'],
+                    'Status': 'Active'
+                }
         except Exception as e:
             print(f"Error loading customers: {e}")
         
-        # Now scan ALL monthly sheets to find deleted customers
-        if os.path.exists(self.monthly_sheets_path):
-            for filename in os.listdir(self.monthly_sheets_path):
-                if filename.endswith('.xlsx'):
-                    filepath = os.path.join(self.monthly_sheets_path, filename)
-                    try:
-                        wb = load_workbook(filepath, data_only=True)
-                        ws = wb.active
-                        
-                        for row_idx in range(2, ws.max_row + 1):
-                            cid = ws.cell(row=row_idx, column=2).value
-                            name = ws.cell(row=row_idx, column=3).value
-                            phone = ws.cell(row=row_idx, column=4).value
-                            
-                            if not cid:
-                                continue
-                            
-                            cid_str = str(cid).strip()
-                            
-                            # If this CID not in our dict, it's a deleted customer
-                            if cid_str not in all_unique_customers:
-                                all_unique_customers[cid_str] = {
-                                    'CID': cid_str,
-                                    'Name': name or '',
-                                    'Phone': phone or '',
-                                    'Address': '',
-                                    'Status': 'Deleted (Has History)'
-                                }
-                        
-                        wb.close()
-                    except Exception as e:
-                        print(f"Error reading {filename}: {e}")
-                        continue
+        # Deleted customers come from the history index, no workbook is opened
+        for cid_str, seen in self.history_index.all_appearances(progress).items():
+            # If this CID not in our dict, it's a deleted customer
+            if cid_str not in all_unique_customers:
+                all_unique_customers[cid_str] = {
+                    'CID': cid_str,
+                    'Name': seen['name'] or '',
+                    'Phone': seen['phone'] or '',
+                    'Address': '',
+                    'Status': 'Deleted (Has History)'
+                }
         
         return list(all_unique_customers.values())
 
 
     def show_all_records_view(self):
         """Display all customers with cumulative totals"""
-        for widget in self.winfo_children():
-            widget.destroy()
+        self._cancel_job()
         
-        self.view_mode = "all_records"
-        
-        # Load ALL customers including deleted ones
-        try:
-            self.all_customers = self.get_all_customers_from_history()
-            self.calculate_total_liters()
-            self.debug_check_data()
-            self.all_customers = sorted(self.all_customers, key=lambda x: str(x.get("CID", "")).zfill(10))
-        except Exception as e:
+        # Load ALL customers including deleted ones (in the background)
+        def load(progress):
+            customers = self.get_all_customers_from_history(progress)
+            self.calculate_total_liters(customers)
+            return sorted(customers, key=lambda x: str(x.get("CID", "")).zfill(10))
+
+        def failed(e):
             messagebox.showerror("Error", f"Failed to load customers: {e}", parent=self)
             self.init_menu_ui()
-            return
-        
+
+        self._start_load(
+            "Loading customer history...",
+            load,
+            on_done=self._build_all_records_view,
+            on_error=failed,
+            on_back=self.init_menu_ui,
+        )
+
+    def _build_all_records_view(self, customers):
+        self.all_customers = customers
+        self.debug_check_data()
+        self.view_mode = "all_records"
+
+        # The page is built once; only the data below changes between visits
+        self.views.show("all_records", self._build_all_records_page)
+        self._reset_search()
+        self._set_report_data(self.all_customers.copy())
+        self.populate_table(self.report_data)
+        self._show_period_totals()
+
+        active_count = sum(1 for c in self.all_customers if c.get('Status') == 'Active')
+        deleted_count = len(self.all_customers) - active_count
+        self.lbl_status.configure(
+            text=f"Showing {len(self.all_customers)} customers (Active: {active_count}, Deleted: {deleted_count})"
+        )
+
+    def _build_all_records_page(self, view):
         # ==================== HEADER ====================
-        header = ctk.CTkFrame(self, fg_color=self.colors["primary"], height=80)
+        header = ctk.CTkFrame(view, fg_color=self.colors["primary"], height=80)
         header.pack(fill="x")
         header.pack_propagate(False)
         
@@ -451,7 +538,7 @@ class ReportTab(ctk.CTkFrame):
         lbl_title.pack(side="left", padx=20)
         
         # ==================== TOOLBAR ====================
-        toolbar = ctk.CTkFrame(self, fg_color=self.colors["secondary"], height=120)
+        toolbar = ctk.CTkFrame(view, fg_color=self.colors["secondary"], height=120)
         toolbar.pack(fill="x", padx=20, pady=(10, 5))
         toolbar.pack_propagate(False)
 
@@ -472,6 +559,8 @@ class ReportTab(ctk.CTkFrame):
             text_color="#000000",
         )
         self.ent_search.pack(side="left", padx=5)
+        # Filters as you type; the Search button and Enter still work
+        self.live_search = LiveSearch(self.ent_search, self.search_index, self._on_search)
 
         btn_search = ctk.CTkButton(
             search_frame,
@@ -516,10 +605,6 @@ class ReportTab(ctk.CTkFrame):
         right_container = ctk.CTkFrame(toolbar, fg_color="transparent")
         right_container.pack(side="right", padx=20, pady=10)
 
-        # Calculate totals
-        total_liters = sum(float(c.get('Total_Liters', 0)) for c in self.all_customers)
-        total_amount = sum(float(c.get('Total_Amount', 0)) for c in self.all_customers)
-
         # ✅ TOTALS BOX - FIXED HEIGHT + NO PROPAGATE
         totals_frame = ctk.CTkFrame(
             right_container,
@@ -538,19 +623,21 @@ class ReportTab(ctk.CTkFrame):
             text_color="#fbbf24"
         ).pack(pady=(10, 5))
 
-        ctk.CTkLabel(
+        self.lbl_period_liters = ctk.CTkLabel(
             totals_frame,
-            text=f"🥛 {total_liters:.2f} L",
+            text="",
             font=ctk.CTkFont(size=14, weight="bold"),
             text_color="#10b981"
-        ).pack(pady=2)
+        )
+        self.lbl_period_liters.pack(pady=2)
 
-        ctk.CTkLabel(
+        self.lbl_period_amount = ctk.CTkLabel(
             totals_frame,
-            text=f"💰 ₹{total_amount:.2f}",
+            text="",
             font=ctk.CTkFont(size=14, weight="bold"),
             text_color="#3b82f6"
-        ).pack(pady=(2, 10))
+        )
+        self.lbl_period_amount.pack(pady=(2, 10))
 
         # ✅ DOWNLOAD BUTTON - MATCHING HEIGHT
         btn_download = ctk.CTkButton(
@@ -567,21 +654,16 @@ class ReportTab(ctk.CTkFrame):
         btn_download.pack(side="left")
         
         # ==================== TABLE ====================
-        self.create_report_table()
-        self.report_data = self.all_customers.copy()
-        self.populate_table(self.report_data)
+        self.create_report_table(view)
         
         # ==================== BOTTOM STATUS ====================
-        bottom_frame = ctk.CTkFrame(self, fg_color="transparent", height=70)
+        bottom_frame = ctk.CTkFrame(view, fg_color="transparent", height=70)
         bottom_frame.pack(fill="x", padx=20, pady=10)
         bottom_frame.pack_propagate(False)
         
-        active_count = sum(1 for c in self.all_customers if c.get('Status') == 'Active')
-        deleted_count = len(self.all_customers) - active_count
-        
         self.lbl_status = ctk.CTkLabel(
             bottom_frame,
-            text=f"Showing {len(self.all_customers)} customers (Active: {active_count}, Deleted: {deleted_count})",
+            text="",
             font=ctk.CTkFont(size=14, weight="bold"),
             text_color=self.colors["text_dark"]
         )
@@ -592,11 +674,58 @@ class ReportTab(ctk.CTkFrame):
 
 
 
+    def _monthly_report_rows(self, monthly_file, year, month):
+        """Report rows for one month, latest name/phone/address from the master"""
+        # FIRST: Load latest customer data from main file
+        try:
+            customers_dict = self.repo.contact_details()
+        except Exception as e:
+            print(f"Error loading main customers: {e}")
+            customers_dict = {}
+
+        # THEN: Load monthly sheet (parsed once, shared with other tabs)
+        sheet = month_cache.get(monthly_file, year, month)
+        row_liters, row_amounts = bill_month(sheet)
+
+        rows = []
+
+        for i, cid_str in enumerate(sheet.cids):
+            cid = cid_str
+            name_sheet = sheet.names[i]
+
+            if not name_sheet:
+                continue
+
+            # From the daily columns, so unsaved sheets are right too
+            total_ltr = float(row_liters[i])
+            total_amt = float(row_amounts[i])
+
+            # Get LATEST data from main customers file
+            if cid_str in customers_dict:
+                name = customers_dict[cid_str]['Name']
+                phone = customers_dict[cid_str]['Phone']
+                address = customers_dict[cid_str]['Address']
+            else:
+                # Fallback to sheet data for deleted customers
+                name = name_sheet
+                phone = sheet.phones[i] or ''
+                address = ''
+
+            rows.append({
+                'CID': cid,
+                'Name': name,
+                'Phone': phone,
+                'Address': address,
+                'Total_Liters': total_ltr,
+                'Total_Amount': total_amt,
+            })
+
+        return sorted(rows, key=lambda x: str(x.get("CID", "")).zfill(10))
+
     def show_monthly_data(self, month):
         """Display monthly data for selected month
         UPDATED: Always fetch latest name/phone/address from main customers file"""
-        for widget in self.winfo_children():
-            widget.destroy()
+        self._cancel_job()
         
         self.selected_month = month
         try:
@@ -618,112 +747,39 @@ class ReportTab(ctk.CTkFrame):
             self.show_month_selection()
             return
         
-        # Load monthly data
-        try:
-            # FIRST: Load latest customer data from main file
-            customers_dict = {}
-            try:
-                df_customers = pd.read_excel(self.customers_file, engine="openpyxl")
-                for _, row in df_customers.iterrows():
-                    cid = str(row.get('CID', '')).strip()
-                    if cid:
-                        customers_dict[cid] = {
-                            'Name': row.get('Name', ''),
-                            'Phone': row.get('Phone', ''),
-                            'Address': row.get('Address', '')
-                        }
-            except Exception as e:
-                print(f"Error loading main customers: {e}")
-            
-            # THEN: Load monthly sheet
-            wb = load_workbook(monthly_file, data_only=True)
-            ws = wb.active
-            
-            days_in_month = calendar.monthrange(self.selected_year, self.selected_month)[1]
-            col_start = 6
-            total_ltr_col = col_start + days_in_month
-            total_amt_col = total_ltr_col + 1
-            
-            self.report_data = []
-            
-            for row_idx in range(2, ws.max_row + 1):
-                cid = ws.cell(row=row_idx, column=2).value
-                name_sheet = ws.cell(row=row_idx, column=3).value
-                
-                if not cid or not name_sheet:
-                    continue
-                
-                cid_str = str(cid).strip()
-                
-                ltr_val = ws.cell(row=row_idx, column=total_ltr_col).value
-                amt_val = ws.cell(row=row_idx, column=total_amt_col).value
+        # Load monthly data in the background, then build the page
+        year = self.selected_year
 
-                # ---------- FIX: handle Excel not saved ----------
-                total_ltr = 0.0
-                total_amt = 0.0
+        def failed(e):
+            messagebox.showerror("Error", f"Failed to load monthly data: {e}", parent=self)
+            self.show_month_selection()
 
-                try:
-                    if ltr_val is not None and amt_val is not None:
-                        total_ltr = float(ltr_val)
-                        total_amt = float(amt_val)
-                    else:
-                        # Recalculate liters manually from daily columns
-                        for dcol in range(6, total_ltr_col):
-                            day_val = ws.cell(row=row_idx, column=dcol).value
-                            if day_val:
-                                total_ltr += float(day_val)
-
-                        # ---------- FIX: get rate from customers master ----------
-                        rate = 0.0
-                        try:
-                            # match customer from loaded master data
-                            for cust in all_customers:
-                                if str(cust.get("CID", "")).strip() == str(cid).strip():
-                                    rate = float(cust.get("Rate", 0))
-                                    break
-                        except:
-                            rate = 0.0
+        self._start_load(
+            f"Loading {self.month_names[month-1]} {year}...",
+            lambda progress: self._monthly_report_rows(monthly_file, year, month),
+            on_done=lambda rows: self._build_monthly_view(month, monthly_file, rows),
+            on_error=failed,
+            on_back=self.show_month_selection,
+        )
 
-                        total_amt = total_ltr * rate
+    def _build_monthly_view(self, month, monthly_file, rows):
+        self._set_report_data(rows)
+        self.view_mode = "monthly"
 
-                except:
-                    total_ltr = 0.0
-                    total_amt = 0.0
+        # The page is built once; only the data below changes between months
+        self.views.show("monthly", self._build_monthly_page)
+        month_name = self.month_names[month-1]
+        self.lbl_view_title.configure(text=f"📅 {month_name} {self.selected_year} Report")
+        self.lbl_totals_title.configure(text=f"📊 {month_name.upper()} TOTALS")
+        self.btn_close_month.configure(text="Reopen Month" if is_month_closed(monthly_file) else "Close Month")
+        self._reset_search()
+        self.populate_table(self.report_data)
+        self._show_period_totals()
+        self.lbl_status.configure(text=f"Showing {len(self.report_data)} customers for {month_name} {self.selected_year}")
 
-                
-                # Get LATEST data from main customers file
-                if cid_str in customers_dict:
-                    name = customers_dict[cid_str]['Name']
-                    phone = customers_dict[cid_str]['Phone']
-                    address = customers_dict[cid_str]['Address']
-                else:
-                    # Fallback to sheet data for deleted customers
-                    name = name_sheet
-                    phone = ws.cell(row=row_idx, column=4).value or ''
-                    address = ''
-                
-                self.report_data.append({
-                    'CID': cid,
-                    'Name': name,
-                    'Phone': phone,
-                    'Address': address,
-                    'Total_Liters': total_ltr,
-                    'Total_Amount': total_amt,
-                })
-            
-            wb.close()
-            self.report_data = sorted(self.report_data, key=lambda x: str(x.get("CID", "")).zfill(10))
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load monthly data: {e}", parent=self)
-            self.show_month_selection()
-            return
-        
-        # Build UI (rest of the function remains the same)
-        self.view_mode = "monthly"
-        
+    def _build_monthly_page(self, view):
         # Header
-        header = ctk.CTkFrame(self, fg_color=self.colors["primary"], height=80)
+        header = ctk.CTkFrame(view, fg_color=self.colors["primary"], height=80)
         header.pack(fill="x")
         header.pack_propagate(False)
         
@@ -741,16 +797,16 @@ class ReportTab(ctk.CTkFrame):
         )
         btn_back.pack(side="left", padx=30, pady=12)
         
-        lbl_title = ctk.CTkLabel(
+        self.lbl_view_title = ctk.CTkLabel(
             header,
-            text=f"📅 {self.month_names[month-1]} {self.selected_year} Report",
+            text="",
             font=ctk.CTkFont(size=36, weight="bold"),
             text_color=self.colors["text_light"],
         )
-        lbl_title.pack(side="left", padx=20)
+        self.lbl_view_title.pack(side="left", padx=20)
         
         # Toolbar
-        toolbar = ctk.CTkFrame(self, fg_color=self.colors["secondary"], height=120)
+        toolbar = ctk.CTkFrame(view, fg_color=self.colors["secondary"], height=120)
         toolbar.pack(fill="x", padx=20, pady=(10, 5))
         toolbar.pack_propagate(False)
         
@@ -771,6 +827,8 @@ class ReportTab(ctk.CTkFrame):
             text_color="#000000",
         )
         self.ent_search.pack(side="left", padx=5)
+        # Filters as you type; the Search button and Enter still work
+        self.live_search = LiveSearch(self.ent_search, self.search_index, self._on_search)
         
         btn_search = ctk.CTkButton(
             search_frame,
@@ -810,6 +868,19 @@ class ReportTab(ctk.CTkFrame):
             command=lambda: self.show_monthly_data(self.selected_month)
         )
         btn_refresh.pack(side="left", padx=5)
+
+        self.btn_close_month = ctk.CTkButton(
+            search_frame,
+            text="Close Month",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            width=150,
+            height=45,
+            corner_radius=12,
+            fg_color="#8b5cf6",
+            hover_color="#7c3aed",
+            command=self.toggle_month_closed
+        )
+        self.btn_close_month.pack(side="left", padx=5)
         
         # Download button
         btn_download = ctk.CTkButton(
@@ -829,68 +900,96 @@ class ReportTab(ctk.CTkFrame):
         totals_frame = ctk.CTkFrame(toolbar, fg_color="#1e293b", corner_radius=15)
         totals_frame.pack(side="right", padx=0, pady=10)
         
-        month_total_liters = sum(float(c.get('Total_Liters', 0)) for c in self.report_data)
-        month_total_amount = sum(float(c.get('Total_Amount', 0)) for c in self.report_data)
-        
-        ctk.CTkLabel(
+        self.lbl_totals_title = ctk.CTkLabel(
             totals_frame,
-            text=f"📊 {self.month_names[month-1].upper()} TOTALS",
+            text="",
             font=ctk.CTkFont(size=14, weight="bold"),
             text_color="#fbbf24"
-        ).pack(padx=20, pady=(10, 5))
+        )
+        self.lbl_totals_title.pack(padx=20, pady=(10, 5))
         
-        ctk.CTkLabel(
+        self.lbl_period_liters = ctk.CTkLabel(
             totals_frame,
-            text=f"🥛 Total Liters: {month_total_liters:.2f} L",
+            text="",
             font=ctk.CTkFont(size=16, weight="bold"),
             text_color="#10b981"
-        ).pack(padx=20, pady=2)
+        )
+        self.lbl_period_liters.pack(padx=20, pady=2)
         
-        ctk.CTkLabel(
+        self.lbl_period_amount = ctk.CTkLabel(
             totals_frame,
-            text=f"💰 Total Amount: ₹{month_total_amount:.2f}",
+            text="",
             font=ctk.CTkFont(size=16, weight="bold"),
             text_color="#3b82f6"
-        ).pack(padx=20, pady=(2, 10))
+        )
+        self.lbl_period_amount.pack(padx=20, pady=(2, 10))
         
         # Table
-        self.create_report_table()
-        self.populate_table(self.report_data)
+        self.create_report_table(view)
         
         # Bottom frame
-        bottom_frame = ctk.CTkFrame(self, fg_color="transparent", height=70)
+        bottom_frame = ctk.CTkFrame(view, fg_color="transparent", height=70)
         bottom_frame.pack(fill="x", padx=20, pady=10)
         bottom_frame.pack_propagate(False)
         
         self.lbl_status = ctk.CTkLabel(
             bottom_frame,
-            text=f"Showing {len(self.report_data)} customers for {self.month_names[month-1]} {self.selected_year}",
+            text="",
             font=ctk.CTkFont(size=14),
             text_color=self.colors["text_dark"]
         )
         self.lbl_status.pack(side="left", padx=20)
 
-    def refresh_all_records(self):
-        """Reload all customer records and refresh table + totals"""
+    def toggle_month_closed(self):
+        """Close the shown month (freeze its totals for yearly/lifetime reports) or reopen it"""
+        monthly_file = os.path.join(
+            self.monthly_sheets_path,
+            f"{self.selected_year}_{self.selected_month:02d}.xlsx"
+        )
+        label = f"{self.month_names[self.selected_month-1]} {self.selected_year}"
         try:
-            # Reload customers (including deleted)
-            self.all_customers = self.get_all_customers_from_history()
+            if is_month_closed(monthly_file):
+                if not messagebox.askyesno(
+                    "Reopen Month",
+                    f"Reopen {label}?\n\nYearly and lifetime reports will read the Excel sheet again.",
+                    parent=self
+                ):
+                    return
+                reopen_month(monthly_file)
+                self.btn_close_month.configure(text="Close Month")
+            else:
+                if not messagebox.askyesno(
+                    "Close Month",
+                    f"Close {label}?\n\nFinal liters and amounts are saved and used by yearly and "
+                    f"lifetime reports. Reopen the month before changing its sheet.",
+                    parent=self
+                ):
+                    return
+                close_month(monthly_file, self.selected_year, self.selected_month)
+                self.btn_close_month.configure(text="Reopen Month")
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not update {label}: {e}", parent=self)
 
-            # Recalculate totals from monthly sheets
-            self.calculate_total_liters()
+    def _reload_all_customers(self):
+        """Re-read all customers (including deleted) with their lifetime totals, sorted by CID"""
+        self.all_customers = self.get_all_customers_from_history()
 
-            # Sort by CID
-            self.all_customers = sorted(
-                self.all_customers,
-                key=lambda x: str(x.get("CID", "")).zfill(10)
-            )
+        # Recalculate totals from monthly sheets
+        self.calculate_total_liters()
 
-            # Update report data
-            self.report_data = self.all_customers.copy()
+        self.all_customers = sorted(
+            self.all_customers,
+            key=lambda x: str(x.get("CID", "")).zfill(10)
+        )
+        return self.all_customers
 
-            # CLEAR table
-            for item in self.tree.get_children():
-                self.tree.delete(item)
+    def refresh_all_records(self):
+        """Reload all customer records and refresh table + totals"""
+        try:
+            self._reload_all_customers()
+
+            # Update report data
+            self._set_report_data(self.all_customers.copy())
 
             # REPULATE table
             self.populate_table(self.report_data)
@@ -914,51 +1013,98 @@ class ReportTab(ctk.CTkFrame):
             messagebox.showerror("Refresh Error", str(e), parent=self)
     
 
-    def _on_arrow_up(self, event):
-        items = self.tree.get_children()
-        if not items:
-            return "break"
-
-        current = self.tree.focus()
-        if not current:
-            self.tree.focus(items[0])
-            self.tree.selection_set(items[0])
-            return "break"
-
-        index = items.index(current)
-        if index > 0:
-            prev_item = items[index - 1]
-            self.tree.focus(prev_item)
-            self.tree.selection_set(prev_item)
-            self.tree.see(prev_item)
-
-        return "break"
-
+    # ---------------------------
+    # Live updates from the sheet watcher
+    # ---------------------------
+    def on_sheet_change(self, event):
+        """Update the visible report in place when a sheet or the master changes"""
+        if not self.winfo_ismapped():
+            # e.g. the sheet is being edited from the Entry tab: catch up when shown
+            self._missed_changes[(event.kind, event.year, event.month)] = event
+            return
+        # Errors reach the watcher, which logs them; no dialog on every poll
+        self._apply_sheet_change(event)
 
-    def _on_arrow_down(self, event):
-        items = self.tree.get_children()
-        if not items:
-            return "break"
+    def apply_missed_changes(self):
+        """Apply the changes that came while the tab was hidden"""
+        events, self._missed_changes = list(self._missed_changes.values()), {}
+        for event in events:
+            try:
+                if self._apply_sheet_change(event):
+                    # A refresh re-reads the whole view, so one covers the rest
+                    break
+            except Exception as e:
+                print(f"Report refresh failed: {e}")
 
-        current = self.tree.focus()
-        if not current:
-            self.tree.focus(items[0])
-            self.tree.selection_set(items[0])
-            return "break"
+    def _apply_sheet_change(self, event):
+        """Refresh the shown report if event concerns it; True if it was refreshed"""
+        try:
+            if self.view_mode == "monthly":
+                if event.kind != "customers" and (event.year, event.month) != (self.selected_year, self.selected_month):
+                    return False
+                monthly_file = os.path.join(
+                    self.monthly_sheets_path,
+                    f"{self.selected_year}_{self.selected_month:02d}.xlsx"
+                )
+                if not os.path.exists(monthly_file):
+                    return False
+                self._set_report_data(self._monthly_report_rows(
+                    monthly_file, self.selected_year, self.selected_month
+                ))
+            elif self.view_mode == "yearly":
+                if event.kind != "customers" and event.year != self.selected_year:
+                    return False
+                self._set_report_data(self._yearly_report_rows(self._yearly_files(self.selected_year)))
+            elif self.view_mode == "all_records":
+                self._set_report_data(self._reload_all_customers().copy())
+            else:
+                return False
+            self._refresh_report_in_place()
+            return True
+        except TclError:
+            # The view was torn down while the event was queued
+            return False
+
+    def _set_report_data(self, rows):
+        self.report_data = rows
+        self.report_keys = record_keys(rows)
+        # Only rows whose CID/name/phone/address changed are re-indexed
+        self.search_index.sync(zip(self.report_keys, rows))
+
+    def _refresh_report_in_place(self):
+        data = self.live_search.matching(self.report_keys, self.report_data)
+        self._update_table_in_place(data)
+        self._show_period_totals()
+        self.lbl_status.configure(
+            text=f"Showing {len(data)} records (updated {datetime.datetime.now():%H:%M:%S})"
+        )
 
-        index = items.index(current)
-        if index < len(items) - 1:
-            next_item = items[index + 1]
-            self.tree.focus(next_item)
-            self.tree.selection_set(next_item)
-            self.tree.see(next_item)
+    def _show_period_totals(self):
+        total_liters = sum(float(c.get('Total_Liters', 0)) for c in self.report_data)
+        total_amount = sum(float(c.get('Total_Amount', 0)) for c in self.report_data)
+        if self.view_mode == "all_records":
+            # The all-records totals box is narrow
+            self.lbl_period_liters.configure(text=f"🥛 {total_liters:.2f} L")
+            self.lbl_period_amount.configure(text=f"💰 ₹{total_amount:.2f}")
+            return
+        self.lbl_period_liters.configure(text=f"🥛 Total Liters: {total_liters:.2f} L")
+        self.lbl_period_amount.configure(text=f"💰 Total Amount: ₹{total_amount:.2f}")
+
+    def _update_table_in_place(self, data):
+        """Refresh the rows keeping scroll position and current row; rebuild if rows were added or removed"""
+        data = sorted(data, key=lambda x: str(x.get("CID", "")).zfill(10))
+        rows = [self._row_values(idx, customer) for idx, customer in enumerate(data, 1)]
+        if [row[1] for row in self.tree.rows] != [row[1] for row in rows]:
+            self.populate_table(data)
+            return
 
-        return "break"
+        # Only the rows on screen are Tk items, so rewriting all of them is cheap
+        self.tree.set_rows(rows, self._row_tags(len(rows)), keep_position=True)
 
 
 
-    def create_report_table(self):
-        table_frame = ctk.CTkFrame(self, fg_color=self.colors["text_light"])
+    def create_report_table(self, parent):
+        table_frame = ctk.CTkFrame(parent, fg_color=self.colors["text_light"])
         table_frame.pack(fill="both", expand=True, padx=25, pady=(0, 10))
 
         table_container = ctk.CTkFrame(table_frame, fg_color="transparent")
@@ -988,7 +1134,7 @@ class ReportTab(ctk.CTkFrame):
 
         columns = ("S.No", "CID", "Name", "Phone", "Address", "Total Liters", "Total Amount")
 
-        self.tree = ttk.Treeview(
+        self.tree = VirtualTable(
         table_container,
         columns=columns,
         show="headings",
@@ -1007,9 +1153,7 @@ class ReportTab(ctk.CTkFrame):
         self.tree.configure(yscrollcommand=vsb.set)
         vsb.pack(side="right", fill="y")
 
-        # ✅ Keyboard bindings
-        self.tree.bind("<Up>", self._on_arrow_up)
-        self.tree.bind("<Down>", self._on_arrow_down)
+        # ✅ Keyboard navigation and wheel scrolling come with VirtualTable
 
 
         def on_mouse_wheel(self, event):
@@ -1019,56 +1163,18 @@ class ReportTab(ctk.CTkFrame):
             elif event.num == 4 or event.delta > 0:
                 self.tree.yview_scroll(-1, "units")
 
-    def calculate_total_liters(self):
+    def calculate_total_liters(self, customers=None):
         """Calculate total liters for each customer from all monthly sheets"""
-        for customer in self.all_customers:
-            cid = customer.get('CID', '')
-            total_liters = 0.0
-            total_amount = 0.0
-            
-            if os.path.exists(self.monthly_sheets_path):
-                for filename in os.listdir(self.monthly_sheets_path):
-                    if filename.endswith('.xlsx'):
-                        filepath = os.path.join(self.monthly_sheets_path, filename)
-                        try:
-                            wb = load_workbook(filepath, data_only=True)
-                            ws = wb.active
-                            
-                            parts = filename.replace('.xlsx', '').split('_')
-                            if len(parts) == 2:
-                                month_num = int(parts[1])
-                                year = int(parts[0])
-                                days_in_month = calendar.monthrange(year, month_num)[1]
-                                col_start = 6
-                                total_ltr_col = col_start + days_in_month
-                                total_amt_col = total_ltr_col + 1
-                                
-                                for row_idx in range(2, ws.max_row + 1):
-                                    cell_cid = ws.cell(row=row_idx, column=2).value
-                                    
-                                    if str(cell_cid).strip() == str(cid).strip():
-                                        ltr_val = ws.cell(row=row_idx, column=total_ltr_col).value
-                                        amt_val = ws.cell(row=row_idx, column=total_amt_col).value
-                                        
-                                        try:
-                                            total_liters += float(ltr_val) if ltr_val else 0.0
-                                            total_amount += float(amt_val) if amt_val else 0.0
-                                        except:
-                                            pass
-                                        break
-                            
-                            wb.close()
-                        except Exception as e:
-                            print(f"Error reading {filename}: {e}")
-                            continue
-            
+        # Running totals; only months saved since the last visit are re-read
+        lifetime = self.history_index.lifetime_totals()
+
+        for customer in (self.all_customers if customers is None else customers):
+            cid = str(customer.get('CID', '')).strip()
+            total_liters, total_amount = lifetime.get(cid, (0.0, 0.0))
             customer['Total_Liters'] = total_liters
             customer['Total_Amount'] = total_amount
                         
-    def populate_table(self, data=None):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
+    def populate_table(self, data=None, focus=True):
         if data is None:
             data = self.report_data
 
@@ -1077,55 +1183,66 @@ class ReportTab(ctk.CTkFrame):
         except:
             pass
 
-        for idx, customer in enumerate(data, 1):
-            tag = "oddrow" if idx % 2 else "evenrow"
-
-            values = (
-                str(idx),
-                customer.get('CID', ''),
-                customer.get('Name', ''),
-                customer.get('Phone', ''),
-                customer.get('Address', ''),
-                f"{float(customer.get('Total_Liters', 0)):.2f}",
-                f"₹{float(customer.get('Total_Amount', 0)):.2f}"
-            )
-
-            self.tree.insert("", "end", values=values, tags=(tag,))
-
-        # ✅ IMPORTANT: restore focus for arrow keys
-        self._focus_first_row()
+        self.tree.set_rows(
+            [self._row_values(idx, customer) for idx, customer in enumerate(data, 1)],
+            self._row_tags(len(data)),
+        )
 
+        # ✅ IMPORTANT: restore focus for arrow keys (not while typing a search)
+        if focus:
+            self._focus_first_row()
+        elif data:
+            self.tree.set_current(0)
+
+
+    @staticmethod
+    def _row_tags(count):
+        return [("oddrow" if idx % 2 else "evenrow",) for idx in range(1, count + 1)]
+
+    def _row_values(self, idx, customer):
+        return (
+            str(idx),
+            str(customer.get('CID', '')),
+            str(customer.get('Name', '')),
+            str(customer.get('Phone', '')),
+            str(customer.get('Address', '')),
+            f"{float(customer.get('Total_Liters', 0)):.2f}",
+            f"₹{float(customer.get('Total_Amount', 0)):.2f}"
+        )
 
     def search_customers(self):
-        search_term = self.ent_search.get().strip().lower()
+        self.live_search.run(explicit=True)
 
-        if not search_term:
-            self.populate_table(self.report_data)
+    def _on_search(self, query, keys, explicit):
+        if keys is None:
+            self.populate_table(self.report_data, focus=explicit)
             self.lbl_status.configure(text=f"Showing {len(self.report_data)} records")
             return
 
-        filtered_data = [
-            c for c in self.report_data
-            if search_term in str(c.get('CID', '')).lower()
-            or search_term in str(c.get('Name', '')).lower()
-            or search_term in str(c.get('Phone', '')).lower()
-            or search_term in str(c.get('Address', '')).lower()
-        ]
+        filtered_data = [c for k, c in zip(self.report_keys, self.report_data) if k in keys]
 
-        if filtered_data:
-            self.populate_table(filtered_data)
-            self.lbl_status.configure(text=f"Found {len(filtered_data)} records")
+        if filtered_data or not explicit:
+            self.populate_table(filtered_data, focus=explicit)
+            self.lbl_status.configure(
+                text=f"Found {len(filtered_data)} records" if filtered_data else "No results found"
+            )
         else:
             messagebox.showinfo(
                 "No Results",
-                f"No customers found matching '{search_term}'",
+                f"No customers found matching '{query}'",
                 parent=self
             )
             self.lbl_status.configure(text="No results found")
 
 
+    def _reset_search(self):
+        """Empty the search box of a re-shown page; it may hold the query of its last visit"""
+        self.ent_search.delete(0, "end")
+        self.live_search.reset()
+
     def clear_search(self):
         self.ent_search.delete(0, "end")
+        self.live_search.reset()
         self.populate_table(self.report_data)
         self.lbl_status.configure(text=f"Showing {len(self.report_data)} records")
 
@@ -1418,11 +1535,13 @@ class ReportTab(ctk.CTkFrame):
 
     def show_year_selection_for_yearly(self):
         """Show year selection screen for yearly report (Dropdown version)"""
-        for widget in self.winfo_children():
-            widget.destroy()
+        self._cancel_job()
+        self.view_mode = "year_selection"
+        self.views.show("year_selection", self._build_year_selection_page)
 
+    def _build_year_selection_page(self, view):
         # Header
-        header = ctk.CTkFrame(self, fg_color=self.colors["primary"], height=80)
+        header = ctk.CTkFrame(view, fg_color=self.colors["primary"], height=80)
         header.pack(fill="x")
         header.pack_propagate(False)
 
@@ -1449,7 +1568,7 @@ class ReportTab(ctk.CTkFrame):
         lbl_title.pack(side="left", padx=20)
 
         # Content
-        content = ctk.CTkFrame(self, fg_color="transparent")
+        content = ctk.CTkFrame(view, fg_color="transparent")
         content.pack(fill="both", expand=True, padx=40, pady=40)  # ← CRITICAL FIX
 
         ctk.CTkLabel(
@@ -1488,21 +1607,82 @@ class ReportTab(ctk.CTkFrame):
         ).pack(pady=30)
 
 
+    def _yearly_report_rows(self, yearly_files, progress=None):
+        """Report rows summed over the given YYYY_MM.xlsx names"""
+        # FIRST: Load latest customer data from main file
+        try:
+            customers_dict = self.repo.contact_details()
+        except Exception as e:
+            print(f"Error loading main customers: {e}")
+            customers_dict = {}
+
+        yearly_data = {}
+
+        month_files = []
+        for filename in sorted(yearly_files):
+            ym = parse_month_filename(filename)
+            if ym:
+                month_files.append((ym[0], ym[1], os.path.join(self.monthly_sheets_path, filename)))
+
+        # Closed months come from their summary; open ones are parsed in parallel
+        summaries = load_month_summaries(month_files, progress=progress)
+
+        for _, _, filepath in month_files:
+            summary = summaries.get(filepath)
+            if summary is None:
+                continue
+
+            for i, cid_str in enumerate(summary.cids):
+                name_sheet = summary.names[i]
+
+                if not name_sheet:
+                    continue
+
+                liters, amount = float(summary.liters[i]), float(summary.amounts[i])
+
+                if cid_str not in yearly_data:
+                    # Get LATEST data from main customers file
+                    if cid_str in customers_dict:
+                        name = customers_dict[cid_str]['Name']
+                        phone = customers_dict[cid_str]['Phone']
+                        address = customers_dict[cid_str]['Address']
+                    else:
+                        # Fallback for deleted customers
+                        name = name_sheet
+                        phone = summary.phones[i] or ''
+                        address = ''
+
+                    yearly_data[cid_str] = {
+                        'CID': cid_str,
+                        'Name': name,
+                        'Phone': phone,
+                        'Address': address,
+                        'Total_Liters': 0.0,
+                        'Total_Amount': 0.0
+                    }
+
+                yearly_data[cid_str]['Total_Liters'] += liters
+                yearly_data[cid_str]['Total_Amount'] += amount
+
+        return sorted(yearly_data.values(), key=lambda x: str(x.get("CID", "")).zfill(10))
+
+    def _yearly_files(self, year):
+        yearly_files = []
+        if os.path.exists(self.monthly_sheets_path):
+            for filename in os.listdir(self.monthly_sheets_path):
+                if filename.startswith(f"{year}_") and filename.endswith('.xlsx'):
+                    yearly_files.append(filename)
+        return yearly_files
+
     def show_yearly_data(self, year):
         """Display yearly data for selected year
         UPDATED: Always fetch latest name/phone/address from main customers file"""
-        for widget in self.winfo_children():
-            widget.destroy()
+        self._cancel_job()
         
         self.selected_year = year
-        self.view_mode = "yearly"
         
         # Check if any monthly files exist for this year
-        yearly_files = []
-        if os.path.exists(self.monthly_sheets_path):
-            for filename in os.listdir(self.monthly_sheets_path):
-                if filename.startswith(f"{year}_") and filename.endswith('.xlsx'):
-                    yearly_files.append(filename)
+        yearly_files = self._yearly_files(year)
         
         if not yearly_files:
             messagebox.showwarning(
@@ -1513,98 +1693,35 @@ class ReportTab(ctk.CTkFrame):
             self.show_year_selection_for_yearly()
             return
         
-        # Load yearly data - aggregate from all monthly files of this year
-        try:
-            # FIRST: Load latest customer data from main file
-            customers_dict = {}
-            try:
-                df_customers = pd.read_excel(self.customers_file, engine="openpyxl")
-                for _, row in df_customers.iterrows():
-                    cid = str(row.get('CID', '')).strip()
-                    if cid:
-                        customers_dict[cid] = {
-                            'Name': row.get('Name', ''),
-                            'Phone': row.get('Phone', ''),
-                            'Address': row.get('Address', '')
-                        }
-            except Exception as e:
-                print(f"Error loading main customers: {e}")
-            
-            yearly_data = {}
-            
-            for filename in yearly_files:
-                filepath = os.path.join(self.monthly_sheets_path, filename)
-                try:
-                    wb = load_workbook(filepath, data_only=True)
-                    ws = wb.active
-                    
-                    parts = filename.replace('.xlsx', '').split('_')
-                    if len(parts) == 2:
-                        month_num = int(parts[1])
-                        days_in_month = calendar.monthrange(year, month_num)[1]
-                        col_start = 6
-                        total_ltr_col = col_start + days_in_month
-                        total_amt_col = total_ltr_col + 1
-                        
-                        for row_idx in range(2, ws.max_row + 1):
-                            cid = ws.cell(row=row_idx, column=2).value
-                            name_sheet = ws.cell(row=row_idx, column=3).value
-                            
-                            if not cid or not name_sheet:
-                                continue
-                            
-                            cid_str = str(cid).strip()
-                            
-                            ltr_val = ws.cell(row=row_idx, column=total_ltr_col).value
-                            amt_val = ws.cell(row=row_idx, column=total_amt_col).value
-                            
-                            try:
-                                liters = float(ltr_val) if ltr_val else 0.0
-                                amount = float(amt_val) if amt_val else 0.0
-                            except:
-                                liters = 0.0
-                                amount = 0.0
-                            
-                            if cid_str not in yearly_data:
-                                # Get LATEST data from main customers file
-                                if cid_str in customers_dict:
-                                    name = customers_dict[cid_str]['Name']
-                                    phone = customers_dict[cid_str]['Phone']
-                                    address = customers_dict[cid_str]['Address']
-                                else:
-                                    # Fallback for deleted customers
-                                    name = name_sheet
-                                    phone = ws.cell(row=row_idx, column=4).value or ''
-                                    address = ''
-                                
-                                yearly_data[cid_str] = {
-                                    'CID': cid,
-                                    'Name': name,
-                                    'Phone': phone,
-                                    'Address': address,
-                                    'Total_Liters': 0.0,
-                                    'Total_Amount': 0.0
-                                }
-                            
-                            yearly_data[cid_str]['Total_Liters'] += liters
-                            yearly_data[cid_str]['Total_Amount'] += amount
-                    
-                    wb.close()
-                except Exception as e:
-                    print(f"Error reading {filename}: {e}")
-                    continue
-            
-            self.report_data = list(yearly_data.values())
-            self.report_data = sorted(self.report_data, key=lambda x: str(x.get("CID", "")).zfill(10))
-            
-        except Exception as e:
+        # Load yearly data - aggregate from all monthly files of this year (in the background)
+        def failed(e):
             messagebox.showerror("Error", f"Failed to load yearly data: {e}", parent=self)
             self.show_year_selection_for_yearly()
-            return
-        
-        # Build UI (rest remains the same as before)
+
+        self._start_load(
+            f"Loading year {year}...",
+            lambda progress: self._yearly_report_rows(yearly_files, progress),
+            on_done=lambda rows: self._build_yearly_view(year, rows),
+            on_error=failed,
+            on_back=self.show_year_selection_for_yearly,
+        )
+
+    def _build_yearly_view(self, year, rows):
+        self._set_report_data(rows)
+        self.view_mode = "yearly"
+
+        # The page is built once; only the data below changes between years
+        self.views.show("yearly", self._build_yearly_page)
+        self.lbl_view_title.configure(text=f"📅 Year {year} Report")
+        self.lbl_totals_title.configure(text=f"📊 YEAR {year} TOTALS")
+        self._reset_search()
+        self.populate_table(self.report_data)
+        self._show_period_totals()
+        self.lbl_status.configure(text=f"Showing {len(self.report_data)} customers for year {year}")
+
+    def _build_yearly_page(self, view):
         # Header
-        header = ctk.CTkFrame(self, fg_color=self.colors["primary"], height=80)
+        header = ctk.CTkFrame(view, fg_color=self.colors["primary"], height=80)
         header.pack(fill="x")
         header.pack_propagate(False)
         
@@ -1622,16 +1739,16 @@ class ReportTab(ctk.CTkFrame):
         )
         btn_back.pack(side="left", padx=30, pady=12)
         
-        lbl_title = ctk.CTkLabel(
+        self.lbl_view_title = ctk.CTkLabel(
             header,
-            text=f"📅 Year {year} Report",
+            text="",
             font=ctk.CTkFont(size=36, weight="bold"),
             text_color=self.colors["text_light"],
         )
-        lbl_title.pack(side="left", padx=20)
+        self.lbl_view_title.pack(side="left", padx=20)
         
         # Toolbar
-        toolbar = ctk.CTkFrame(self, fg_color=self.colors["secondary"], height=120)
+        toolbar = ctk.CTkFrame(view, fg_color=self.colors["secondary"], height=120)
         toolbar.pack(fill="x", padx=20, pady=(10, 5))
         toolbar.pack_propagate(False)
         
@@ -1652,6 +1769,8 @@ class ReportTab(ctk.CTkFrame):
             text_color="#000000",
         )
         self.ent_search.pack(side="left", padx=5)
+        # Filters as you type; the Search button and Enter still work
+        self.live_search = LiveSearch(self.ent_search, self.search_index, self._on_search)
         
         btn_search = ctk.CTkButton(
             search_frame,
@@ -1710,42 +1829,41 @@ class ReportTab(ctk.CTkFrame):
         totals_frame = ctk.CTkFrame(toolbar, fg_color="#1e293b", corner_radius=15)
         totals_frame.pack(side="right", padx=0, pady=10)
         
-        year_total_liters = sum(float(c.get('Total_Liters', 0)) for c in self.report_data)
-        year_total_amount = sum(float(c.get('Total_Amount', 0)) for c in self.report_data)
-        
-        ctk.CTkLabel(
+        self.lbl_totals_title = ctk.CTkLabel(
             totals_frame,
-            text=f"📊 YEAR {year} TOTALS",
+            text="",
             font=ctk.CTkFont(size=14, weight="bold"),
             text_color="#fbbf24"
-        ).pack(padx=20, pady=(10, 5))
+        )
+        self.lbl_totals_title.pack(padx=20, pady=(10, 5))
         
-        ctk.CTkLabel(
+        self.lbl_period_liters = ctk.CTkLabel(
             totals_frame,
-            text=f"🥛 Total Liters: {year_total_liters:.2f} L",
+            text="",
             font=ctk.CTkFont(size=16, weight="bold"),
             text_color="#10b981"
-        ).pack(padx=20, pady=2)
+        )
+        self.lbl_period_liters.pack(padx=20, pady=2)
         
-        ctk.CTkLabel(
+        self.lbl_period_amount = ctk.CTkLabel(
             totals_frame,
-            text=f"💰 Total Amount: ₹{year_total_amount:.2f}",
+            text="",
             font=ctk.CTkFont(size=16, weight="bold"),
             text_color="#3b82f6"
-        ).pack(padx=20, pady=(2, 10))
+        )
+        self.lbl_period_amount.pack(padx=20, pady=(2, 10))
         
         # Table
-        self.create_report_table()
-        self.populate_table(self.report_data)
+        self.create_report_table(view)
         
         # Bottom frame
-        bottom_frame = ctk.CTkFrame(self, fg_color="transparent", height=70)
+        bottom_frame = ctk.CTkFrame(view, fg_color="transparent", height=70)
         bottom_frame.pack(fill="x", padx=20, pady=10)
         bottom_frame.pack_propagate(False)
         
         self.lbl_status = ctk.CTkLabel(
             bottom_frame,
-            text=f"Showing {len(self.report_data)} customers for year {year}",
+            text="",
             font=ctk.CTkFont(size=14, weight="bold"),
             text_color=self.colors["text_dark"]
         )
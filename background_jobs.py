@@ -0,0 +1,70 @@
+import threading
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's worker once the job has been cancelled"""
+
+
+class Job:
+    """Handle for one background load started with run_job().
+
+    cancel() makes the worker stop at its next progress() call and
+    guarantees none of its callbacks run afterwards.
+    """
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def check(self):
+        if self._cancelled.is_set():
+            raise JobCancelled()
+
+
+def run_job(widget, work, on_done, on_error=None, on_progress=None):
+    """Run work(progress) on a daemon thread and hand the result to the Tk thread.
+
+    progress(done, total) may be called by work; it raises JobCancelled
+    once the job is cancelled and forwards to on_progress otherwise.
+    on_done(result), on_error(exception) and on_progress(done, total) are
+    scheduled with widget.after() and skipped if the job was cancelled in
+    the meantime.
+    """
+    job = Job()
+
+    def deliver(callback, *args):
+        def call():
+            if not job.cancelled:
+                callback(*args)
+        try:
+            widget.after(0, call)
+        except RuntimeError:
+            # Window already destroyed
+            pass
+
+    def progress(done, total):
+        job.check()
+        if on_progress:
+            deliver(on_progress, done, total)
+
+    def target():
+        try:
+            result = work(progress)
+        except JobCancelled:
+            return
+        except Exception as e:
+            if on_error:
+                deliver(on_error, e)
+            else:
+                print(f"Background job failed: {e}")
+            return
+        deliver(on_done, result)
+
+    threading.Thread(target=target, daemon=True).start()
+    return job
@@ -0,0 +1,68 @@
+"""Lifetime totals: per-customer rescans vs. the app's HistoryIndex.
+
+Usage: python benchmarks/bench_history_totals.py
+"""
+import os
+import time
+import tempfile
+
+from synthetic import make_history
+from openpyxl import load_workbook
+from month_sheets import list_month_files, month_layout
+from history_index import HistoryIndex
+
+
+def legacy_totals(folder, cids):
+    """The old ReportTab.calculate_total_liters loop (customers x months parses)"""
+    result = {}
+    for cid in cids:
+        liters = amount = 0.0
+        for year, month, path in list_month_files(folder):
+            wb = load_workbook(path, data_only=True)
+            ws = wb.active
+            layout = month_layout(year, month)
+            for row_idx in range(2, ws.max_row + 1):
+                if str(ws.cell(row=row_idx, column=2).value).strip() == cid:
+                    liters += float(ws.cell(row=row_idx, column=layout["total_ltr_col"]).value or 0)
+                    amount += float(ws.cell(row=row_idx, column=layout["total_rt_col"]).value or 0)
+                    break
+            wb.close()
+        result[cid] = (liters, amount)
+    return result
+
+
+def run(n_customers, n_months, legacy_limit=20):
+    with tempfile.TemporaryDirectory() as folder:
+        make_history(folder, n_customers, n_months)
+
+        # Cold: every sheet read once; warm: nothing changed, one stat per month
+        index = HistoryIndex(os.path.join(folder, "history_index.json"), folder)
+        t0 = time.perf_counter()
+        index.rebuild()
+        single_pass = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        totals = index.lifetime_totals()
+        warm = time.perf_counter() - t0
+
+        # The legacy loop is too slow to run for every customer; time a
+        # sample and extrapolate linearly (it is exactly linear in customers)
+        sample = [f"C_{i + 1}" for i in range(min(legacy_limit, n_customers))]
+        t0 = time.perf_counter()
+        legacy = legacy_totals(folder, sample)
+        legacy_time = (time.perf_counter() - t0) * n_customers / len(sample)
+
+        for cid in sample:
+            assert abs(legacy[cid][0] - totals[cid][0]) < 1e-6
+
+    print(f"{n_customers:>6} customers x {n_months:>3} months | "
+          f"index build {single_pass:7.2f}s, warm {warm * 1000:6.1f} ms | legacy ~{legacy_time:9.1f}s | "
+          f"x{legacy_time / single_pass:,.0f}")
+
+
+if __name__ == "__main__":
+    print("Scaling with customer count (12 months):")
+    for n in (100, 400, 800):
+        run(n, 12)
+    print("Scaling with month count (800 customers):")
+    for m in (6, 12, 36):
+        run(800, m)
@@ -0,0 +1,86 @@
+"""New month sheet: cell-by-cell template vs. write-only streaming.
+
+Usage: python benchmarks/bench_month_template.py
+"""
+import os
+import time
+import datetime
+import calendar
+import tempfile
+
+import synthetic  # noqa: F401  (puts the repo root on sys.path)
+from openpyxl import Workbook
+from openpyxl.styles import Font, Alignment
+from openpyxl.utils import get_column_letter
+from month_sheets import month_cache, write_month_template
+
+
+def legacy_template(customers, year, month, path, month_rate=0):
+    """The old EntryTab create_monthly_excel_template (>= 500 rows, every cell set)"""
+    days_in_month = calendar.monthrange(year, month)[1]
+    wb = Workbook()
+    ws = wb.active
+    ws.title = f"{year}_{month:02d}"
+    ws['A1'] = 'S.No'
+    ws['B1'] = 'CID'
+    ws['C1'] = 'Name'
+    ws['D1'] = 'Phone'
+    ws['E1'] = month_rate
+    ws['E1'].font = Font(bold=True)
+    col_start = 6
+    col_end = col_start + days_in_month - 1
+    for col in range(col_start, col_end + 1):
+        day_label = datetime.date(year, month, col - col_start + 1).strftime('%d/%m/%y')
+        cell = ws.cell(row=1, column=col, value=day_label)
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal='center')
+        ws.column_dimensions[get_column_letter(col)].width = 8
+    total_ltr_col = col_end + 1
+    total_rt_col = total_ltr_col + 1
+    ws.cell(row=1, column=total_ltr_col, value='Total_LTR').font = Font(bold=True)
+    ws.cell(row=1, column=total_rt_col, value='Total_RT').font = Font(bold=True)
+    for i in range(max(500, len(customers))):
+        row_num = 2 + i
+        ws.cell(row=row_num, column=1, value=i + 1)
+        if i < len(customers):
+            cid, name, phone = customers[i]
+            ws.cell(row=row_num, column=2, value=cid)
+            ws.cell(row=row_num, column=3, value=name)
+            ws.cell(row=row_num, column=4, value=phone)
+        for col in range(col_start, col_end + 1):
+            ws.cell(row=row_num, column=col, value=None)
+        first = get_column_letter(col_start)
+        last = get_column_letter(col_end)
+        ltr = get_column_letter(total_ltr_col)
+        ws.cell(row=row_num, column=total_ltr_col).value = f"=SUM({first}{row_num}:{last}{row_num})"
+        ws.cell(row=row_num, column=total_rt_col).value = f"=IF(ISNUMBER({ltr}{row_num}), {ltr}{row_num}*$E$1, 0)"
+    wb.save(path)
+
+
+def run(n_customers, year=2024, month=1):
+    customers = [(f"C_{i + 1}", f"Customer {i + 1}", f"98{i:08d}") for i in range(n_customers)]
+    with tempfile.TemporaryDirectory() as folder:
+        old_path = os.path.join(folder, "legacy.xlsx")
+        new_path = os.path.join(folder, f"{year}_{month:02d}.xlsx")
+
+        t0 = time.perf_counter()
+        legacy_template(customers, year, month, old_path, 60)
+        legacy_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        write_month_template(new_path, year, month, customers, 60)
+        new_time = time.perf_counter() - t0
+
+        sheet = month_cache.get(new_path, parts=("ids",))
+        assert sheet.cids == [c[0] for c in customers] and sheet.rate == 60
+
+        old_kb = os.path.getsize(old_path) / 1024
+        new_kb = os.path.getsize(new_path) / 1024
+
+    print(f"{n_customers:>6} customers | legacy {legacy_time:6.2f}s {old_kb:8.0f} KB | "
+          f"write-only {new_time:6.2f}s {new_kb:8.0f} KB | x{legacy_time / new_time:,.1f}")
+
+
+if __name__ == "__main__":
+    for n in (100, 1000, 5000):
+        run(n)
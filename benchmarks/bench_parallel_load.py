@@ -0,0 +1,38 @@
+"""Parsing many monthly sheets: serial vs. process pool.
+
+Usage: python benchmarks/bench_parallel_load.py [customers]
+"""
+import os
+import sys
+import time
+import tempfile
+
+from synthetic import make_history
+from month_sheets import load_months, list_month_files, month_cache
+
+
+def timed(files, max_workers):
+    month_cache.invalidate()
+    t0 = time.perf_counter()
+    sheets = load_months(files, max_workers=max_workers)
+    elapsed = time.perf_counter() - t0
+    assert len(sheets) == len(files)
+    return elapsed
+
+
+def run(n_customers, n_months=36):
+    cores = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as folder:
+        make_history(folder, n_customers, n_months)
+        files = list_month_files(folder)
+
+        serial = timed(files, max_workers=1)
+        parallel = timed(files, max_workers=cores)
+
+    print(f"{n_customers:>6} customers x {n_months} months | serial {serial:6.2f}s | "
+          f"{cores} processes {parallel:6.2f}s | x{serial / parallel:,.1f}")
+
+
+if __name__ == "__main__":
+    for n in [int(a) for a in sys.argv[1:]] or [200, 800]:
+        run(n)
@@ -0,0 +1,113 @@
+"""Messages per minute of the real send loop against the local WhatsApp stand-in.
+
+Drives message_transport.send_parallel() with one WhatsAppWebTransport per
+session pointed at benchmarks/mock_whatsapp.py, so changes to waits, pacing
+and the number of sessions can be measured without a phone. Needs selenium
+and Chrome.
+
+Usage: python benchmarks/bench_send_throughput.py [--messages N] [--load-ms MS] [--tick-ms MS]
+       [--invalid-rate R] [--fail-rate R] [--initial-delay S] [--floor S] [--mode url|in-page]
+       [--switch-ms MS] [--sessions N] [--headless]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_whatsapp import MockWhatsApp  # noqa: E402
+from message_transport import (MAX_SESSIONS, AdaptivePacer, WhatsAppWebTransport, combined_latencies,  # noqa: E402
+                               send_parallel)
+
+
+def make_jobs(n):
+    jobs = []
+    for i in range(n):
+        phone = f"9198{i:08d}"
+        customer = {"CID": f"C_{i + 1}", "Name": f"Customer {i + 1}", "Phone": phone}
+        message = (
+            f"🥛 Mock Dairy - Monthly Bill\n\n"
+            f"Dear {customer['Name']},\n\n"
+            f"🥛 Total Milk: {30 + i % 20:.2f} Liters\n"
+            f"💰 Amount Due: ₹{(30 + i % 20) * 60:.2f}\n\n"
+            f"Thank you!"
+        )
+        jobs.append((customer, phone, message))
+    return jobs
+
+
+def local_chrome(headless):
+    def make():
+        from selenium import webdriver
+        options = webdriver.ChromeOptions()
+        if headless:
+            options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        return webdriver.Chrome(options=options)
+    return make
+
+
+def run(args):
+    pacers = [AdaptivePacer(initial=args.initial_delay, floor=args.floor) for _ in range(args.sessions)]
+    jobs = make_jobs(args.messages)
+
+    with MockWhatsApp(load_ms=args.load_ms, tick_ms=args.tick_ms, switch_ms=args.switch_ms,
+                      invalid_rate=args.invalid_rate, fail_rate=args.fail_rate) as mock:
+        transports = [
+            WhatsAppWebTransport(base_url=mock.url, make_driver=local_chrome(args.headless),
+                                 login_timeout=30, mode=args.mode)
+            for _ in range(args.sessions)
+        ]
+        try:
+            for transport in transports:
+                transport.open()
+            failures = []
+            t0 = time.perf_counter()
+            sent, failed, per_session = send_parallel(
+                transports, jobs,
+                on_failed=lambda customer, reason, session: failures.append(reason),
+                pacers=pacers,
+            )
+            elapsed = time.perf_counter() - t0
+        finally:
+            for transport in transports:
+                transport.close()
+
+        expected = {phone: message for _, phone, message in jobs}
+        intact = sum(1 for phone, text, _ in mock.delivered if expected.get(phone) == text)
+
+    print(f"{len(jobs)} messages, {args.mode} mode, {args.sessions} session(s) | load {args.load_ms} ms, "
+          f"switch {args.switch_ms} ms, tick {args.tick_ms} ms, "
+          f"invalid {args.invalid_rate:.0%}, fail {args.fail_rate:.0%} | "
+          f"pacing {args.initial_delay}s -> floor {args.floor}s")
+    print(f"  sent {sent}, failed {failed} in {elapsed:.1f}s -> {len(jobs) / elapsed * 60:.1f} messages/min "
+          f"({elapsed / max(1, len(jobs)):.2f}s per message)")
+    for session, (counts, pacer) in enumerate(zip(per_session, pacers), 1):
+        left = f", left: {counts['left']}" if counts["left"] else ""
+        print(f"  session {session}: sent {counts['sent']}, failed {counts['failed']}, "
+              f"pause ended at {pacer.delay:.2f}s{left}")
+    for mode, (count, average) in combined_latencies(transports).items():
+        print(f"  {mode:>8}: {count} sent, {average:.2f}s per message")
+    print(f"  app loads {mock.page_loads}, chat searches {mock.lookups}")
+    print(f"  server received {len(mock.delivered)}, {intact} with the exact text (newlines kept)")
+    if failures:
+        print(f"  failure reasons: {sorted(set(failures))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--load-ms", type=int, default=1500, help="chat load time of the stand-in")
+    parser.add_argument("--tick-ms", type=int, default=300, help="time from send to tick icon")
+    parser.add_argument("--invalid-rate", type=float, default=0.05)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--initial-delay", type=float, default=3.0, help="pause after the first sent message")
+    parser.add_argument("--floor", type=float, default=1.0, help="shortest pause between messages")
+    parser.add_argument("--mode", choices=WhatsAppWebTransport.MODES, default="in-page")
+    parser.add_argument("--switch-ms", type=int, default=150, help="in-page chat switch time of the stand-in")
+    parser.add_argument("--sessions", type=int, choices=range(1, MAX_SESSIONS + 1), default=1,
+                        help="browser sessions sending side by side")
+    parser.add_argument("--headless", action="store_true")
+    run(parser.parse_args())
@@ -0,0 +1,229 @@
+"""Local stand-in for WhatsApp Web, for measuring the send loop without a phone.
+
+Serves the pages WhatsAppWebTransport drives: a logged-in home page with
+the chat list, and send?phone=... which boots the "app" after a delay and
+then shows either the chat (compose box, send button, message bubbles with
+a clock icon that turns into a tick) or the invalid-number popup. Like
+WhatsApp's editor, the compose box inserts the text of paste events. The chat
+list search finds the chats of valid numbers and opens them in-page, for
+the transport's "in-page" mode. Messages the page sends are posted back
+and collected in MockWhatsApp.delivered.
+
+Usage: python benchmarks/mock_whatsapp.py [port]   (serves until Ctrl+C)
+"""
+import json
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+APP_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>WhatsApp</title>
+<style>
+  body { display: flex; }
+  #side { width: 300px; }
+  footer { display: flex; }
+  [contenteditable] { min-width: 250px; min-height: 30px; border: 1px solid #888; white-space: pre-wrap; }
+</style></head>
+<body>
+<div id="side">
+  <div contenteditable="true" role="textbox" data-tab="3" title="Search input textbox"></div>
+  <div id="pane-side" role="grid"></div>
+</div>
+<div id="app">%(boot_text)s</div>
+<script>
+const PHONE = %(phone)s, OUTCOME = %(outcome)s;
+const LOAD_MS = %(load_ms)d, TICK_MS = %(tick_ms)d, SWITCH_MS = %(switch_ms)d;
+
+function showChat(phone) {
+  const title = "+" + phone;
+  document.getElementById("app").innerHTML =
+    '<div id="main"><header><span></span></header><div id="messages"></div>' +
+    '<footer><div contenteditable="true" role="textbox" data-tab="10"></div>' +
+    '<button aria-label="Send">Send</button></footer></div>';
+  const header = document.querySelector("#main header span");
+  header.setAttribute("title", title);
+  header.textContent = title;
+  const box = document.querySelector("footer [contenteditable]");
+  const send = () => {
+    const text = box.innerText.replace(/\\n$/, "");
+    if (!text.trim()) return;
+    const bubble = document.createElement("div");
+    bubble.className = "message-out";
+    bubble.innerHTML = '<span class="text"></span><span data-icon="msg-time"></span>';
+    bubble.firstChild.textContent = text;
+    document.getElementById("messages").appendChild(bubble);
+    box.innerHTML = "";
+    fetch("/delivered", {method: "POST", body: JSON.stringify({phone: phone, text: text})})
+      .then(() => setTimeout(() => bubble.lastChild.setAttribute("data-icon", "msg-check"), TICK_MS));
+  };
+  box.addEventListener("paste", e => {
+    // The editor inserts the pasted text itself, newlines included
+    e.preventDefault();
+    box.textContent += e.clipboardData.getData("text/plain");
+  });
+  document.querySelector("button[aria-label=Send]").addEventListener("click", send);
+  box.addEventListener("keydown", e => {
+    if (e.key === "Enter" && !e.shiftKey) { e.preventDefault(); send(); }
+  });
+}
+
+// Chat-list search: a number with a chat shows one row titled with the number
+const search = document.querySelector("#side [contenteditable]");
+let searchTimer = null;
+search.addEventListener("input", () => {
+  clearTimeout(searchTimer);
+  const query = search.innerText.replace(/\\D/g, "");
+  const pane = document.getElementById("pane-side");
+  pane.innerHTML = "";
+  if (query.length < 10) return;
+  searchTimer = setTimeout(() => fetch("/lookup?phone=" + query).then(r => r.json()).then(found => {
+    if (!found.chat) {
+      pane.textContent = "No chats, contacts or messages found";
+      return;
+    }
+    const row = document.createElement("div");
+    row.setAttribute("role", "listitem");
+    row.innerHTML = "<span></span>";
+    row.firstChild.setAttribute("title", "+" + query);
+    row.firstChild.textContent = "+" + query;
+    row.addEventListener("click", () => setTimeout(() => showChat(query), SWITCH_MS));
+    pane.appendChild(row);
+  }), 50);
+});
+
+if (PHONE !== null) {
+  setTimeout(() => {
+    if (OUTCOME === "invalid") {
+      document.getElementById("app").innerHTML =
+        '<div role="dialog">Phone number shared via url is invalid.</div>';
+    } else if (OUTCOME === "fail") {
+      // The chat never finishes loading: no footer, no compose box
+      document.getElementById("app").innerHTML = "";
+    } else {
+      showChat(PHONE);
+    }
+  }, LOAD_MS);
+}
+</script>
+</body></html>
+"""
+
+
+def _fraction(phone, salt):
+    """Stable pseudo-random number in [0, 1) for a phone, so a number keeps its fate"""
+    return (zlib.crc32(f"{salt}:{phone}".encode()) % 10000) / 10000
+
+
+class MockWhatsApp:
+    """The stand-in server; use as a context manager or start()/stop().
+
+    load_ms: delay before a send?phone= page shows the chat (app boot).
+    switch_ms: delay before a chat opened from the search shows.
+    tick_ms: delay between sending and the tick icon.
+    invalid_rate: share of numbers that get the invalid-number popup.
+    fail_rate: share of the remaining numbers whose chat never loads.
+    """
+
+    def __init__(self, load_ms=1500, tick_ms=300, invalid_rate=0.0, fail_rate=0.0, switch_ms=150, port=0):
+        self.load_ms = load_ms
+        self.switch_ms = switch_ms
+        self.tick_ms = tick_ms
+        self.invalid_rate = invalid_rate
+        self.fail_rate = fail_rate
+        self.port = port
+        self.delivered = []
+        self.page_loads = 0
+        self.lookups = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def outcome(self, phone):
+        if _fraction(phone, "invalid") < self.invalid_rate:
+            return "invalid"
+        if _fraction(phone, "fail") < self.fail_rate:
+            return "fail"
+        return "ok"
+
+    def start(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, body, content_type="text/html; charset=utf-8"):
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                phone = parse_qs(url.query).get("phone", [""])[0]
+                path = url.path.rstrip("/")
+                if path == "/lookup":
+                    with mock._lock:
+                        mock.lookups += 1
+                    self._reply(json.dumps({"chat": mock.outcome(phone) == "ok"}), "application/json")
+                    return
+
+                sending = path == "/send"
+                with mock._lock:
+                    mock.page_loads += 1
+                self._reply(APP_PAGE % {
+                    "phone": json.dumps(phone if sending else None),
+                    "outcome": json.dumps(mock.outcome(phone) if sending else None),
+                    "boot_text": "Loading..." if sending else "",
+                    "load_ms": mock.load_ms,
+                    "tick_ms": mock.tick_ms,
+                    "switch_ms": mock.switch_ms,
+                })
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    message = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    message = {}
+                if urlparse(self.path).path == "/delivered":
+                    with mock._lock:
+                        mock.delivered.append((message.get("phone"), message.get("text"), time.time()))
+                self._reply("{}", "application/json")
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="MockWhatsApp", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    with MockWhatsApp(port=port) as mock:
+        print(f"Mock WhatsApp Web at {mock.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
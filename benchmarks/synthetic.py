@@ -0,0 +1,38 @@
+"""Synthetic monthly sheets for the benchmark scripts."""
+import os
+import sys
+import random
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from month_sheets import month_layout  # noqa: E402
+
+
+def write_month_sheet(path, year, month, n_customers, rate=60, seed=0):
+    """Write a filled-in YYYY_MM.xlsx with cached totals, like one saved in Excel"""
+    rnd = random.Random(seed)
+    layout = month_layout(year, month)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(f"{year}_{month:02d}")
+    ws.append(["S.No", "CID", "Name", "Phone", rate]
+              + [f"{d:02d}/{month:02d}/{year % 100:02d}" for d in range(1, layout["days"] + 1)]
+              + ["Total_LTR", "Total_RT"])
+    for i in range(n_customers):
+        days = [rnd.choice((None, 0.5, 1, 1.5, 2)) for _ in range(layout["days"])]
+        liters = sum(d or 0 for d in days)
+        ws.append([i + 1, f"C_{i + 1}", f"Customer {i + 1}", f"98{i:08d}", None]
+                  + days + [liters, liters * rate])
+    wb.save(path)
+
+
+def make_history(folder, n_customers, n_months, start_year=2023):
+    """Create n_months consecutive sheets in folder and return their paths"""
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for k in range(n_months):
+        year, month = start_year + k // 12, k % 12 + 1
+        path = os.path.join(folder, f"{year}_{month:02d}.xlsx")
+        write_month_sheet(path, year, month, n_customers, seed=k)
+        paths.append(path)
+    return paths
@@ -0,0 +1,597 @@
+import os
+import json
+import sqlite3
+import threading
+import pandas as pd
+
+
+CUSTOMER_COLUMNS = ["S.No", "CID", "Name", "Phone", "Address", "Cluster"]
+
+
+def _text(value):
+    """Cell value as text for the database (NaN/None become None)"""
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    return str(value)
+
+
+def normalize_key(value):
+    """String key for a CID/phone cell (Excel may hand back ints or floats)"""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return ""
+        if value.is_integer():
+            value = int(value)
+    return str(value).strip()
+
+
+class CustomerRepository:
+    """In-memory copy of the customer master and the deleted-customers file.
+
+    Loaded once and shared by every tab. Mutations are applied in memory and
+    written straight back to disk. If a file is changed behind our back (for
+    example edited in Excel) it is re-read on the next access.
+    """
+
+    def __init__(self, customers_file, deleted_file):
+        self.customers_file = customers_file
+        self.deleted_file = deleted_file
+        self._lock = threading.RLock()
+        self._active = None
+        self._deleted = None
+        self._stamps = {}
+        self._by_cid = {}
+        self._by_phone = {}
+
+    # ---------------------------
+    # Loading
+    # ---------------------------
+    def _stamp(self, path):
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _read(self, path):
+        try:
+            df = pd.read_excel(path, engine="openpyxl")
+        except Exception as e:
+            print(f"Error loading {path}: {e}")
+            df = pd.DataFrame(columns=CUSTOMER_COLUMNS)
+        df = df.reindex(columns=CUSTOMER_COLUMNS)
+        df["CID"] = df["CID"].map(normalize_key).astype(object)
+        df["Phone"] = df["Phone"].map(normalize_key).astype(object)
+        return df
+
+    def _load(self):
+        self._active = self._read(self.customers_file)
+        self._deleted = self._read(self.deleted_file)
+        self._stamps = {
+            self.customers_file: self._stamp(self.customers_file),
+            self.deleted_file: self._stamp(self.deleted_file),
+        }
+        self._reindex()
+
+    def _reindex(self):
+        self._by_cid = {}
+        self._by_phone = {}
+        self._known_cids = set(self._deleted["CID"])
+        self._known_cids.update(self._active["CID"])
+        for rec in self._active.to_dict("records"):
+            if rec["CID"]:
+                self._by_cid[rec["CID"]] = rec
+            if rec["Phone"]:
+                self._by_phone[rec["Phone"]] = rec
+
+    def _ensure_fresh(self):
+        if self._active is None:
+            self._load()
+            return
+        for path, stamp in self._stamps.items():
+            if self._stamp(path) != stamp:
+                self._load()
+                return
+
+    def _write(self, df, path):
+        df.to_excel(path, index=False, engine="openpyxl")
+        self._stamps[path] = self._stamp(path)
+
+    def ensure_files(self):
+        """Create missing or malformed customer workbooks with the expected header"""
+        with self._lock:
+            for path in (self.customers_file, self.deleted_file):
+                ok = False
+                if os.path.exists(path):
+                    try:
+                        columns = pd.read_excel(path, engine="openpyxl", nrows=0).columns.tolist()
+                        ok = columns == CUSTOMER_COLUMNS
+                    except Exception:
+                        ok = False
+                if not ok:
+                    pd.DataFrame(columns=CUSTOMER_COLUMNS).to_excel(path, index=False, engine="openpyxl")
+            self._active = None
+
+    def reload(self):
+        with self._lock:
+            self._load()
+
+    def source_files(self):
+        """Files whose modification means the customer list changed"""
+        return [self.customers_file, self.deleted_file]
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def active(self):
+        """Copy of the active customers as a DataFrame"""
+        with self._lock:
+            self._ensure_fresh()
+            return self._active.copy()
+
+    def deleted(self):
+        """Copy of the deleted customers as a DataFrame"""
+        with self._lock:
+            self._ensure_fresh()
+            return self._deleted.copy()
+
+    def get(self, cid):
+        with self._lock:
+            self._ensure_fresh()
+            rec = self._by_cid.get(normalize_key(cid))
+            return dict(rec) if rec else None
+
+    def find_by_phone(self, phone):
+        with self._lock:
+            self._ensure_fresh()
+            rec = self._by_phone.get(normalize_key(phone))
+            return dict(rec) if rec else None
+
+    def phone_exists(self, phone, exclude_cid=None):
+        rec = self.find_by_phone(phone)
+        return bool(rec) and rec["CID"] != normalize_key(exclude_cid)
+
+    def contact_details(self):
+        """{CID: {'Name', 'Phone', 'Address'}} for every active customer"""
+        with self._lock:
+            self._ensure_fresh()
+            return {
+                cid: {'Name': rec['Name'], 'Phone': rec['Phone'], 'Address': rec['Address']}
+                for cid, rec in self._by_cid.items()
+            }
+
+    def all_cids(self):
+        """CIDs of active and deleted customers"""
+        with self._lock:
+            self._ensure_fresh()
+            return list(self._active["CID"]) + list(self._deleted["CID"])
+
+    def cid_in_use(self, cid):
+        """True if an active or deleted customer already has this CID"""
+        with self._lock:
+            self._ensure_fresh()
+            return normalize_key(cid) in self._known_cids
+
+    # ---------------------------
+    # Mutations
+    # ---------------------------
+    def add(self, cid, name, phone, address, cluster="Default"):
+        with self._lock:
+            self._ensure_fresh()
+            new_row = pd.DataFrame(
+                [[None, normalize_key(cid), name, normalize_key(phone), address, cluster]],
+                columns=CUSTOMER_COLUMNS,
+            )
+            df = pd.concat([self._active, new_row], ignore_index=True)
+            df["S.No"] = range(1, len(df) + 1)
+            self._write(df, self.customers_file)
+            self._active = df
+            self._reindex()
+
+    def update(self, cid, **fields):
+        """Update columns of one active customer, returns the old values"""
+        with self._lock:
+            self._ensure_fresh()
+            cid = normalize_key(cid)
+            mask = self._active["CID"] == cid
+            if not mask.any():
+                raise KeyError(cid)
+            old = self._active.loc[mask].iloc[0].to_dict()
+            df = self._active.copy()
+            for column, value in fields.items():
+                if column == "Phone":
+                    value = normalize_key(value)
+                df.loc[mask, column] = value
+            self._write(df, self.customers_file)
+            self._active = df
+            self._reindex()
+            return old
+
+    def delete(self, cids):
+        """Move customers to the deleted file, returns the removed rows"""
+        with self._lock:
+            self._ensure_fresh()
+            cids = [normalize_key(c) for c in cids]
+            mask = self._active["CID"].isin(cids)
+            removed = self._active[mask].copy()
+
+            deleted_df = pd.concat([self._deleted, removed], ignore_index=True)
+            deleted_df["S.No"] = range(1, len(deleted_df) + 1)
+            self._write(deleted_df, self.deleted_file)
+            self._deleted = deleted_df
+
+            df = self._active[~mask].copy()
+            df["S.No"] = range(1, len(df) + 1)
+            self._write(df, self.customers_file)
+            self._active = df
+            self._reindex()
+            return removed
+
+    def restore(self, rows):
+        """Undo a delete: move rows back from the deleted file to the master"""
+        with self._lock:
+            self._ensure_fresh()
+            rows = rows.reindex(columns=CUSTOMER_COLUMNS)
+            cids = [normalize_key(c) for c in rows["CID"]]
+
+            deleted_df = self._deleted[~self._deleted["CID"].isin(cids)].copy()
+            deleted_df["S.No"] = range(1, len(deleted_df) + 1)
+
+            df = pd.concat([self._active, rows], ignore_index=True)
+            df = df.sort_values("CID").reset_index(drop=True)
+            df["S.No"] = range(1, len(df) + 1)
+
+            self._write(df, self.customers_file)
+            self._write(deleted_df, self.deleted_file)
+            self._active = df
+            self._deleted = deleted_df
+            self._reindex()
+
+    def export_excel(self, path=None, include_deleted=True):
+        """Copy the master to path (it is already stored as Excel)"""
+        with self._lock:
+            path = path or self.customers_file
+            if os.path.abspath(path) != os.path.abspath(self.customers_file):
+                self.active().to_excel(path, index=False, engine="openpyxl")
+            return path
+
+
+class SqliteCustomerRepository:
+    """Customer master stored in a local SQLite database.
+
+    Active and deleted customers live in one table with a deleted flag, so
+    delete/undo/edit are single-row transactional updates instead of
+    rewriting whole workbooks. customers.xlsx and the deleted-customers file
+    are imported automatically the first time the database is created, and
+    export_excel() writes the spreadsheet back on demand.
+
+    Exposes the same methods as CustomerRepository.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_file, customers_file, deleted_file):
+        self.db_file = db_file
+        self.customers_file = customers_file
+        self.deleted_file = deleted_file
+        self._lock = threading.RLock()
+        self._conn = None
+
+    # ---------------------------
+    # Connection / migration
+    # ---------------------------
+    def _connection(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS customers (
+                    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+                    cid        TEXT NOT NULL UNIQUE,
+                    name       TEXT,
+                    phone      TEXT,
+                    address    TEXT,
+                    cluster    TEXT,
+                    deleted    INTEGER NOT NULL DEFAULT 0,
+                    deleted_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_customers_phone ON customers(phone);
+                CREATE INDEX IF NOT EXISTS idx_customers_deleted ON customers(deleted, seq);
+            """)
+            self._conn = conn
+            if conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+                self._migrate_from_excel()
+        return self._conn
+
+    def _migrate_from_excel(self):
+        """One-off import of the legacy Excel files"""
+        conn = self._conn
+        frames = []
+        for path, deleted in ((self.deleted_file, 1), (self.customers_file, 0)):
+            if not os.path.exists(path):
+                continue
+            try:
+                df = pd.read_excel(path, engine="openpyxl").reindex(columns=CUSTOMER_COLUMNS)
+            except Exception as e:
+                print(f"Skipping {path} during migration: {e}")
+                continue
+            frames.append((df, deleted))
+
+        with conn:
+            for df, deleted in frames:
+                for rec in df.to_dict("records"):
+                    cid = normalize_key(rec["CID"])
+                    if not cid:
+                        continue
+                    # Active rows are imported last and win over a stale deleted copy
+                    conn.execute(
+                        "INSERT OR REPLACE INTO customers "
+                        "(cid, name, phone, address, cluster, deleted) VALUES (?, ?, ?, ?, ?, ?)",
+                        (cid, _text(rec["Name"]), normalize_key(rec["Phone"]),
+                         _text(rec["Address"]), _text(rec["Cluster"]) or "Default", deleted),
+                    )
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def ensure_files(self):
+        with self._lock:
+            self._connection()
+
+    def reload(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._connection()
+
+    def source_files(self):
+        """Files whose modification means the customer list changed"""
+        return [self.db_file, self.db_file + "-wal"]
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def _frame(self, deleted):
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT cid, name, phone, address, cluster FROM customers "
+                "WHERE deleted = ? ORDER BY " + ("deleted_at, seq" if deleted else "seq"),
+                (deleted,),
+            ).fetchall()
+        df = pd.DataFrame(
+            [(i, *tuple(r)) for i, r in enumerate(rows, start=1)],
+            columns=CUSTOMER_COLUMNS,
+        )
+        return df
+
+    def active(self):
+        return self._frame(0)
+
+    def deleted(self):
+        return self._frame(1)
+
+    def _one(self, where, value):
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT cid, name, phone, address, cluster FROM customers "
+                f"WHERE deleted = 0 AND {where} = ? ORDER BY seq LIMIT 1",
+                (value,),
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(CUSTOMER_COLUMNS[1:], tuple(row)))
+
+    def get(self, cid):
+        return self._one("cid", normalize_key(cid))
+
+    def find_by_phone(self, phone):
+        return self._one("phone", normalize_key(phone))
+
+    def phone_exists(self, phone, exclude_cid=None):
+        rec = self.find_by_phone(phone)
+        return bool(rec) and rec["CID"] != normalize_key(exclude_cid)
+
+    def contact_details(self):
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT cid, name, phone, address FROM customers WHERE deleted = 0 ORDER BY seq"
+            ).fetchall()
+        return {r["cid"]: {'Name': r["name"], 'Phone': r["phone"], 'Address': r["address"]} for r in rows}
+
+    def all_cids(self):
+        with self._lock:
+            return [r[0] for r in self._connection().execute("SELECT cid FROM customers")]
+
+    def cid_in_use(self, cid):
+        with self._lock:
+            return self._connection().execute(
+                "SELECT 1 FROM customers WHERE cid = ?", (normalize_key(cid),)
+            ).fetchone() is not None
+
+    # ---------------------------
+    # Mutations (one transaction each)
+    # ---------------------------
+    def add(self, cid, name, phone, address, cluster="Default"):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT INTO customers (cid, name, phone, address, cluster) VALUES (?, ?, ?, ?, ?)",
+                    (normalize_key(cid), name, normalize_key(phone), address, cluster),
+                )
+
+    _COLUMN_MAP = {"Name": "name", "Phone": "phone", "Address": "address", "Cluster": "cluster"}
+
+    def update(self, cid, **fields):
+        with self._lock:
+            cid = normalize_key(cid)
+            old = self.get(cid)
+            if old is None:
+                raise KeyError(cid)
+            assignments = []
+            values = []
+            for column, value in fields.items():
+                if column == "Phone":
+                    value = normalize_key(value)
+                assignments.append(f"{self._COLUMN_MAP[column]} = ?")
+                values.append(value)
+            if assignments:
+                conn = self._connection()
+                with conn:
+                    conn.execute(
+                        f"UPDATE customers SET {', '.join(assignments)} WHERE cid = ? AND deleted = 0",
+                        (*values, cid),
+                    )
+            return old
+
+    def delete(self, cids):
+        with self._lock:
+            cids = [normalize_key(c) for c in cids]
+            active = self.active()
+            removed = active[active["CID"].isin(cids)].copy()
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "UPDATE customers SET deleted = 1, deleted_at = datetime('now') "
+                    "WHERE cid = ? AND deleted = 0",
+                    [(c,) for c in cids],
+                )
+            return removed
+
+    def restore(self, rows):
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "UPDATE customers SET deleted = 0, deleted_at = NULL WHERE cid = ?",
+                    [(normalize_key(c),) for c in rows["CID"]],
+                )
+
+    # ---------------------------
+    # Export
+    # ---------------------------
+    def export_excel(self, path=None, include_deleted=True):
+        """Write customers.xlsx (and the deleted file) from the database"""
+        with self._lock:
+            path = path or self.customers_file
+            self.active().to_excel(path, index=False, engine="openpyxl")
+            if include_deleted and os.path.abspath(path) == os.path.abspath(self.customers_file):
+                self.deleted().to_excel(self.deleted_file, index=False, engine="openpyxl")
+            return path
+
+
+def cid_number(cid):
+    """Numeric part of a 'C_n' CID, or None"""
+    cid = str(cid)
+    if not cid.startswith("C_"):
+        return None
+    try:
+        return int(cid.split("_")[1])
+    except (IndexError, ValueError):
+        return None
+
+
+class CidAllocator:
+    """Monotonic C_n allocator backed by a small JSON counter file.
+
+    The counter holds the highest number ever handed out, so deleted CIDs
+    are never reused. It is rebuilt from the customer workbooks only when
+    the file is missing or unreadable.
+    """
+
+    def __init__(self, counter_file, repository):
+        self.counter_file = counter_file
+        self.repository = repository
+        self._lock = threading.Lock()
+        self._last = None
+
+    def _rebuild(self):
+        numbers = [n for n in map(cid_number, self.repository.all_cids()) if n is not None]
+        return max(numbers) if numbers else 0
+
+    def _load(self):
+        try:
+            with open(self.counter_file, "r") as f:
+                last = json.load(f)["last_cid"]
+            if not isinstance(last, int) or last < 0:
+                raise ValueError(f"bad counter {last!r}")
+            return last
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if os.path.exists(self.counter_file):
+                print(f"CID counter unreadable, rebuilding: {e}")
+            last = self._rebuild()
+            self._save(last)
+            return last
+
+    def _save(self, last):
+        tmp = self.counter_file + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"last_cid": last}, f)
+        os.replace(tmp, self.counter_file)
+
+    def _ensure_loaded(self):
+        if self._last is None:
+            self._last = self._load()
+
+    def peek(self):
+        """Next CID that allocate() will return (nothing is reserved)"""
+        with self._lock:
+            self._ensure_loaded()
+            n = self._last + 1
+            while self.repository.cid_in_use(f"C_{n}"):
+                n += 1
+            return f"C_{n}"
+
+    def allocate(self):
+        """Reserve and return the next CID"""
+        with self._lock:
+            self._ensure_loaded()
+            n = self._last + 1
+            # Guards against rows typed into customers.xlsx by hand
+            while self.repository.cid_in_use(f"C_{n}"):
+                n += 1
+            self._save(n)
+            self._last = n
+            return f"C_{n}"
+
+
+_repository = None
+_allocator = None
+_repository_lock = threading.Lock()
+
+
+def get_customer_repository():
+    """Process-wide repository for the configured customer files.
+
+    Uses the SQLite backend (customers.db next to customers.xlsx) unless
+    app_config sets customer_backend = "excel".
+    """
+    global _repository
+    with _repository_lock:
+        if _repository is None:
+            from app_config import app_config
+            customers_file = str(app_config.customers_file)
+            deleted_file = str(app_config.deleted_file)
+            if getattr(app_config, "customer_backend", "sqlite") == "excel":
+                _repository = CustomerRepository(customers_file, deleted_file)
+            else:
+                db_file = os.path.join(
+                    os.path.dirname(os.path.abspath(customers_file)), "customers.db"
+                )
+                _repository = SqliteCustomerRepository(db_file, customers_file, deleted_file)
+        return _repository
+
+
+def get_cid_allocator():
+    """Process-wide CID allocator, counter stored next to customers.xlsx"""
+    global _allocator
+    repository = get_customer_repository()
+    with _repository_lock:
+        if _allocator is None:
+            counter_file = os.path.join(
+                os.path.dirname(os.path.abspath(repository.customers_file)), "cid_counter.json"
+            )
+            _allocator = CidAllocator(counter_file, repository)
+        return _allocator
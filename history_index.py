@@ -0,0 +1,208 @@
+import os
+import json
+import bisect
+import threading
+
+from month_sheets import SUMMARY_DIR, list_month_files, load_month_summaries
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _text(value):
+    return None if value is None else str(value)
+
+
+class HistoryIndex:
+    """Persistent per-CID history kept up to date by month deltas.
+
+    For every monthly sheet the index remembers the workbook's mtime/size,
+    the {CID: [liters, amount]} it contributed and the name/phone it shows
+    for each CID. refresh() re-reads only the sheets whose stamp changed
+    (or that appeared/disappeared) and moves the running lifetime totals by
+    the difference between the old and new contribution, so a visit costs
+    one stat per month plus the changed months.
+
+    It also keeps, per CID, the months it appears in and the name/phone of
+    the latest of those months, so history questions never open a workbook.
+    """
+
+    VERSION = 2
+
+    def __init__(self, index_file, monthly_sheets_path):
+        self.index_file = index_file
+        self.monthly_sheets_path = monthly_sheets_path
+        self._lock = threading.RLock()
+        self._months = None
+        self._totals = None
+        self._appear = None
+
+    def _load(self):
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                raise ValueError(f"version {data.get('version')!r}")
+            self._months = data["months"]
+            self._totals = data["totals"]
+            self._appear = data["appearances"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if os.path.exists(self.index_file):
+                print(f"History index unreadable, rebuilding: {e}")
+            self._months = {}
+            self._totals = {}
+            self._appear = {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+        tmp = self.index_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": self.VERSION, "months": self._months, "totals": self._totals,
+                       "appearances": self._appear}, f, separators=(",", ":"))
+        os.replace(tmp, self.index_file)
+
+    def _link(self, key, entry):
+        """Add a month (already in self._months) to the appearance index"""
+        for cid in entry["totals"]:
+            info = self._appear.setdefault(cid, {"months": [], "name": None, "phone": None})
+            bisect.insort(info["months"], key)
+            if info["months"][-1] == key:
+                info["name"], info["phone"] = entry["contacts"][cid]
+
+    def _unlink(self, key, entry):
+        """Remove a month (already gone from self._months) from the appearance index"""
+        for cid in entry["totals"]:
+            info = self._appear.get(cid)
+            if info is None or key not in info["months"]:
+                continue
+            was_latest = info["months"][-1] == key
+            info["months"].remove(key)
+            if not info["months"]:
+                del self._appear[cid]
+            elif was_latest:
+                info["name"], info["phone"] = self._months[info["months"][-1]]["contacts"][cid]
+
+    def _apply(self, contribution, sign):
+        for cid, (liters, amount) in contribution.items():
+            acc = self._totals.setdefault(cid, [0.0, 0.0])
+            acc[0] += sign * liters
+            acc[1] += sign * amount
+            if sign < 0 and abs(acc[0]) < 1e-9 and abs(acc[1]) < 1e-9:
+                # Keep the index from filling up with all-zero CIDs
+                del self._totals[cid]
+
+    def refresh(self, progress=None):
+        """Apply the deltas of every month added, changed or removed since
+        the last refresh. Changed months are parsed in parallel;
+        progress(done, total) reports on them. Returns the list of month
+        keys that changed."""
+        with self._lock:
+            if self._months is None:
+                self._load()
+
+            changed = []
+            present = set()
+            stale = []
+            for year, month, filepath in list_month_files(self.monthly_sheets_path):
+                key = f"{year}_{month:02d}"
+                present.add(key)
+                try:
+                    stamp = _stamp(filepath)
+                except OSError as e:
+                    print(f"Error reading {os.path.basename(filepath)}: {e}")
+                    continue
+                entry = self._months.get(key)
+                if not (entry and entry["stamp"] == stamp):
+                    stale.append((year, month, filepath, key, stamp))
+
+            summaries = load_month_summaries([f[:3] for f in stale], progress=progress)
+            for year, month, filepath, key, stamp in stale:
+                summary = summaries.get(filepath)
+                if summary is None:
+                    continue
+                entry = self._months.get(key)
+                # Only the first row of a CID counts (cid_index), as in the old per-customer lookup
+                new_entry = {
+                    "stamp": stamp,
+                    "totals": {cid: [float(summary.liters[i]), float(summary.amounts[i])]
+                               for cid, i in summary.cid_index.items()},
+                    "contacts": {cid: [_text(summary.names[i]), _text(summary.phones[i])]
+                                 for cid, i in summary.cid_index.items()},
+                }
+                if entry:
+                    del self._months[key]
+                    self._unlink(key, entry)
+                    self._apply(entry["totals"], -1)
+                self._months[key] = new_entry
+                self._link(key, new_entry)
+                self._apply(new_entry["totals"], +1)
+                changed.append(key)
+
+            for key in [k for k in self._months if k not in present]:
+                entry = self._months.pop(key)
+                self._unlink(key, entry)
+                self._apply(entry["totals"], -1)
+                changed.append(key)
+
+            if changed:
+                self._save()
+            return changed
+
+    def lifetime_totals(self, progress=None):
+        """{CID: (liters, amount)} over every monthly sheet, after a refresh"""
+        with self._lock:
+            self.refresh(progress)
+            return {cid: (acc[0], acc[1]) for cid, acc in self._totals.items()}
+
+    def appearances(self, cid):
+        """{first_seen, last_seen, months, name, phone} for a CID, or None if
+        it is on no monthly sheet. Months are 'YYYY_MM' keys, oldest first;
+        name/phone are as written on the latest of them."""
+        with self._lock:
+            self.refresh()
+            info = self._appear.get(str(cid).strip())
+            return self._describe(info) if info else None
+
+    def all_appearances(self, progress=None):
+        """appearances() for every CID found on any monthly sheet"""
+        with self._lock:
+            self.refresh(progress)
+            return {cid: self._describe(info) for cid, info in self._appear.items()}
+
+    @staticmethod
+    def _describe(info):
+        return {
+            "first_seen": info["months"][0],
+            "last_seen": info["months"][-1],
+            "months": list(info["months"]),
+            "name": info["name"],
+            "phone": info["phone"],
+        }
+
+    def rebuild(self):
+        """Forget everything and re-read all months"""
+        with self._lock:
+            self._months = {}
+            self._totals = {}
+            self._appear = {}
+            self.refresh()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_history_index():
+    """Process-wide history index stored with the closed-month summaries"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            from app_config import app_config
+            monthly_sheets_path = str(app_config.monthly_sheets_path)
+            _index = HistoryIndex(
+                os.path.join(monthly_sheets_path, SUMMARY_DIR, "history_index.json"),
+                monthly_sheets_path,
+            )
+        return _index
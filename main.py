@@ -1,16 +1,17 @@
-import sys
+import time
+_STARTED = time.perf_counter()
+
+import multiprocessing
 import customtkinter as ctk
 from tkinter import messagebox
-from tabs.customer_tab import CustomerTab
-from tabs.entry_tab import EntryTab
-from tabs.message_tab import MessageTab
-from tabs.reports_tab import ReportTab
 from app_config import app_config
 from setup_dialog import SetupDialog
+# The tabs (and pandas/openpyxl/numpy with them) are imported when first opened, see _get_tab()
 
 
 class MainApp(ctk.CTk):
     def __init__(self):
+        self._startup_marks = [("imports", time.perf_counter())]
         super().__init__()
         self.title("Milk Delivery App")
         self.state("zoomed")
@@ -46,39 +47,16 @@ class MainApp(ctk.CTk):
         if app_config.is_first_run():
             self.after(500, self.show_setup_dialog)
 
-        # Initialize tabs
-        try:
-            self.customer_tab = CustomerTab(
-                self.container, colors=self.colors, back_callback=self.show_home)
-            self.entry_tab = EntryTab(
-                self.container, colors=self.colors, back_callback=self.show_home, 
-                customer_tab=self.customer_tab)
-            self.message_tab = MessageTab(
-                self.container, colors=self.colors, back_callback=self.show_home, 
-                customer_tab=self.customer_tab)
-            self.report_tab = ReportTab(
-                self.container, colors=self.colors, back_callback=self.show_home)
-            self.customer_tab.on_customer_change = self.refresh_all_customer_data
-
-        except Exception as e:
-            print(f"Error initializing tabs: {e}")
-            import traceback
-            traceback.print_exc()
-            messagebox.showerror(
-                "Initialization Error",
-                f"Failed to initialize application:\n{e}\n\nPlease contact support."
-            )
-            sys.exit(1)
-
-        # Initially hide all tabs
-        self.customer_tab.pack_forget()
-        self.entry_tab.pack_forget()
-        self.message_tab.pack_forget()
-        self.report_tab.pack_forget()
+        # Tabs are built the first time their home-screen card is clicked (_get_tab)
+        self.customer_tab = None
+        self.entry_tab = None
+        self.message_tab = None
+        self.report_tab = None
+        self._startup_marks.append(("main window", time.perf_counter()))
 
-        # Show splash screen
         # Show splash screen
         self.show_splash_screen()
+        self._startup_marks.append(("splash screen", time.perf_counter()))
         self.tree = None
         self.after(0, lambda: self.state("zoomed"))
     
@@ -94,6 +72,68 @@ class MainApp(ctk.CTk):
 
 
     
+    def _get_tab(self, name):
+        """Return tab name ("customer_tab", ...), importing and building it on first use.
+
+        Returns None if the tab could not be built (the error was shown).
+        """
+        tab = getattr(self, name)
+        if tab is not None:
+            return tab
+
+        start = time.perf_counter()
+        self.configure(cursor="watch")
+        self.update_idletasks()
+        try:
+            if name == "customer_tab":
+                from tabs.customer_tab import CustomerTab
+                tab = CustomerTab(self.container, colors=self.colors, back_callback=self.show_home)
+                tab.on_customer_change = self.refresh_all_customer_data
+            elif name == "entry_tab":
+                from tabs.entry_tab import EntryTab
+                tab = EntryTab(
+                    self.container, colors=self.colors, back_callback=self.show_home,
+                    customer_tab=self.customer_tab)
+            elif name == "message_tab":
+                from tabs.message_tab import MessageTab
+                tab = MessageTab(
+                    self.container, colors=self.colors, back_callback=self.show_home,
+                    customer_tab=self.customer_tab)
+            else:
+                from tabs.reports_tab import ReportTab
+                tab = ReportTab(self.container, colors=self.colors, back_callback=self.show_home)
+
+            if name in ("message_tab", "report_tab"):
+                # Reports/Messages update themselves when a sheet is saved in Excel
+                from sheet_watcher import get_sheet_watcher
+                get_sheet_watcher().start(self)
+        except Exception as e:
+            print(f"Error initializing {name}: {e}")
+            import traceback
+            traceback.print_exc()
+            messagebox.showerror(
+                "Initialization Error",
+                f"Failed to open this section:\n{e}\n\nPlease contact support."
+            )
+            return None
+        finally:
+            self.configure(cursor="")
+
+        tab.pack_forget()
+        setattr(self, name, tab)
+        print(f"Startup: {name} built on first use in {time.perf_counter() - start:.2f}s")
+        return tab
+
+    def _report_startup(self):
+        """Print how long each startup step took, once the home screen is drawn"""
+        self._startup_marks.append(("home screen interactive", time.perf_counter()))
+        print("Startup timing (seconds since launch):")
+        previous = _STARTED
+        for label, at in self._startup_marks:
+            print(f"  {label:<26}{at - _STARTED:7.2f}  (+{at - previous:.2f})")
+            previous = at
+        print(f"  (includes the splash animation, {self.SPLASH_MS / 1000:.1f}s)")
+
     def _begin_container_build(self):
         """Hide main container while building a page"""
         self.container.pack_forget()
@@ -159,6 +199,9 @@ class MainApp(ctk.CTk):
         setup = SetupDialog(self)
         self.wait_window(setup)
 
+    # Length of the splash dot animation in milliseconds (see animate_dots)
+    SPLASH_MS = 500 + 3 * 300 + 500
+
     def show_splash_screen(self):
         """Show welcome splash screen"""
         splash_frame = ctk.CTkFrame(self.container, fg_color="#ffffff")
@@ -225,6 +268,8 @@ class MainApp(ctk.CTk):
     def transition_to_home(self, splash_frame):
         splash_frame.pack_forget()
         self.show_home()
+        # after_idle runs once the home screen has been laid out and drawn
+        self.after_idle(self._report_startup)
 
 
     
@@ -724,6 +769,9 @@ class MainApp(ctk.CTk):
 
     def show_customer_tab(self):
         """Show customer tab"""
+        tab = self._get_tab("customer_tab")
+        if tab is None:
+            return
         try:
             self.home_frame.pack_forget()
         except:
@@ -741,10 +789,13 @@ class MainApp(ctk.CTk):
         except:
             pass
         
-        self.customer_tab.pack(fill="both", expand=True)
+        tab.pack(fill="both", expand=True)
 
     def show_entry_tab(self):
         """Show entry tab"""
+        tab = self._get_tab("entry_tab")
+        if tab is None:
+            return
         try:
             self.home_frame.pack_forget()
         except:
@@ -762,10 +813,13 @@ class MainApp(ctk.CTk):
         except:
             pass
         
-        self.entry_tab.pack(fill="both", expand=True)
+        tab.pack(fill="both", expand=True)
 
     def show_message_tab(self):
         """Show message tab"""
+        tab = self._get_tab("message_tab")
+        if tab is None:
+            return
         try:
             self.home_frame.pack_forget()
         except:
@@ -783,10 +837,15 @@ class MainApp(ctk.CTk):
         except:
             pass
         
-        self.message_tab.pack(fill="both", expand=True)
+        tab.pack(fill="both", expand=True)
+        # Sheets saved in Excel while the tab was hidden
+        tab.apply_missed_changes()
 
     def show_report_tab(self):
         """Show report tab"""
+        tab = self._get_tab("report_tab")
+        if tab is None:
+            return
         try:
             self.home_frame.pack_forget()
         except:
@@ -805,7 +864,9 @@ class MainApp(ctk.CTk):
             pass
         
         try:
-            self.report_tab.pack(fill="both", expand=True)
+            tab.pack(fill="both", expand=True)
+            # Sheets saved in Excel (e.g. from the Entry tab) while the tab was hidden
+            tab.apply_missed_changes()
         except Exception as e:
             print(f"Error showing report tab: {e}")
             import traceback
@@ -813,6 +874,8 @@ class MainApp(ctk.CTk):
 
 
 if __name__ == "__main__":
+    # Report loading parses sheets in worker processes (needed for frozen builds)
+    multiprocessing.freeze_support()
     ctk.set_appearance_mode("Light")
     ctk.set_default_color_theme("blue")
     
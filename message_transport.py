@@ -0,0 +1,565 @@
+import threading
+import time
+from collections import deque
+
+
+WHATSAPP_WEB = "https://web.whatsapp.com"
+# WhatsApp links at most four browsers to one phone, so four sessions send at once
+MAX_SESSIONS = 4
+
+
+def wait_for(condition, timeout, poll=0.1):
+    """Poll condition() until it returns something truthy and return that.
+
+    Returns None once timeout seconds pass. Exceptions from condition()
+    (stale or missing elements while the page changes) count as "not yet".
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            value = condition()
+        except Exception:
+            value = None
+        if value:
+            return value
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(poll)
+
+
+class SendError(Exception):
+    """A message was not delivered; str() is the reason kept in the unsent list"""
+
+
+class InvalidNumber(SendError):
+    def __init__(self, reason="Invalid phone number"):
+        super().__init__(reason)
+
+
+class MessageTransport:
+    """How a bill reaches a customer.
+
+    open() gets the transport ready (browser launched, logged in) and
+    raises on failure; is_open() tells whether that is still the case.
+    send(phone, message, name) delivers one message and raises
+    InvalidNumber or SendError; name is the customer's name, a hint some
+    transports use to find the chat. send_batch() drives any transport, so
+    the WhatsApp Web one can be swapped for a stand-in when measuring
+    sending speed.
+
+    last_latency is (mode, seconds) of the last successful send and
+    latencies() sums them up per mode, for the progress window.
+    """
+
+    last_latency = None
+
+    def open(self):
+        pass
+
+    def is_open(self):
+        return True
+
+    def send(self, phone, message, name=None):
+        raise NotImplementedError
+
+    def latencies(self):
+        """{mode: (messages, average seconds)} over the successful sends so far"""
+        return {}
+
+    def close(self):
+        pass
+
+
+def chrome_driver(on_retry=None, profile_dir=None):
+    """undetected-chromedriver Chrome with the options used for WhatsApp Web.
+
+    on_retry() is called before the second attempt, which lets
+    undetected-chromedriver download a driver matching the installed Chrome.
+    profile_dir is the Chrome profile to use (and keep the WhatsApp login
+    in); each sending session needs its own. None means a throwaway profile.
+    """
+    import undetected_chromedriver as uc
+
+    options = uc.ChromeOptions()
+    options.add_argument("--start-maximized")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--no-sandbox")
+    profile = {"user_data_dir": str(profile_dir)} if profile_dir else {}
+    try:
+        return uc.Chrome(options=options, version_main=None, **profile)  # Auto-detect Chrome version
+    except Exception:
+        if on_retry:
+            on_retry()
+        return uc.Chrome(options=options, version_main=None, driver_executable_path=None, **profile)
+
+
+class WhatsAppWebTransport(MessageTransport):
+    """Sends through WhatsApp Web in a Selenium-driven Chrome.
+
+    base_url is the WhatsApp Web origin; benchmarks point it at the local
+    stand-in (benchmarks/mock_whatsapp.py), which serves the same page flow.
+    on_login() is called once the page is open and before waiting for the
+    chat list, so the caller can ask the user to scan the QR code.
+
+    mode "url" opens every chat with send?phone=..., which reloads the
+    whole WhatsApp Web app. mode "in-page" searches the chat list of the
+    loaded app instead and only reloads (the "url" way) when the search
+    does not lead to a chat that is certainly this number's: one titled
+    with the number, or the only new search result with the customer's name.
+    """
+
+    # Multiple selectors for chat panel (future-proof)
+    CHAT_PANEL_SELECTORS = [
+        "//div[@id='pane-side']",
+        "//div[@id='side']",
+        "//div[@role='grid']",
+        "//div[contains(@class, 'chat-list')]",
+    ]
+    INPUT_SELECTORS = [
+        "//div[@contenteditable='true'][@data-tab='10']",
+        "//footer//div[@contenteditable='true']",
+        # Not just any textbox: the chat-list search box is one too
+        "//div[@id='main']//div[@role='textbox']",
+    ]
+    SEND_BUTTON = "//button[@aria-label='Send']"
+    OUTGOING = "//div[contains(@class, 'message-out')]"
+    # Single/double tick; the clock icon (msg-time) means not sent yet
+    TICK = ".//span[contains(@data-icon, 'check')]"
+    SEARCH_SELECTORS = [
+        "//div[@id='side']//div[@contenteditable='true']",
+        "//div[@id='side']//input[@type='text']",
+    ]
+    RESULT_TITLES = "//div[@id='pane-side']//span[@title]"
+    CHAT_TITLE = "//div[@id='main']//header//span[@title]"
+
+    # A paste event carrying the text: WhatsApp's editor inserts it as it
+    # would a Ctrl+V, newlines included, but the OS clipboard is never used
+    PASTE_SCRIPT = """
+        const box = arguments[0], data = new DataTransfer();
+        data.setData("text/plain", arguments[1]);
+        box.focus();
+        box.dispatchEvent(new ClipboardEvent("paste", {clipboardData: data, bubbles: true, cancelable: true}));
+    """
+    # Fallback for one line; send_keys can't type emoji (ChromeDriver only types the BMP)
+    INSERT_SCRIPT = """
+        arguments[0].focus();
+        document.execCommand("insertText", false, arguments[1]);
+    """
+
+    MODES = ("url", "in-page")
+
+    def __init__(self, base_url=WHATSAPP_WEB, make_driver=chrome_driver, on_login=None, login_timeout=120,
+                 load_timeout=15, confirm_timeout=10, mode="url", search_timeout=3):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown send mode: {mode}")
+        self.base_url = base_url.rstrip("/")
+        self.make_driver = make_driver
+        self.on_login = on_login
+        self.login_timeout = login_timeout
+        self.load_timeout = load_timeout
+        self.confirm_timeout = confirm_timeout
+        self.mode = mode
+        self.search_timeout = search_timeout
+        self.driver = None
+        self._latency = {}
+
+        # selenium imports are lazy to avoid failing import if not installed
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.keys import Keys
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        self.By = By
+        self.Keys = Keys
+        self.WebDriverWait = WebDriverWait
+        self.EC = EC
+
+    def is_open(self):
+        if not self.driver:
+            return False
+        try:
+            _ = self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def open(self):
+        if self.is_open():
+            return
+        self.close()
+        self.driver = self.make_driver()
+        try:
+            self.driver.maximize_window()
+        except Exception:
+            # Headless browsers have no window to maximize
+            pass
+        self.driver.get(self.base_url)
+        if self.on_login:
+            self.on_login()
+
+        wait = self.WebDriverWait(self.driver, self.login_timeout)
+        for selector in self.CHAT_PANEL_SELECTORS:
+            try:
+                wait.until(self.EC.presence_of_element_located((self.By.XPATH, selector)))
+                break
+            except Exception:
+                continue
+        else:
+            raise SendError("Could not detect WhatsApp login")
+
+    def close(self):
+        try:
+            if self.driver:
+                self.driver.quit()
+        except Exception:
+            pass
+        self.driver = None
+
+    def _chat_state(self):
+        """The compose box once the chat is ready, "invalid" for the invalid-number popup"""
+        input_box = self._first_displayed(self.INPUT_SELECTORS)
+        if input_box is not None:
+            return input_box
+        page_text = self.driver.find_element(self.By.TAG_NAME, "body").text.lower()
+        if "invalid" in page_text or "not on whatsapp" in page_text:
+            return "invalid"
+        return None
+
+    def _outgoing(self):
+        return self.driver.find_elements(self.By.XPATH, self.OUTGOING)
+
+    def _first_displayed(self, selectors):
+        for selector in selectors:
+            elements = self.driver.find_elements(self.By.XPATH, selector)
+            if elements and elements[0].is_displayed():
+                return elements[0]
+        return None
+
+    def _open_chat_by_url(self, phone):
+        """Load send?phone=... (reloads the app); returns the compose box"""
+        self.driver.get(f"{self.base_url}/send?phone={phone}")
+
+        # Whichever shows first: the compose box or the invalid-number popup
+        state = wait_for(self._chat_state, self.load_timeout)
+        if state is None:
+            raise SendError("Input not found")
+        if state == "invalid":
+            raise InvalidNumber()
+        return state
+
+    def _search_result(self, phone, name, stale):
+        """The chat-list row that is certainly phone's chat, or None"""
+        digits = phone[-10:]
+        by_name = []
+        for row in self.driver.find_elements(self.By.XPATH, self.RESULT_TITLES):
+            title = row.get_attribute("title") or ""
+            if "".join(ch for ch in title if ch.isdigit()).endswith(digits):
+                # Unsaved numbers are titled with the number itself
+                return row
+            if name and row not in stale and title.strip().lower() == name.strip().lower():
+                by_name.append(row)
+        # A saved contact only counts when exactly one search result carries the name
+        return by_name[0] if len(by_name) == 1 else None
+
+    def _open_chat_in_page(self, phone, name):
+        """Switch to phone's chat inside the loaded app; returns the compose box or None"""
+        if not self.driver.current_url.startswith(self.base_url):
+            return None
+        search = self._first_displayed(self.SEARCH_SELECTORS)
+        if search is None:
+            return None
+
+        # Rows on screen before the search can't vouch for a name match
+        stale = set(self.driver.find_elements(self.By.XPATH, self.RESULT_TITLES))
+        search.click()
+        search.send_keys(self.Keys.CONTROL, "a")
+        search.send_keys(self.Keys.BACKSPACE)
+        search.send_keys(phone)
+
+        row = wait_for(lambda: self._search_result(phone, name, stale), self.search_timeout)
+        if row is None:
+            return None
+        title = row.get_attribute("title")
+        row.click()
+
+        def opened():
+            header = self.driver.find_elements(self.By.XPATH, self.CHAT_TITLE)
+            if not header or header[0].get_attribute("title") != title:
+                return None
+            return self._first_displayed(self.INPUT_SELECTORS)
+
+        return wait_for(opened, self.load_timeout)
+
+    def send(self, phone, message, name=None):
+        if not self.driver:
+            raise SendError("Driver not initialized")
+
+        started = time.perf_counter()
+        try:
+            input_box = None
+            mode = "url"
+            if self.mode == "in-page":
+                input_box = self._open_chat_in_page(phone, name)
+                if input_box is not None:
+                    mode = "in-page"
+            if input_box is None:
+                # Not found in the chat list: reload with the number
+                input_box = self._open_chat_by_url(phone)
+
+            self._type_and_send(input_box, message)
+
+        except SendError:
+            raise
+        except Exception as e:
+            # Only the page (_chat_state) can tell a number is invalid; Selenium's
+            # own errors ("invalid session id" from a closed Chrome...) are not
+            raise SendError(f"Failed: {e}")
+
+        seconds = time.perf_counter() - started
+        self.last_latency = (mode, seconds)
+        count, total = self._latency.get(mode, (0, 0.0))
+        self._latency[mode] = (count + 1, total + seconds)
+        return True
+
+    def _type_and_send(self, input_box, message):
+        input_box.click()
+        wait_for(lambda: self.driver.switch_to.active_element == input_box, 2)
+        bubbles_before = len(self._outgoing())
+
+        if not self._enter_text(input_box, message):
+            raise SendError("Message not typed")
+
+        # The send button replaces the mic icon once there is text
+        send_btn = wait_for(lambda: self.driver.find_element(self.By.XPATH, self.SEND_BUTTON), 1)
+        if send_btn is not None:
+            send_btn.click()
+        else:
+            input_box.send_keys(self.Keys.ENTER)
+
+        # Sent = a new outgoing bubble carrying a tick
+        def ticked():
+            bubbles = self._outgoing()
+            return len(bubbles) > bubbles_before and bubbles[-1].find_elements(self.By.XPATH, self.TICK)
+
+        if wait_for(ticked, self.confirm_timeout):
+            return
+        if len(self._outgoing()) > bubbles_before:
+            # Still on the clock icon: WhatsApp has queued it and will deliver it
+            return
+        raise SendError("Message not sent")
+
+    def _enter_text(self, input_box, message):
+        """Put message into the compose box, newlines kept, without the clipboard.
+
+        Sessions share no state here, so any number of them can type at once
+        and the operator can keep copying and pasting during a batch.
+        """
+        self.driver.execute_script(self.PASTE_SCRIPT, input_box, message)
+        if wait_for(lambda: input_box.text.strip(), 1):
+            return True
+
+        # The editor ignored the paste: insert line by line instead
+        for i, line in enumerate(message.split("\n")):
+            if i:
+                # Shift+Enter starts a new line; Enter alone would send
+                input_box.send_keys(self.Keys.SHIFT, self.Keys.ENTER)
+            if line:
+                self.driver.execute_script(self.INSERT_SCRIPT, input_box, line)
+        return bool(wait_for(lambda: input_box.text.strip(), 2))
+
+    def latencies(self):
+        return {mode: (count, total / count) for mode, (count, total) in self._latency.items()}
+
+
+def combined_latencies(transports):
+    """latencies() of several transports merged into one {mode: (messages, average seconds)}"""
+    totals = {}
+    for transport in transports:
+        for mode, (count, average) in transport.latencies().items():
+            messages, seconds = totals.get(mode, (0, 0.0))
+            totals[mode] = (messages + count, seconds + count * average)
+    return {mode: (messages, seconds / messages) for mode, (messages, seconds) in totals.items()}
+
+
+class AdaptivePacer:
+    """Pause between messages: shorter while sends succeed, longer after errors.
+
+    After a sent message the pause is the current delay, which then shrinks
+    by speedup down to floor. A failed send multiplies it by backoff (up to
+    ceiling), since failures in a row usually mean WhatsApp is slowing us
+    down. Invalid numbers say nothing about the rate and only pause floor.
+    """
+
+    def __init__(self, initial=3.0, floor=1.0, ceiling=30.0, speedup=0.8, backoff=2.0):
+        self.floor = floor
+        self.ceiling = ceiling
+        self.speedup = speedup
+        self.backoff = backoff
+        self.delay = max(floor, initial)
+
+    def record(self, outcome):
+        """Register "sent", "invalid" or "error"; returns the pause to take now"""
+        if outcome == "sent":
+            pause = self.delay
+            self.delay = max(self.floor, self.delay * self.speedup)
+            return pause
+        if outcome == "error":
+            self.delay = min(self.ceiling, self.delay * self.backoff)
+            return self.delay
+        return self.floor
+
+
+# Rough time per message for estimates before any batch has been timed
+ESTIMATED_SECONDS_PER_MESSAGE = 6
+
+
+def send_batch(transport, jobs, on_progress=None, on_sent=None, on_failed=None,
+               should_stop=None, is_paused=None, pacer=None):
+    """Send every (customer, phone, message) of jobs through transport, in order.
+
+    A job without a phone fails as "Invalid number" without being sent.
+    on_progress(position, total, customer) is called before each job,
+    on_sent(customer) and on_failed(customer, reason) after it; all of them
+    run on the calling thread. should_stop() ends the batch before the next
+    job and is_paused() holds it. pacer (an AdaptivePacer by default) sets
+    the pause after each job. Returns (sent, failed) counts.
+    """
+    def one_session(callback):
+        # send_parallel appends the session index; a single session has no use for it
+        return (lambda *args: callback(*args[:-1])) if callback else None
+
+    sent, failed, _ = send_parallel(
+        [transport], jobs,
+        on_progress=one_session(on_progress),
+        on_sent=one_session(on_sent),
+        on_failed=one_session(on_failed),
+        should_stop=should_stop,
+        is_paused=is_paused,
+        pacers=[pacer or AdaptivePacer()],
+    )
+    return sent, failed
+
+
+def send_parallel(transports, jobs, on_progress=None, on_sent=None, on_failed=None,
+                  should_stop=None, is_paused=None, pacers=None):
+    """Send jobs through several transports at once, one thread per transport.
+
+    Every session takes the next (customer, phone, message) from one shared
+    queue, so a slow session simply ends up with fewer. Each has its own
+    pacer (pacers[i], an AdaptivePacer by default) and its own counts. A
+    session whose transport stops working (is_open() is false after an
+    error, e.g. its Chrome window was closed) puts the job back for the
+    others and leaves; jobs still queued when the last session leaves fail
+    as "No sending session left".
+
+    Callbacks are those of send_batch with the session's index appended:
+    on_progress(position, total, customer, session), on_sent(customer,
+    session) and on_failed(customer, reason, session). They run on the
+    session threads but never at the same time, so they may update shared
+    lists without locking. should_stop() and is_paused() apply to every
+    session. With a single transport everything runs on the calling thread.
+
+    Returns (sent, failed, per_session), per_session holding a
+    {"sent", "failed", "left"} dict for each transport; "left" is the reason
+    the session stopped early, or None.
+    """
+    transports = list(transports)
+    jobs = list(jobs)
+    total = len(jobs)
+    pacers = list(pacers) if pacers else [AdaptivePacer() for _ in transports]
+    stats = [{"sent": 0, "failed": 0, "left": None} for _ in transports]
+    queue = deque(jobs)
+    lock = threading.Lock()
+    state = {"position": 0, "active": len(transports), "error": None}
+
+    def stopping():
+        return state["error"] is not None or bool(should_stop and should_stop())
+
+    def work(session):
+        transport, pacer, counts = transports[session], pacers[session], stats[session]
+        while not stopping():
+            if is_paused and is_paused():
+                time.sleep(0.25)
+                continue
+
+            with lock:
+                if not queue:
+                    break
+                job = queue.popleft()
+                state["position"] += 1
+                position = state["position"]
+                if on_progress:
+                    on_progress(position, total, job[0], session)
+            customer, phone, message = job
+
+            if not phone:
+                with lock:
+                    counts["failed"] += 1
+                    if on_failed:
+                        on_failed(customer, "Invalid number", session)
+                continue
+
+            try:
+                transport.send(phone, message, name=customer.get("Name"))
+            except Exception as e:
+                reason = str(e)
+                if not transport.is_open():
+                    # The session is gone, whatever the error says: let the others send it
+                    with lock:
+                        queue.appendleft(job)
+                        state["position"] -= 1
+                        counts["left"] = reason
+                    break
+                with lock:
+                    counts["failed"] += 1
+                    if on_failed:
+                        on_failed(customer, reason, session)
+                pause = pacer.record("invalid" if isinstance(e, InvalidNumber) else "error")
+            else:
+                with lock:
+                    counts["sent"] += 1
+                    if on_sent:
+                        on_sent(customer, session)
+                pause = pacer.record("sent")
+
+            if queue:
+                time.sleep(pause)
+
+        with lock:
+            state["active"] -= 1
+            if state["active"] or not counts["left"] or stopping():
+                return
+            # Last session out: what is left can't be sent
+            while queue:
+                customer = queue.popleft()[0]
+                state["position"] += 1
+                counts["failed"] += 1
+                if on_progress:
+                    on_progress(state["position"], total, customer, session)
+                if on_failed:
+                    on_failed(customer, "No sending session left", session)
+
+    def run(session):
+        try:
+            work(session)
+        except Exception as e:
+            # A failing callback ends every session; the error is re-raised below
+            with lock:
+                if state["error"] is None:
+                    state["error"] = e
+
+    if len(transports) == 1:
+        work(0)
+    else:
+        threads = [
+            threading.Thread(target=run, args=(session,), name=f"send-session-{session + 1}", daemon=True)
+            for session in range(len(transports))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if state["error"] is not None:
+            raise state["error"]
+
+    return sum(c["sent"] for c in stats), sum(c["failed"] for c in stats), stats
@@ -0,0 +1,589 @@
+import os
+import json
+import calendar
+import datetime
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+import numpy as np
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment
+from openpyxl.utils import get_column_letter
+
+
+# Fixed layout of every YYYY_MM.xlsx created by EntryTab:
+# A=S.No, B=CID, C=Name, D=Phone, E1=rate, F.. = one column per day,
+# then Total_LTR and Total_RT
+CID_COL = 2
+NAME_COL = 3
+PHONE_COL = 4
+DAY_COL_START = 6
+
+# Closed-month summaries live in this subfolder of the monthly sheets folder
+SUMMARY_DIR = "summaries"
+
+# Empty rows (S.No and total formulas only) left below the customers of a
+# new month sheet for entries typed straight into Excel
+SPARE_ROWS = 50
+
+
+def parse_month_filename(filename):
+    """Return (year, month) for a 'YYYY_MM.xlsx' name, or None"""
+    if not filename.endswith('.xlsx'):
+        return None
+    parts = filename[:-len('.xlsx')].split('_')
+    if len(parts) != 2:
+        return None
+    try:
+        year, month = int(parts[0]), int(parts[1])
+    except ValueError:
+        return None
+    if not 1 <= month <= 12:
+        return None
+    return year, month
+
+
+def month_layout(year, month):
+    """Column positions (1-based) for a month sheet"""
+    days_in_month = calendar.monthrange(year, month)[1]
+    col_end = DAY_COL_START + days_in_month - 1
+    return {
+        "days": days_in_month,
+        "col_start": DAY_COL_START,
+        "col_end": col_end,
+        "total_ltr_col": col_end + 1,
+        "total_rt_col": col_end + 2,
+    }
+
+
+def list_month_files(monthly_sheets_path):
+    """List (year, month, filepath) for every monthly sheet, oldest first"""
+    found = []
+    if not os.path.exists(monthly_sheets_path):
+        return found
+    for filename in os.listdir(monthly_sheets_path):
+        ym = parse_month_filename(filename)
+        if ym:
+            found.append((ym[0], ym[1], os.path.join(monthly_sheets_path, filename)))
+    found.sort()
+    return found
+
+
+_HEADER_FONT = Font(bold=True)
+_HEADER_ALIGN = Alignment(horizontal='center')
+
+
+@lru_cache(maxsize=32)
+def _template_spec(year, month):
+    """Header labels, column widths and per-row formula patterns for a month"""
+    layout = month_layout(year, month)
+    first = get_column_letter(layout["col_start"])
+    last = get_column_letter(layout["col_end"])
+    ltr = get_column_letter(layout["total_ltr_col"])
+    day_labels = tuple(datetime.date(year, month, d).strftime('%d/%m/%y')
+                       for d in range(1, layout["days"] + 1))
+    widths = tuple((get_column_letter(c), 8) for c in range(layout["col_start"], layout["col_end"] + 1))
+    widths += ((ltr, 15), (get_column_letter(layout["total_rt_col"]), 15))
+    return {
+        "title": f"{year}_{month:02d}",
+        "days": layout["days"],
+        "day_labels": day_labels,
+        "widths": widths,
+        "ltr_formula": f"=SUM({first}{{0}}:{last}{{0}})",
+        "rt_formula": f"=IF(ISNUMBER({ltr}{{0}}), {ltr}{{0}}*$E$1, 0)",
+    }
+
+
+def total_formulas(year, month, row):
+    """(Total_LTR, Total_RT) formulas for one row of a month sheet"""
+    spec = _template_spec(year, month)
+    return spec["ltr_formula"].format(row), spec["rt_formula"].format(row)
+
+
+def write_month_template(path, year, month, customers, month_rate=0, spare_rows=SPARE_ROWS):
+    """Create a new YYYY_MM.xlsx with a write-only workbook.
+
+    customers is an iterable of (cid, name, phone). Rows are streamed to
+    disk in one pass; day cells are left out entirely instead of being
+    written as blanks. spare_rows empty rows follow the customers.
+    """
+    spec = _template_spec(year, month)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(spec["title"])
+    # Column widths have to be set before the first row is written
+    for letter, width in spec["widths"]:
+        ws.column_dimensions[letter].width = width
+
+    def bold(value, centered=False):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.font = _HEADER_FONT
+        if centered:
+            cell.alignment = _HEADER_ALIGN
+        return cell
+
+    ws.append(['S.No', 'CID', 'Name', 'Phone', bold(month_rate)]
+              + [bold(label, centered=True) for label in spec["day_labels"]]
+              + [bold('Total_LTR'), bold('Total_RT')])
+
+    blank_days = [None] * spec["days"]
+    ltr_formula = spec["ltr_formula"]
+    rt_formula = spec["rt_formula"]
+    row_num = 1
+    for row_num, (cid, name, phone) in enumerate(customers, start=2):
+        ws.append([row_num - 1, cid, name, phone, None] + blank_days
+                  + [ltr_formula.format(row_num), rt_formula.format(row_num)])
+    for row_num in range(row_num + 1, row_num + 1 + spare_rows):
+        ws.append([row_num - 1, None, None, None, None] + blank_days
+                  + [ltr_formula.format(row_num), rt_formula.format(row_num)])
+
+    wb.save(path)
+
+
+def _to_float(value):
+    """Numeric cell value as float, or None for blanks and text"""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Parts of a month sheet a caller can ask for. "ids" = Name/Phone,
+# "days" = the daily quantity block. The CID column and E1 rate are
+# always read.
+ALL_PARTS = frozenset(("ids", "days"))
+
+
+class SheetReader:
+    """Read-only, streaming access to the active sheet of a workbook.
+
+    Cells are produced row by row as the XML is parsed and only for the
+    requested columns, so the full cell object graph is never built.
+    With data_only=False formula cells come back as their '=...' text.
+    """
+
+    def __init__(self, filepath, data_only=True):
+        self.filepath = filepath
+        self.data_only = data_only
+        self.wb = None
+        self.ws = None
+
+    def __enter__(self):
+        self.wb = load_workbook(self.filepath, read_only=True, data_only=self.data_only,
+                                keep_links=False)
+        self.ws = self.wb.active
+        # Don't trust the stored <dimension>; read until the last row
+        self.ws.reset_dimensions()
+        return self
+
+    def __exit__(self, *exc):
+        self.wb.close()
+        return False
+
+    def cell(self, row, column):
+        for values in self.ws.iter_rows(min_row=row, max_row=row, min_col=column,
+                                        max_col=column, values_only=True):
+            return values[0] if values else None
+        return None
+
+    def rows(self, columns, min_row=2):
+        """Yield (row_number, values) with values in the order of columns"""
+        lo, hi = min(columns), max(columns)
+        width = hi - lo + 1
+        offsets = [c - lo for c in columns]
+        for row_num, row in enumerate(self.ws.iter_rows(min_row=min_row, min_col=lo, max_col=hi,
+                                                        values_only=True), start=min_row):
+            if len(row) < width:
+                row = tuple(row) + (None,) * (width - len(row))
+            yield row_num, tuple(row[i] for i in offsets)
+
+
+class MonthSheet:
+    """Parsed contents of one YYYY_MM.xlsx.
+
+    Rows with a CID are kept in sheet order. quantities is a days x customers
+    matrix (blank or text cells are 0). Attributes for parts that were not
+    requested are None. Totals come from bill_month, never from the
+    Total_LTR/Total_RT values Excel caches on save.
+    """
+
+    __slots__ = ("year", "month", "parts", "rate", "rows", "cids", "names", "phones",
+                 "cid_index", "quantities")
+
+    def __init__(self, year, month, parts=ALL_PARTS):
+        self.year = year
+        self.month = month
+        self.parts = frozenset(parts)
+        self.rate = 0.0
+        self.rows = []
+        self.cids = []
+        self.names = None
+        self.phones = None
+        self.cid_index = {}
+        self.quantities = None
+
+    def __len__(self):
+        return len(self.cids)
+
+
+def parse_month_sheet(filepath, year, month, parts=ALL_PARTS):
+    """Parse a monthly workbook into a MonthSheet in a single streaming pass.
+
+    Only the columns behind the requested parts are materialised.
+    """
+    parts = frozenset(parts)
+    layout = month_layout(year, month)
+
+    columns = [CID_COL]
+    if "ids" in parts:
+        columns += [NAME_COL, PHONE_COL]
+    day_pos = len(columns)
+    if "days" in parts:
+        columns += list(range(layout["col_start"], layout["col_end"] + 1))
+
+    sheet = MonthSheet(year, month, parts)
+    names, phones, day_rows = [], [], []
+
+    with SheetReader(filepath) as reader:
+        sheet.rate = _to_float(reader.cell(1, 5)) or 0.0
+
+        for row_num, values in reader.rows(columns):
+            cid = values[0]
+            if cid is None:
+                continue
+            cid_str = str(cid).strip()
+            if not cid_str:
+                continue
+
+            sheet.cid_index.setdefault(cid_str, len(sheet.cids))
+            sheet.rows.append(row_num)
+            sheet.cids.append(cid_str)
+            if "ids" in parts:
+                names.append(values[1])
+                phones.append(values[2])
+            if "days" in parts:
+                day_rows.append([_to_float(v) or 0.0 for v in values[day_pos:]])
+
+    if "ids" in parts:
+        sheet.names = names
+        sheet.phones = phones
+    if "days" in parts:
+        if day_rows:
+            sheet.quantities = np.array(day_rows, dtype=np.float64).T
+        else:
+            sheet.quantities = np.zeros((layout["days"], 0), dtype=np.float64)
+    return sheet
+
+
+class MonthSheetCache:
+    """LRU cache of parsed monthly sheets keyed by path, mtime and size.
+
+    A sheet is parsed again only after the file on disk changes (e.g. the
+    operator saved it in Excel), or when a caller needs a part that the
+    cached copy was parsed without. Shared by all tabs through month_cache.
+    """
+
+    def __init__(self, max_entries=24):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def peek(self, filepath, parts=ALL_PARTS):
+        """The cached sheet if it is current and has the parts, else None (never parses)"""
+        filepath = os.path.abspath(filepath)
+        st = os.stat(filepath)
+        with self._lock:
+            entry = self._entries.get(filepath)
+            if entry and entry[0] == (st.st_mtime_ns, st.st_size) and frozenset(parts) <= entry[1].parts:
+                self._entries.move_to_end(filepath)
+                return entry[1]
+        return None
+
+    def put(self, filepath, stamp, sheet):
+        """Store a sheet parsed elsewhere (e.g. in a worker process) under the
+        (mtime_ns, size) stamp the file had before it was parsed"""
+        filepath = os.path.abspath(filepath)
+        with self._lock:
+            self._entries[filepath] = (stamp, sheet)
+            self._entries.move_to_end(filepath)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, filepath, year=None, month=None, parts=ALL_PARTS):
+        filepath = os.path.abspath(filepath)
+        if year is None or month is None:
+            ym = parse_month_filename(os.path.basename(filepath))
+            if not ym:
+                raise ValueError(f"Not a monthly sheet: {filepath}")
+            year, month = ym
+        parts = frozenset(parts)
+
+        st = os.stat(filepath)
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            entry = self._entries.get(filepath)
+            if entry and entry[0] == stamp:
+                if parts <= entry[1].parts:
+                    self._entries.move_to_end(filepath)
+                    return entry[1]
+                # Same file, re-read with everything needed so far
+                parts = parts | entry[1].parts
+
+        sheet = parse_month_sheet(filepath, year, month, parts)
+        self.put(filepath, stamp, sheet)
+        return sheet
+
+    def invalidate(self, filepath=None):
+        with self._lock:
+            if filepath is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(filepath), None)
+
+
+month_cache = MonthSheetCache()
+
+
+def load_months(files, parts=ALL_PARTS, progress=None, max_workers=None):
+    """Parse several monthly sheets into month_cache, across processes.
+
+    files is a list of (year, month, filepath). Sheets already cached are
+    not parsed again. The rest are parsed in a process pool (openpyxl is
+    CPU bound, so threads would not help); with one core, a single file or
+    a broken pool they are parsed serially instead. progress(done, total)
+    is called after each file; an exception it raises aborts the load.
+
+    Returns {filepath: MonthSheet}; files that fail to parse are reported
+    and left out.
+    """
+    results = {}
+    pending = []
+    for year, month, filepath in files:
+        try:
+            sheet = month_cache.peek(filepath, parts)
+        except OSError as e:
+            print(f"Error reading {os.path.basename(filepath)}: {e}")
+            continue
+        if sheet is not None:
+            results[filepath] = sheet
+        else:
+            pending.append((year, month, filepath))
+
+    total = len(results) + len(pending)
+    done = len(results)
+    if progress:
+        progress(done, total)
+
+    workers = min(max_workers or os.cpu_count() or 1, len(pending))
+    if workers > 1:
+        # Parsed or failed in the pool, so a serial fallback skips (and doesn't recount) them
+        finished = set()
+        pool = None
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            futures = {}
+            for year, month, filepath in pending:
+                st = os.stat(filepath)
+                future = pool.submit(parse_month_sheet, filepath, year, month, parts)
+                futures[future] = (filepath, (st.st_mtime_ns, st.st_size))
+            for future in as_completed(futures):
+                filepath, stamp = futures[future]
+                try:
+                    sheet = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    print(f"Error reading {os.path.basename(filepath)}: {e}")
+                else:
+                    month_cache.put(filepath, stamp, sheet)
+                    results[filepath] = sheet
+                finished.add(filepath)
+                done += 1
+                if progress:
+                    progress(done, total)
+            return results
+        except (BrokenProcessPool, OSError) as e:
+            # Pool could not start (or died); finish whatever is left in-process
+            print(f"Parallel load failed, continuing serially: {e}")
+            pending = [f for f in pending if f[2] not in finished]
+        finally:
+            if pool is not None:
+                # Don't keep parsing for a caller that gave up (e.g. progress raised)
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    for year, month, filepath in pending:
+        try:
+            results[filepath] = month_cache.get(filepath, year, month, parts)
+        except Exception as e:
+            print(f"Error reading {os.path.basename(filepath)}: {e}")
+        done += 1
+        if progress:
+            progress(done, total)
+    return results
+
+
+def bill_month(sheet, rates=None):
+    """(liters, amounts) arrays with one entry per row of a parsed sheet.
+
+    Both are computed from the daily quantity block in one vectorised step,
+    so they are right whether or not the workbook was ever saved in Excel.
+    rates defaults to the sheet's E1 rate; it may also be a single number,
+    a {CID: rate} mapping (CIDs not in it use E1) or one rate per row.
+    """
+    if sheet.quantities is None:
+        raise ValueError("bill_month needs a sheet parsed with the 'days' part")
+    liters = sheet.quantities.sum(axis=0)
+    if rates is None:
+        rates = sheet.rate
+    elif isinstance(rates, dict):
+        rates = [rates.get(cid, sheet.rate) for cid in sheet.cids]
+    return liters, liters * np.asarray(rates, dtype=np.float64)
+
+
+class MonthSummary:
+    """Final per-row figures of a month, all that yearly/lifetime reports need.
+
+    Either computed from a parsed sheet or loaded from the JSON written when
+    the month was closed (closed=True). days is the number of days with a
+    delivery.
+    """
+
+    __slots__ = ("year", "month", "rate", "closed", "cids", "names", "phones", "cid_index",
+                 "liters", "amounts", "days")
+
+    @classmethod
+    def from_sheet(cls, sheet):
+        summary = cls()
+        summary.year = sheet.year
+        summary.month = sheet.month
+        summary.rate = sheet.rate
+        summary.closed = False
+        summary.cids = list(sheet.cids)
+        summary.names = list(sheet.names)
+        summary.phones = list(sheet.phones)
+        summary.cid_index = dict(sheet.cid_index)
+        summary.liters, summary.amounts = bill_month(sheet)
+        summary.days = (sheet.quantities > 0).sum(axis=0)
+        return summary
+
+    @classmethod
+    def from_json(cls, data):
+        summary = cls()
+        summary.year = data["year"]
+        summary.month = data["month"]
+        summary.rate = data["rate"]
+        summary.closed = True
+        summary.cids = data["cids"]
+        summary.names = data["names"]
+        summary.phones = data["phones"]
+        summary.cid_index = {}
+        for i, cid in enumerate(summary.cids):
+            summary.cid_index.setdefault(cid, i)
+        summary.liters = np.array(data["liters"], dtype=np.float64)
+        summary.amounts = np.array(data["amounts"], dtype=np.float64)
+        summary.days = np.array(data["days"], dtype=np.int64)
+        return summary
+
+    def to_json(self):
+        return {
+            "year": self.year,
+            "month": self.month,
+            "rate": self.rate,
+            "cids": self.cids,
+            "names": [None if v is None else str(v) for v in self.names],
+            "phones": [None if v is None else str(v) for v in self.phones],
+            "liters": self.liters.tolist(),
+            "amounts": self.amounts.tolist(),
+            "days": self.days.tolist(),
+        }
+
+
+def summary_path(filepath):
+    """Where the closed-month summary of a YYYY_MM.xlsx is kept"""
+    folder, filename = os.path.split(os.path.abspath(filepath))
+    return os.path.join(folder, SUMMARY_DIR, os.path.splitext(filename)[0] + ".json")
+
+
+def is_month_closed(filepath):
+    return os.path.exists(summary_path(filepath))
+
+
+def close_month(filepath, year, month):
+    """Freeze a month's final figures into its summary file.
+
+    Reports use the summary instead of the workbook from then on, as long
+    as the workbook is not modified again.
+    """
+    summary = MonthSummary.from_sheet(month_cache.get(filepath, year, month))
+    summary.closed = True
+    st = os.stat(filepath)
+    data = summary.to_json()
+    data["source"] = [st.st_mtime_ns, st.st_size]
+    data["closed_at"] = datetime.datetime.now().isoformat(timespec="seconds")
+
+    path = summary_path(filepath)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
+    return summary
+
+
+def reopen_month(filepath):
+    """Drop a month's summary so reports read the workbook again"""
+    try:
+        os.remove(summary_path(filepath))
+    except FileNotFoundError:
+        pass
+
+
+def load_month_summary(filepath):
+    """The closed-month summary, or None if the month is open or the
+    workbook was saved again after it was closed"""
+    try:
+        with open(summary_path(filepath), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable summary for {os.path.basename(filepath)}: {e}")
+        return None
+    st = os.stat(filepath)
+    if data.get("source") != [st.st_mtime_ns, st.st_size]:
+        print(f"{os.path.basename(filepath)} changed after it was closed; reading the workbook")
+        return None
+    return MonthSummary.from_json(data)
+
+
+def load_month_summaries(files, progress=None, max_workers=None):
+    """{filepath: MonthSummary} for several (year, month, filepath) entries.
+
+    Closed months come from their summary files; the rest are parsed with
+    load_months (in parallel). progress(done, total) covers both.
+    """
+    summaries = {}
+    open_files = []
+    for year, month, filepath in files:
+        try:
+            summary = load_month_summary(filepath)
+        except OSError as e:
+            print(f"Error reading {os.path.basename(filepath)}: {e}")
+            continue
+        if summary is not None:
+            summaries[filepath] = summary
+        else:
+            open_files.append((year, month, filepath))
+
+    closed = len(summaries)
+    relay = (lambda done, total: progress(closed + done, closed + total)) if progress else None
+    for filepath, sheet in load_months(open_files, progress=relay, max_workers=max_workers).items():
+        summaries[filepath] = MonthSummary.from_sheet(sheet)
+    return summaries
@@ -0,0 +1,212 @@
+import math
+
+
+def normalize(value):
+    """Lowercase, trimmed text of a field; '' for empty cells"""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        if math.isnan(value):
+            return ""
+        if value.is_integer():
+            # Phones read back from Excel as 9876543210.0
+            value = int(value)
+    return " ".join(str(value).lower().split())
+
+
+def contact_fields(record):
+    """CID, name, phone and address of a report/customer dict"""
+    return (
+        record.get("CID", record.get("cid")),
+        record.get("Name", record.get("name")),
+        record.get("Phone", record.get("phone")),
+        record.get("Address", record.get("address")),
+    )
+
+
+def record_keys(records, fields=contact_fields):
+    """Stable keys for a list of records: the CID, suffixed for repeats"""
+    keys = []
+    seen = {}
+    for idx, record in enumerate(records):
+        key = normalize(fields(record)[0]) or f"#{idx}"
+        count = seen.get(key, 0)
+        seen[key] = count + 1
+        keys.append(key if not count else f"{key}#{count + 1}")
+    return keys
+
+
+class SearchIndex:
+    """Substring search over CID, name, phone and address.
+
+    Each record is reduced once to its normalized fields joined by a
+    separator no query can contain, so a hit never spans two fields. A
+    trigram index narrows queries of 3+ characters to the records that
+    contain every trigram of the query; shorter queries check all records.
+
+    sync() re-indexes only the records whose text changed, so callers can
+    hand it the full list after every reload. generation changes whenever
+    the content does, which lets LiveSearch know its previous hits are
+    stale.
+    """
+
+    SEP = "\n"
+
+    def __init__(self, fields=contact_fields):
+        self.fields = fields
+        self.generation = 0
+        self._text = {}
+        self._grams = {}
+
+    def __len__(self):
+        return len(self._text)
+
+    def _key_text(self, record):
+        return self.SEP.join(normalize(v) for v in self.fields(record))
+
+    @staticmethod
+    def _trigrams(text):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def _add(self, key, text):
+        self._text[key] = text
+        for gram in self._trigrams(text):
+            self._grams.setdefault(gram, set()).add(key)
+
+    def _drop(self, key):
+        text = self._text.pop(key)
+        for gram in self._trigrams(text):
+            postings = self._grams.get(gram)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._grams[gram]
+
+    def update(self, key, record):
+        """Index or re-index one record"""
+        text = self._key_text(record)
+        if self._text.get(key) == text:
+            return False
+        if key in self._text:
+            self._drop(key)
+        self._add(key, text)
+        self.generation += 1
+        return True
+
+    def remove(self, key):
+        if key in self._text:
+            self._drop(key)
+            self.generation += 1
+
+    def sync(self, items):
+        """Make the index hold exactly items, an iterable of (key, record).
+
+        Returns how many records were added, changed or removed.
+        """
+        changed = 0
+        present = set()
+        for key, record in items:
+            present.add(key)
+            changed += self.update(key, record)
+        for key in [k for k in self._text if k not in present]:
+            self.remove(key)
+            changed += 1
+        return changed
+
+    def search(self, query, within=None):
+        """Keys of the records containing query in any field.
+
+        within, if given, is a set of keys known to contain every hit (the
+        hits of a shorter query that this one extends).
+        """
+        query = normalize(query)
+        if not query:
+            return set(self._text) if within is None else set(within)
+        if within is not None:
+            candidates = within
+        elif len(query) >= 3:
+            postings = sorted((self._grams.get(g, ()) for g in self._trigrams(query)), key=len)
+            if not postings[0]:
+                return set()
+            candidates = set(postings[0]).intersection(*postings[1:])
+        else:
+            candidates = self._text
+        text = self._text
+        return {key for key in candidates if key in text and query in text[key]}
+
+
+class LiveSearch:
+    """Debounced search-as-you-type from an entry into a SearchIndex.
+
+    Every key release restarts a short timer; when it fires the query runs
+    and on_results(query, keys, explicit) is called on the Tk thread. keys
+    is None when the query is shorter than min_chars (show everything).
+    A query that contains the previous one is answered from the previous
+    hits instead of the whole index. run(explicit=True) searches right away,
+    for a Search button or Enter.
+    """
+
+    def __init__(self, entry, index, on_results, delay_ms=250, min_chars=1):
+        self.entry = entry
+        self.index = index
+        self.on_results = on_results
+        self.delay_ms = delay_ms
+        self.min_chars = min_chars
+        self._after = None
+        self._last = None
+        entry.bind("<KeyRelease>", self._on_key)
+        entry.bind("<Return>", lambda e: self.run(explicit=True))
+
+    def query(self):
+        return normalize(self.entry.get())
+
+    def _on_key(self, event):
+        if self._after is not None:
+            self.entry.after_cancel(self._after)
+        self._after = self.entry.after(self.delay_ms, self.run)
+
+    def reset(self):
+        """Forget the previous hits (e.g. after the entry was cleared)"""
+        if self._after is not None:
+            self.entry.after_cancel(self._after)
+            self._after = None
+        self._last = None
+
+    def hits(self):
+        """Keys matching the entry's query, or None if it is too short"""
+        query = self.query()
+        if len(query) < self.min_chars:
+            self._last = None
+            return None
+        last = self._last
+        within = None
+        if last and last[1] == self.index.generation:
+            if last[0] == query:
+                return last[2]
+            if last[0] in query:
+                within = last[2]
+        keys = self.index.search(query, within)
+        self._last = (query, self.index.generation, keys)
+        return keys
+
+    def matching(self, keys, records):
+        """records (parallel to keys) that match the entry's query"""
+        hits = self.hits()
+        if hits is None:
+            return list(records)
+        return [r for k, r in zip(keys, records) if k in hits]
+
+    def run(self, explicit=False):
+        if self._after is not None:
+            self.entry.after_cancel(self._after)
+            self._after = None
+        previous = self._last
+        try:
+            keys = self.hits()
+        except Exception:
+            # Entry destroyed while the timer was pending
+            return
+        if not explicit and self._last is previous:
+            # Same query over the same data (or still too short): nothing to redo
+            return
+        self.on_results(self.query(), keys, explicit)
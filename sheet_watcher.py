@@ -0,0 +1,150 @@
+import os
+import queue
+import threading
+from collections import namedtuple
+
+from month_sheets import list_month_files, month_cache, parse_month_filename
+
+
+# kind is "month" (sheet added or saved), "month_removed" or "customers".
+# year/month are None for customer events.
+ChangeEvent = namedtuple("ChangeEvent", "kind path year month")
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+
+
+class SheetWatcher:
+    """Polls the monthly sheets folder and the customer files for changes.
+
+    Polling and re-parsing happen on a daemon thread, so the Tk loop never
+    waits on disk. A changed month sheet is parsed into month_cache before
+    its event is delivered, which makes the subscriber's own month_cache.get
+    a cache hit. Events reach subscribers on the Tk thread through after().
+    """
+
+    def __init__(self, monthly_sheets_path, customer_files, interval=1.5):
+        self.monthly_sheets_path = monthly_sheets_path
+        self.customer_files = list(customer_files)
+        self.interval = interval
+        self._subscribers = []
+        self._events = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+        self._widget = None
+        self._month_stamps = {}
+        self._customer_stamps = {}
+
+    def subscribe(self, callback):
+        """callback(event) is called on the Tk thread for every change"""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def start(self, widget, deliver_ms=250):
+        """Start polling; widget is any Tk widget used to schedule delivery"""
+        if self._thread is not None:
+            return
+        self._widget = widget
+        self._deliver_ms = deliver_ms
+        # Baseline, so files that already exist don't fire on startup
+        self._month_stamps = {fp: _stamp(fp) for _, _, fp in list_month_files(self.monthly_sheets_path)}
+        self._customer_stamps = {fp: _stamp(fp) for fp in self.customer_files}
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="SheetWatcher", daemon=True)
+        self._thread.start()
+        self._widget.after(self._deliver_ms, self._deliver)
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    # ---------------------------
+    # Background thread
+    # ---------------------------
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Sheet watcher error: {e}")
+
+    def poll(self):
+        """Check every watched file once and queue events for the changes"""
+        seen = set()
+        for year, month, filepath in list_month_files(self.monthly_sheets_path):
+            seen.add(filepath)
+            stamp = _stamp(filepath)
+            if stamp is None or self._month_stamps.get(filepath) == stamp:
+                continue
+            try:
+                month_cache.get(filepath, year, month)
+            except Exception as e:
+                # Usually Excel is still writing it; try again next poll
+                print(f"Sheet watcher could not read {os.path.basename(filepath)}: {e}")
+                continue
+            self._month_stamps[filepath] = stamp
+            self._events.put(ChangeEvent("month", filepath, year, month))
+
+        for filepath in list(self._month_stamps):
+            if filepath not in seen:
+                del self._month_stamps[filepath]
+                month_cache.invalidate(filepath)
+                year, month = parse_month_filename(os.path.basename(filepath))
+                self._events.put(ChangeEvent("month_removed", filepath, year, month))
+
+        changed = None
+        for filepath in self.customer_files:
+            stamp = _stamp(filepath)
+            if self._customer_stamps.get(filepath) != stamp:
+                self._customer_stamps[filepath] = stamp
+                changed = filepath
+        if changed:
+            self._events.put(ChangeEvent("customers", changed, None, None))
+
+    # ---------------------------
+    # Tk thread
+    # ---------------------------
+    def _deliver(self):
+        if self._thread is None:
+            return
+        try:
+            while True:
+                event = self._events.get_nowait()
+                for callback in list(self._subscribers):
+                    try:
+                        callback(event)
+                    except Exception as e:
+                        print(f"Sheet change handler failed: {e}")
+        except queue.Empty:
+            pass
+        try:
+            self._widget.after(self._deliver_ms, self._deliver)
+        except RuntimeError:
+            pass
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def get_sheet_watcher():
+    """Process-wide watcher for the configured monthly sheets and customer files"""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            from app_config import app_config
+            from customer_store import get_customer_repository
+            _watcher = SheetWatcher(
+                str(app_config.monthly_sheets_path),
+                get_customer_repository().source_files(),
+            )
+        return _watcher
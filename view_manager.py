@@ -0,0 +1,64 @@
+import customtkinter as ctk
+
+
+class ViewManager:
+    """Keeps every screen of a tab alive and switches between them by packing.
+
+    show(name, build) builds the screen with build(frame) the first time
+    only; after that it just packs the existing frame again and hides the
+    previous one with pack_forget(). Callers re-bind data to the screen's
+    widgets after show().
+
+    Tab attributes named in attrs (self.tree, self.ent_search, ...) that a
+    builder assigns belong to that screen: they are recorded when it is
+    built and put back on the tab each time it is shown, so tab methods
+    always act on the widgets that are visible.
+    """
+
+    def __init__(self, host, attrs=()):
+        self.host = host
+        self.attrs = tuple(attrs)
+        self._views = {}
+        self.current = None
+
+    def show(self, name, build):
+        """Show screen name, building it if needed. Returns True if it was just built."""
+        view = self._views.get(name)
+        built = view is None or not view["frame"].winfo_exists()
+        if built:
+            before = {attr: getattr(self.host, attr, None) for attr in self.attrs}
+            frame = ctk.CTkFrame(self.host, fg_color="transparent", corner_radius=0)
+            build(frame)
+            view = {
+                "frame": frame,
+                "attrs": {
+                    attr: getattr(self.host, attr)
+                    for attr in self.attrs
+                    if getattr(self.host, attr, None) is not before[attr]
+                },
+            }
+            self._views[name] = view
+        else:
+            for attr, value in view["attrs"].items():
+                setattr(self.host, attr, value)
+
+        if self.current != name:
+            self.hide()
+            view["frame"].pack(fill="both", expand=True)
+            self.current = name
+        return built
+
+    def hide(self):
+        """Unpack the current screen (it stays built)"""
+        view = self._views.get(self.current)
+        if view is not None and view["frame"].winfo_exists():
+            view["frame"].pack_forget()
+        self.current = None
+
+    def discard(self, name):
+        """Destroy a screen so the next show() builds it again"""
+        view = self._views.pop(name, None)
+        if self.current == name:
+            self.current = None
+        if view is not None and view["frame"].winfo_exists():
+            view["frame"].destroy()
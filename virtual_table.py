@@ -0,0 +1,298 @@
+from tkinter import ttk
+
+
+class VirtualTable(ttk.Treeview):
+    """ttk.Treeview that only materializes the rows on screen.
+
+    Rows live in a Python list; a small pool of tree items, one per visible
+    line, is rewritten as the view scrolls. Loading, filtering or refreshing
+    thousands of customers therefore costs a few dozen Tk calls instead of
+    one insert/delete per customer.
+
+    Scrolling (scrollbar, mouse wheel) and Up/Down/PageUp/PageDown/Home/End
+    are handled here. The current row is a data index (see current()), not
+    an item id, because item ids are reused for whatever row is on screen.
+    Use identify_region()/identify_column() as usual and index_at(y) instead
+    of identify_row().
+
+    formatter(index, values), if given, returns the values actually drawn
+    for a row, so a column derived from other state (a checkbox) costs
+    nothing for rows that are off screen.
+    """
+
+    BINDTAG = "VirtualTable"
+
+    def __init__(self, master, current_tag=None, formatter=None, **kw):
+        self._yscrollcommand = kw.pop("yscrollcommand", None)
+        super().__init__(master, **kw)
+        self.current_tag = current_tag
+        self.formatter = formatter
+        self._rows = []
+        self._tags = []
+        self._top = 0
+        self._current = None
+        self._slots = []
+        self._heading = None
+        self._rowheight = None
+
+        # Our bindings sit between the instance's and the Treeview class's,
+        # so callers can still bind the same events on the widget
+        tags = list(self.bindtags())
+        tags.insert(tags.index("Treeview"), self.BINDTAG)
+        self.bindtags(tuple(tags))
+        if not self.bind_class(self.BINDTAG):
+            _bind_class(self)
+
+    # ---------------------------
+    # Data
+    # ---------------------------
+    @property
+    def rows(self):
+        """The row list; call refresh() after changing it in place"""
+        return self._rows
+
+    def row_count(self):
+        return len(self._rows)
+
+    def row(self, index):
+        return self._rows[index]
+
+    def set_rows(self, rows, tags=None, keep_position=False):
+        """Replace every row. tags[i] is the tag tuple of row i.
+
+        keep_position keeps the scroll offset and current row (clamped),
+        for refreshes of the same list; otherwise the view goes to the top
+        with no current row.
+        """
+        self._rows = list(rows)
+        self._tags = list(tags) if tags is not None else [()] * len(self._rows)
+        if not keep_position:
+            self._top = 0
+            self._current = None
+        elif self._current is not None and self._current >= len(self._rows):
+            self._current = len(self._rows) - 1 if self._rows else None
+        self._render()
+
+    def set_row(self, index, values, tags=None):
+        self._rows[index] = values
+        if tags is not None:
+            self._tags[index] = tags
+        self.refresh_row(index)
+
+    def refresh_row(self, index):
+        """Redraw one row if it is on screen"""
+        k = index - self._top
+        if 0 <= k < len(self._slots):
+            self._show(k)
+
+    def refresh(self):
+        self._render()
+
+    # ---------------------------
+    # Current row
+    # ---------------------------
+    def current(self):
+        """Data index of the focused/selected row, or None"""
+        return self._current
+
+    def set_current(self, index, see=True):
+        if not self._rows:
+            self._current = None
+        else:
+            self._current = max(0, min(index, len(self._rows) - 1))
+            if see:
+                self._see(self._current)
+        self._render()
+
+    def focus_first(self):
+        """Give the table keyboard focus with the first row current"""
+        self.focus_set()
+        if self._rows:
+            self.set_current(0)
+
+    def index_at(self, y):
+        """Data index of the row at pixel y, or None"""
+        iid = super().identify_row(y)
+        if not iid or iid not in self._slots:
+            return None
+        index = self._top + self._slots.index(iid)
+        return index if index < len(self._rows) else None
+
+    # ---------------------------
+    # Scrolling
+    # ---------------------------
+    def configure(self, cnf=None, **kw):
+        if cnf:
+            kw = {**cnf, **kw}
+        if "yscrollcommand" in kw:
+            self._yscrollcommand = kw.pop("yscrollcommand")
+            self._update_scrollbar()
+            if not kw:
+                return None
+        return super().configure(**kw)
+
+    config = configure
+
+    def yview(self, *args):
+        total = len(self._rows)
+        if not args:
+            if not total:
+                return (0.0, 1.0)
+            return (self._top / total, min(1.0, (self._top + len(self._slots)) / total))
+        if args[0] == "moveto":
+            self._scroll_to(int(round(float(args[1]) * total)))
+        elif args[0] == "scroll":
+            step = self._page() if str(args[2]).startswith("page") else 1
+            self._scroll_to(self._top + int(args[1]) * step)
+
+    def yview_moveto(self, fraction):
+        self.yview("moveto", fraction)
+
+    def yview_scroll(self, number, what):
+        self.yview("scroll", number, what)
+
+    def _scroll_to(self, top):
+        top = max(0, min(top, len(self._rows) - self._visible()))
+        if top != self._top:
+            self._top = top
+            self._render()
+
+    def _see(self, index):
+        visible = self._visible()
+        if index < self._top:
+            self._top = index
+        elif index >= self._top + visible:
+            self._top = index - visible + 1
+
+    def _page(self):
+        return max(1, self._visible() - 1)
+
+    def _move(self, delta):
+        if not self._rows:
+            return
+        if self._current is None:
+            self.set_current(0)
+        else:
+            self.set_current(self._current + delta)
+
+    # ---------------------------
+    # Rendering
+    # ---------------------------
+    def _visible(self):
+        """Whole rows that fit below the heading"""
+        height = self.winfo_height()
+        if height <= 1:
+            # Not laid out yet; <Configure> renders again
+            return 20
+        rowheight = self._rowheight or _style_rowheight(self)
+        heading = self._heading if self._heading is not None else rowheight
+        return max(1, (height - heading) // rowheight)
+
+    def _measure(self):
+        """Take heading height and row height from the first item on screen"""
+        if not self._slots:
+            return False
+        box = super().bbox(self._slots[0])
+        if not box:
+            return False
+        changed = (self._heading, self._rowheight) != (box[1], box[3])
+        self._heading, self._rowheight = box[1], box[3]
+        return changed
+
+    def _render(self):
+        want = min(self._visible(), len(self._rows))
+        while len(self._slots) < want:
+            self._slots.append(super().insert("", "end"))
+        while len(self._slots) > want:
+            super().delete(self._slots.pop())
+        self._top = max(0, min(self._top, len(self._rows) - want))
+
+        selected = ()
+        for k in range(want):
+            self._show(k)
+            if self._top + k == self._current:
+                selected = (self._slots[k],)
+        super().selection_set(selected)
+        if selected:
+            super().focus(selected[0])
+        # The pool never scrolls natively
+        ttk.Treeview.yview_moveto(self, 0)
+        self._update_scrollbar()
+
+    def _show(self, k):
+        index = self._top + k
+        tags = tuple(self._tags[index])
+        if self.current_tag and index == self._current:
+            tags += (self.current_tag,)
+        values = self._rows[index]
+        if self.formatter:
+            values = self.formatter(index, values)
+        super().item(self._slots[k], values=values, tags=tags)
+
+    def _update_scrollbar(self):
+        if self._yscrollcommand:
+            first, last = self.yview()
+            self._yscrollcommand(first, last)
+
+    # ---------------------------
+    # Events (class bindings)
+    # ---------------------------
+    def _on_configure(self, event):
+        self._render()
+        if self._measure():
+            self._render()
+
+    def _on_wheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.yview_scroll(-3, "units")
+        else:
+            self.yview_scroll(3, "units")
+        return "break"
+
+    def _on_key(self, event, delta, unit):
+        if unit == "page":
+            delta *= self._page()
+        elif unit == "end":
+            delta *= len(self._rows)
+        self._move(delta)
+        return "break"
+
+    def _on_click(self, event):
+        if super().identify_region(event.x, event.y) not in ("cell", "tree"):
+            # Headings and column separators keep their default behaviour
+            return None
+        index = self.index_at(event.y)
+        self.focus_set()
+        if index is not None:
+            self.set_current(index)
+        return "break"
+
+
+def _style_rowheight(table):
+    try:
+        return int(ttk.Style(table).lookup(table.cget("style") or "Treeview", "rowheight")) or 20
+    except (ValueError, TypeError):
+        return 20
+
+
+def _bind_class(table):
+    def dispatch(name, *args):
+        def call(event):
+            if isinstance(event.widget, VirtualTable):
+                return getattr(event.widget, name)(event, *args)
+        return call
+
+    bind = table.bind_class
+    bind(VirtualTable.BINDTAG, "<Configure>", dispatch("_on_configure"))
+    bind(VirtualTable.BINDTAG, "<Button-1>", dispatch("_on_click"))
+    for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+        bind(VirtualTable.BINDTAG, sequence, dispatch("_on_wheel"))
+    for sequence, delta, unit in (
+        ("<Up>", -1, "row"),
+        ("<Down>", 1, "row"),
+        ("<Prior>", -1, "page"),
+        ("<Next>", 1, "page"),
+        ("<Home>", -1, "end"),
+        ("<End>", 1, "end"),
+    ):
+        bind(VirtualTable.BINDTAG, sequence, dispatch("_on_key", delta, unit))